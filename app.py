@@ -1,12 +1,215 @@
-from flask import Flask, render_template, request
+from flask import Flask, Response, abort, g, jsonify, render_template, request
 import os
+import time
+import threading
 import numpy as np
 import pandas as pd
-from src.predicting_publications.pipeline.prediction import PredictionPipeline
+from src.predicting_publications.pipeline.prediction import (PredictionPipeline, PredictionGridLookup, FEATURE_COLUMNS,
+                                                             get_input_schema, get_model_registry, InvalidInputError)
+from src.predicting_publications.pipeline.shadow import ShadowScorer
+from src.predicting_publications.pipeline.rollup import RollupCubeLookup
+from src.predicting_publications.utils.temporal import TEMPORAL_COLUMNS
+from src.predicting_publications.config.configuration import ConfigurationManager
+from src.predicting_publications.utils.metrics import REGISTRY
+from src.predicting_publications.utils.drift import DriftMonitor
 from src.predicting_publications import logger
 
 app = Flask(__name__)  # Initialize Flask
 
+# The configuration is parsed once and shared by every setting read below
+CONFIG_MANAGER = ConfigurationManager()
+
+# Serving metrics, exposed on /metrics when enabled in config.yaml
+REGISTRY.enabled = CONFIG_MANAGER.get_serving_metrics_config().enabled
+REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by route, method and status.",
+                            ("route", "method", "status"))
+ERRORS = REGISTRY.counter("http_request_errors_total", "HTTP requests that raised an error, by route.",
+                          ("route",))
+REQUEST_LATENCY = REGISTRY.histogram("http_request_duration_seconds", "HTTP request latency by route.",
+                                     ("route",))
+PHASE_LATENCY = REGISTRY.histogram("predict_phase_duration_seconds",
+                                   "Latency of each phase of a /predict request.", ("phase",))
+
+# Content features of a request. They may be omitted for known cells, in which case the
+# cell's content profile from the precomputed prediction grid is used.
+CONTENT_FIELDS = ['likescount', 'commentscount', 'symbols_cnt', 'words_cnt',
+                  'hashtags_cnt', 'mentions_cnt', 'links_cnt', 'emoji_cnt']
+
+# Contributions shown with a prediction, and rows accepted by one /explain request
+TOP_CONTRIBUTIONS = 5
+MAX_EXPLAIN_ROWS = 10000
+
+_prediction_grid = None
+PREDICTION_GRID = CONFIG_MANAGER.get_prediction_grid_config()
+_rollup_cube = None
+_drift_monitor = None
+_drift_monitor_lock = threading.Lock()
+DRIFT_MONITORING = CONFIG_MANAGER.get_drift_monitoring_config()
+_shadow_scorer = None
+MODEL_REGISTRY = CONFIG_MANAGER.get_model_registry_config()
+
+
+def get_prediction_grid():
+    """
+    Return the precomputed prediction grid, loading it on first use and reloading it once rebuilt.
+
+    The grid only answers lookups while the model version it was filled with is in
+    production (see PredictionGridLookup), so a promotion falls back to the model until
+    the grid of the new version is built.
+
+    Returns:
+        PredictionGridLookup or None: The grid, or None if it has not been built yet.
+    """
+    global _prediction_grid
+    if _prediction_grid is None or _prediction_grid.rebuilt:
+        try:
+            _prediction_grid = PredictionGridLookup(PREDICTION_GRID.grid_file, PREDICTION_GRID.index_file,
+                                                    registry=get_model_registry())
+        except FileNotFoundError:
+            _prediction_grid = None
+            logger.info("Prediction grid not found, serving all requests from the model")
+            return None
+    return _prediction_grid
+
+
+def get_rollup_cube():
+    """
+    Return the precomputed rollup cube, loading it on first use.
+
+    Returns:
+        RollupCubeLookup or None: The cube, or None if it has not been built yet.
+    """
+    global _rollup_cube
+    if _rollup_cube is None:
+        try:
+            _rollup_cube = RollupCubeLookup()
+        except FileNotFoundError:
+            logger.info("Rollup cube not found, analytics queries are unavailable")
+            return None
+    return _rollup_cube
+
+
+def get_drift_monitor():
+    """
+    Return the drift monitor, creating it (once, under a lock) on first use.
+
+    The monitor is created when the app starts, so the reference histograms are loaded
+    (or built from the train data) before the first request, and its scores are computed
+    on a background thread. It is created on a later request only when the train data
+    did not exist at startup.
+
+    Returns:
+        DriftMonitor or None: The monitor, or None if drift monitoring is disabled or
+        the train data is not available yet.
+    """
+    global _drift_monitor
+    if _drift_monitor is None and DRIFT_MONITORING.enabled:
+        with _drift_monitor_lock:
+            if _drift_monitor is None and DRIFT_MONITORING.train_data_path.exists():
+                monitor = DriftMonitor.from_train_data(DRIFT_MONITORING.train_data_path, FEATURE_COLUMNS,
+                                                       n_bins=DRIFT_MONITORING.n_bins,
+                                                       reference_file=DRIFT_MONITORING.reference_file,
+                                                       compute_interval_s=DRIFT_MONITORING.compute_interval_s,
+                                                       min_observations=DRIFT_MONITORING.min_observations,
+                                                       half_life_s=DRIFT_MONITORING.half_life_s,
+                                                       registry=REGISTRY)
+                monitor.start()
+                _drift_monitor = monitor
+    return _drift_monitor
+
+
+# Load the drift reference histograms when the app starts, not in its first request
+get_drift_monitor()
+
+
+def get_shadow_scorer():
+    """
+    Return the shadow scorer, creating it on first use.
+
+    Returns:
+        ShadowScorer or None: The scorer, or None if shadow mode is disabled.
+    """
+    global _shadow_scorer
+    if _shadow_scorer is None and MODEL_REGISTRY.shadow_enabled:
+        _shadow_scorer = ShadowScorer(get_model_registry(), workers=MODEL_REGISTRY.shadow_workers,
+                                      max_pending=MODEL_REGISTRY.shadow_max_pending,
+                                      refresh_interval_s=MODEL_REGISTRY.shadow_refresh_interval_s,
+                                      metrics=REGISTRY)
+    return _shadow_scorer
+
+
+def parse_features(fields, allow_missing=()) -> tuple:
+    """
+    Validate the features of one request against the feature schema.
+
+    Content features may be omitted all together (for cells of the prediction grid),
+    but not partially.
+
+    Args:
+        fields (Mapping): Request form or JSON body.
+        allow_missing (tuple): Further features that may be omitted.
+
+    Returns:
+        tuple: (pd.Series of the validated features, dict of content features or None).
+
+    Raises:
+        InvalidInputError: If a feature is missing, not a number or out of range.
+    """
+    row = get_input_schema().validate(fields, allow_missing=tuple(CONTENT_FIELDS) + tuple(allow_missing)).iloc[0]
+    provided = row[CONTENT_FIELDS].notna()
+    if provided.all():
+        return row, row[CONTENT_FIELDS].astype(float).to_dict()
+    if not provided.any():
+        return row, None
+    raise InvalidInputError("Content features must all be given, or all omitted for cells of the prediction grid")
+
+
+def top_contributions(explanation: pd.Series, n: int = TOP_CONTRIBUTIONS) -> list:
+    """
+    Return the `n` largest feature contributions of one explained prediction, as (feature, contribution) pairs.
+    """
+    contributions = explanation[FEATURE_COLUMNS].astype(float)
+    order = contributions.abs().sort_values(ascending=False).index[:n]
+    return [(feature, float(contributions[feature])) for feature in order]
+
+
+def _route_label() -> str:
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+@app.before_request
+def start_request_timer():
+    if REGISTRY.enabled:
+        g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    if REGISTRY.enabled and "request_start" in g:
+        route = _route_label()
+        REQUEST_LATENCY.observe(time.perf_counter() - g.request_start, route)
+        REQUESTS.inc(route, request.method, str(response.status_code))
+    return response
+
+
+@app.teardown_request
+def record_request_errors(exc):
+    if exc is not None:
+        ERRORS.inc(_route_label())
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Expose serving metrics in the Prometheus text format.
+
+    Returns 404 when serving metrics are disabled in config.yaml.
+    """
+    if not REGISTRY.enabled:
+        abort(404)
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route('/', methods=['GET'])
 def home_page():
     """
@@ -58,47 +261,72 @@ def index():
     if request.method == 'POST':
         try:
             # Extracting user input from the form
-            lon = float(request.form['lon'])
-            lat = float(request.form['lat'])
-            hour = int(request.form['hour'])
-            day = int(request.form['day'])
-            dayofweek = int(request.form['dayofweek'])
-            month = int(request.form['month'])
-            likescount = float(request.form['likescount'])
-            commentscount = float(request.form['commentscount'])
-            symbols_cnt = float(request.form['symbols_cnt'])
-            words_cnt = float(request.form['words_cnt'])
-            hashtags_cnt = float(request.form['hashtags_cnt'])
-            mentions_cnt = float(request.form['mentions_cnt'])
-            links_cnt = float(request.form['links_cnt'])
-            emoji_cnt = float(request.form['emoji_cnt'])
-            
+            # Content features are optional for cells covered by the prediction grid
+            with PHASE_LATENCY.time("form_parsing"):
+                features, content = parse_features(request.form)
+                lon, lat = float(features['lon']), float(features['lat'])
+                hour, day, dayofweek, month = (int(features[column]) for column in TEMPORAL_COLUMNS)
+
+            # Record the request features for drift monitoring (one histogram bin per feature);
+            # the drift scores are computed on the monitor's background thread
+            monitor = get_drift_monitor()
+            if monitor is not None:
+                monitor.observe({'lon': lon, 'lat': lat, 'hour': hour, 'day': day,
+                                 'dayofweek': dayofweek, 'month': month, **(content or {})})
+
+            # Serve known cells from the precomputed grid in O(1)
+            with PHASE_LATENCY.time("grid_lookup"):
+                grid = get_prediction_grid()
+                prediction = None
+                if grid is not None:
+                    prediction = grid.lookup(lon, lat, hour, day, dayofweek, month, content=content)
+                    if prediction is None and content is None:
+                        content = grid.profile(lon, lat)
+            if prediction is not None:
+                with PHASE_LATENCY.time("template_rendering"):
+                    return render_template('results.html', prediction=str(np.array([prediction])))
+            if content is None:
+                raise InvalidInputError("Content features are required for cells outside the prediction grid")
+
             # Organizing the data into a format suitable for prediction
-            data = {
-                'lon': [lon],
-                'lat': [lat],
-                'hour': [hour],
-                'day': [day],
-                'dayofweek': [dayofweek],
-                'month': [month],
-                'likescount': [likescount],
-                'commentscount': [commentscount],
-                'symbols_cnt': [symbols_cnt],
-                'words_cnt': [words_cnt],
-                'hashtags_cnt': [hashtags_cnt],
-                'mentions_cnt': [mentions_cnt],
-                'links_cnt': [links_cnt],
-                'emoji_cnt': [emoji_cnt]
-            }
-            data_df = pd.DataFrame(data)
+            with PHASE_LATENCY.time("dataframe_construction"):
+                data = {
+                    'lon': [lon],
+                    'lat': [lat],
+                    'hour': [hour],
+                    'day': [day],
+                    'dayofweek': [dayofweek],
+                    'month': [month],
+                }
+                data.update({field: [content[field]] for field in CONTENT_FIELDS})
+                data_df = pd.DataFrame(data)
             
             # Making the prediction
-            pipeline = PredictionPipeline()
-            prediction = pipeline.predict(data_df)
+            with PHASE_LATENCY.time("model_loading"):
+                pipeline = PredictionPipeline()
+            with PHASE_LATENCY.time("model_predict"):
+                # Contributions are only computed when asked for (/predict?explain=1)
+                contributions = None
+                if request.args.get('explain', '').lower() in ('1', 'true', 'yes') and pipeline.explainable:
+                    explanation = pipeline.explain(data_df)
+                    prediction = explanation['prediction'].to_numpy()
+                    contributions = top_contributions(explanation.iloc[0])
+                else:
+                    prediction = pipeline.predict(data_df)
+
+            # Score a copy of the request with the shadow model, if any, in the background
+            shadow = get_shadow_scorer()
+            if shadow is not None:
+                shadow.submit(data_df, prediction)
             
             # Render and return the results page
-            return render_template('results.html', prediction=str(prediction))
+            with PHASE_LATENCY.time("template_rendering"):
+                return render_template('results.html', prediction=str(prediction), contributions=contributions)
             
+        except InvalidInputError as e:
+            logger.warning(f"Invalid prediction request: {e}")
+            abort(400, description=str(e))
+
         except Exception as e:
             # Log the exception for debugging
             logger.error(f"Error occurred during prediction: {e}")
@@ -110,5 +338,144 @@ def index():
     return render_template("index.html")
 
 
+@app.route('/forecast', methods=['POST'])
+def forecast():
+    """
+    Route to forecast every hour of a time range for one location in a single call.
+
+    Accepts a JSON body (or form) with 'lon', 'lat', 'start' and 'end' (ISO datetimes or
+    Unix epoch seconds) and the content features. The content features may be omitted
+    for cells covered by the prediction grid, whose content profile is then used.
+    The temporal features are derived server-side and all hours are scored in one batch.
+
+    Returns:
+        Response: JSON with the location and the hourly series of predictions,
+        or a 400 error for invalid input.
+    """
+    payload = request.get_json(silent=True) or request.form
+    try:
+        features, content = parse_features(payload, allow_missing=TEMPORAL_COLUMNS)
+        lon, lat = float(features['lon']), float(features['lat'])
+
+        if content is None:
+            grid = get_prediction_grid()
+            content = grid.profile(lon, lat) if grid is not None else None
+        if content is None:
+            raise InvalidInputError("Content features are required for cells outside the prediction grid")
+
+        with PHASE_LATENCY.time("model_loading"):
+            pipeline = PredictionPipeline()
+        with PHASE_LATENCY.time("model_predict"):
+            series = pipeline.forecast(lon, lat, payload['start'], payload['end'], content)
+    except (KeyError, ValueError) as e:
+        logger.error(f"Invalid forecast request: {e}")
+        return jsonify({"error": f"Invalid forecast request: {e}"}), 400
+
+    return jsonify({
+        "lon": lon,
+        "lat": lat,
+        "forecast": [{"timestamp": timestamp.isoformat(), "prediction": float(prediction)}
+                     for timestamp, prediction in zip(series['timestamp'], series['prediction'])],
+    })
+
+
+@app.route('/explain', methods=['POST'])
+def explain():
+    """
+    Route to explain predictions by per-feature contributions.
+
+    Accepts a JSON object with the features of one row, or a JSON list of rows (or an
+    object with a 'rows' list), up to MAX_EXPLAIN_ROWS. The content features of a row
+    may be omitted for cells covered by the prediction grid, whose content profile is
+    then used. All rows are explained in one batch.
+
+    Returns:
+        Response: JSON with, per row, the prediction, the bias and the contribution of
+        every feature (the prediction is the bias plus the contributions); a 400 error
+        for invalid input, or 501 if the model cannot be explained.
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = request.form.to_dict()
+    try:
+        rows = payload.get('rows', [payload]) if isinstance(payload, dict) else payload
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise InvalidInputError("An explain request must be a JSON object of features, a list of them, "
+                                    "or an object with a 'rows' list of them")
+        if not rows or len(rows) > MAX_EXPLAIN_ROWS:
+            raise InvalidInputError(f"An explain request must have 1 to {MAX_EXPLAIN_ROWS} rows, got {len(rows)}")
+
+        grid = get_prediction_grid()
+        data = pd.DataFrame(list(rows))
+        data = data.reindex(columns=data.columns.union(CONTENT_FIELDS, sort=False))
+        missing = data[CONTENT_FIELDS].isna().all(axis=1).to_numpy()
+        if missing.any():
+            if grid is None:
+                raise InvalidInputError("Content features are required when the prediction grid is not built")
+            coordinates = data.loc[missing, ['lon', 'lat']].apply(pd.to_numeric, errors='coerce')
+            profiles = grid.profiles_of(coordinates['lon'], coordinates['lat'])
+            unknown = profiles.isna().any(axis=1).to_numpy()
+            if unknown.any():
+                row = int(np.flatnonzero(missing)[np.argmax(unknown)])
+                raise InvalidInputError(f"row {row}: content features are required for cells outside the prediction grid")
+            data.loc[missing, CONTENT_FIELDS] = profiles[CONTENT_FIELDS].to_numpy()
+
+        with PHASE_LATENCY.time("model_loading"):
+            pipeline = PredictionPipeline()
+        with PHASE_LATENCY.time("model_explain"):
+            explanation = pipeline.explain(data)
+    except (ValueError, KeyError) as e:
+        logger.warning(f"Invalid explain request: {e}")
+        return jsonify({"error": f"Invalid explain request: {e}"}), 400
+    except TypeError as e:
+        logger.error(f"Model cannot be explained: {e}")
+        return jsonify({"error": str(e)}), 501
+
+    contributions = explanation[FEATURE_COLUMNS].to_dict(orient='records')
+    return jsonify({
+        "model_version": pipeline.version,
+        "explanations": [{"prediction": float(prediction), "bias": float(bias), "contributions": row}
+                         for prediction, bias, row in zip(explanation['prediction'], explanation['bias'],
+                                                          contributions)],
+    })
+
+
+@app.route('/rollup', methods=['GET'])
+def rollup():
+    """
+    Route answering publication analytics queries from the precomputed rollup cube.
+
+    Accepts the query arguments 'resolution' ('cell_hour', 'cell_day' (default) or
+    'region_month'), optionally 'lon' and 'lat' of a known cell, and optionally 'start'
+    and 'end' (ISO datetimes or Unix epoch seconds, both included).
+
+    Returns:
+        Response: JSON with the series of publications of the cell (or of its region) when
+        a location is given, else the publications of every cell (or region) in the time
+        range; a 400 error for invalid input, or 503 before the cube is built.
+    """
+    cube = get_rollup_cube()
+    if cube is None:
+        return jsonify({"error": "The rollup cube has not been built yet"}), 503
+
+    def argument(name, convert=str):
+        value = request.args.get(name)
+        return None if value in (None, '') else convert(value)
+
+    def timestamp(value):
+        # Unix epoch seconds, as in the raw data, or an ISO datetime
+        return float(value) if value.lstrip('-').replace('.', '', 1).isdigit() else value
+
+    try:
+        result = cube.query(request.args.get('resolution', 'cell_day'),
+                            lon=argument('lon', float), lat=argument('lat', float),
+                            start=argument('start', timestamp), end=argument('end', timestamp))
+    except ValueError as e:
+        logger.error(f"Invalid rollup request: {e}")
+        return jsonify({"error": f"Invalid rollup request: {e}"}), 400
+
+    return jsonify(result)
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8383, debug=True)
@@ -0,0 +1,140 @@
+"""
+asgi.py
+
+Purpose:
+    Asyncio (ASGI) scoring service with request micro-batching.
+
+    Concurrent `/predict` requests are collected over a short window (see the
+    `async_serving` section of config/config.yaml) and scored together with one
+    vectorized model call, instead of one `model.predict` call per request as in app.py.
+
+Usage:
+    uvicorn asgi:app --host 0.0.0.0 --port 8384
+"""
+
+import json
+from urllib.parse import parse_qsl
+
+from src.predicting_publications import logger
+from src.predicting_publications.config.configuration import ConfigurationManager
+from src.predicting_publications.pipeline.batch_prediction import MicroBatchPredictor
+from src.predicting_publications.pipeline.prediction import get_input_schema, get_model_registry
+from src.predicting_publications.pipeline.shadow import ShadowScorer
+
+predictor = None
+
+
+async def read_body(receive) -> bytes:
+    """
+    Read the full request body from the ASGI receive channel.
+    """
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def send_json(send, status: int, payload: dict):
+    """
+    Send a JSON response through the ASGI send channel.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def parse_features(body: bytes, content_type: str) -> dict:
+    """
+    Parse the features of one request from a form-encoded or JSON body.
+
+    Returns:
+        dict: Mapping of every model feature to its validated value.
+
+    Raises:
+        ValueError: If the body is malformed, or a feature is missing, not numeric or
+        out of the bounds of the feature schema (InvalidInputError).
+    """
+    if content_type.startswith("application/json"):
+        fields = json.loads(body or b"{}")
+    else:
+        fields = dict(parse_qsl(body.decode("utf-8")))
+
+    return get_input_schema().validate(fields).iloc[0].to_dict()
+
+
+async def lifespan(receive, send):
+    """
+    Start the micro-batching predictor on startup and stop it on shutdown.
+    """
+    global predictor
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            config_manager = ConfigurationManager()
+            config = config_manager.get_async_serving_config()
+            registry_config = config_manager.get_model_registry_config()
+            shadow = None
+            if registry_config.shadow_enabled:
+                shadow = ShadowScorer(get_model_registry(), workers=registry_config.shadow_workers,
+                                      max_pending=registry_config.shadow_max_pending,
+                                      refresh_interval_s=registry_config.shadow_refresh_interval_s)
+            predictor = MicroBatchPredictor(max_batch_size=config.max_batch_size,
+                                            batch_window_ms=config.batch_window_ms,
+                                            worker_threads=config.worker_threads,
+                                            shadow=shadow, registry=get_model_registry(),
+                                            refresh_interval_s=config.model_refresh_interval_s)
+            await predictor.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await predictor.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """
+    ASGI entry point.
+
+    Routes:
+    - POST /predict: Score one row of features, returns {"prediction": float}.
+    - GET /stats: Micro-batching statistics (and shadow model statistics, when enabled).
+    """
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    path, method = scope["path"], scope["method"]
+
+    if path == "/predict" and method == "POST":
+        headers = dict(scope.get("headers", []))
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        try:
+            row = parse_features(await read_body(receive), content_type)
+        except ValueError as e:
+            await send_json(send, 400, {"error": str(e)})
+            return
+
+        try:
+            prediction = await predictor.predict(row)
+        except Exception as e:
+            logger.error(f"Error occurred during prediction: {e}")
+            await send_json(send, 500, {"error": "prediction failed"})
+            return
+        await send_json(send, 200, {"prediction": prediction})
+
+    elif path == "/stats" and method == "GET":
+        stats = predictor.stats()
+        if predictor.shadow is not None:
+            stats["shadow"] = predictor.shadow.stats()
+        await send_json(send, 200, stats)
+
+    else:
+        await send_json(send, 404, {"error": "not found"})
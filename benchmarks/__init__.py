@@ -0,0 +1,7 @@
+"""
+benchmarks
+
+Purpose:
+    Benchmarks and load generators for the Predict Publications backend.
+    They are run manually (`python -m benchmarks.<module>`) and are not part of the package.
+"""
@@ -0,0 +1,81 @@
+"""
+model_format.py
+
+Purpose:
+    Compare the joblib pickle and the packed, memory-mapped model format: artifact size,
+    load time, prediction parity and predict latency (single row, batches of BATCH_SIZES
+    rows and the whole test data). The packed model is only faster on small calls; the
+    `crossover_rows` of the report is the smallest batch on which the pickle wins, a
+    guide for serving_backend.packed_max_rows in config.yaml.
+
+Usage:
+    python -m benchmarks.model_format --model-dir artifacts/model_trainer \
+        --test-data artifacts/data_transformation/test_data.csv
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmarks.run import measure
+from predicting_publications.utils.packed_model import PackedTreeEnsemble, save_packed_model
+
+TARGET_COLUMN = "publication_count"
+
+# Batch sizes timed: a micro-batch of the async service, a week of hourly /forecast
+# predictions, and larger batch scoring calls
+BATCH_SIZES = (4, 16, 64, 168, 1000)
+
+
+def compare_formats(model_dir: Path, test_data: Path, repeat: int, single_row_calls: int = 100) -> dict:
+    """
+    Benchmark both formats of the model in `model_dir` on the rows of `test_data`.
+    """
+    joblib_path = model_dir / "model.joblib"
+    packed_path = model_dir / "model.ptree"
+    if not packed_path.exists():
+        save_packed_model(joblib.load(joblib_path), packed_path)
+
+    X = pd.read_csv(test_data).drop(columns=[TARGET_COLUMN], errors="ignore")
+    single_row = X.iloc[:1]
+    loaders = {"joblib": (joblib_path, joblib.load), "packed": (packed_path, PackedTreeEnsemble.load)}
+
+    results, predictions = {}, {}
+    for name, (path, load) in loaders.items():
+        model = load(path)
+        predictions[name] = model.predict(X)
+        results[name] = {
+            "size_bytes": os.path.getsize(path),
+            "load": measure(lambda: load(path), repeat),
+            "predict_single_row": measure(lambda: [model.predict(single_row) for _ in range(single_row_calls)],
+                                          repeat),
+            "predict_batch": measure(lambda: model.predict(X), repeat),
+        }
+        for rows in BATCH_SIZES:
+            batch = X.iloc[np.arange(rows) % len(X)]
+            results[name][f"predict_batch_{rows}"] = measure(lambda: model.predict(batch), repeat)
+    results["rows"] = len(X)
+    results["crossover_rows"] = next((rows for rows in BATCH_SIZES
+                                      if results["joblib"][f"predict_batch_{rows}"]["median_s"]
+                                      < results["packed"][f"predict_batch_{rows}"]["median_s"]), None)
+    results["max_abs_diff"] = float(np.max(np.abs(predictions["joblib"] - predictions["packed"])))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the joblib and packed model formats.")
+    parser.add_argument("--model-dir", type=Path, default=Path("artifacts/model_trainer"))
+    parser.add_argument("--test-data", type=Path, default=Path("artifacts/data_transformation/test_data.csv"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(compare_formats(args.model_dir, args.test_data, args.repeat), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+onnx_backend.py
+
+Purpose:
+    Compare the serving backends of a trained model: the joblib pickle, the packed model
+    and the ONNX export run by ONNX Runtime at several intra-op thread counts.
+
+    Every backend is loaded in its own fresh (spawned) process, so the reported resident
+    memory includes the libraries it imports (sklearn for the pickle, onnxruntime for the
+    ONNX export) and nothing else. For each backend, the benchmark reports prediction
+    parity with the pickle, load time, single-row and batch predict latency and RSS, and
+    recommends the thread count for `serving_backend.onnx_intra_op_threads`.
+
+Usage:
+    python -m benchmarks.onnx_backend --model-dir artifacts/model_trainer \
+        --test-data artifacts/data_transformation/test_data.csv --threads 1 2 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+TARGET_COLUMN = "publication_count"
+
+
+def median_seconds(func, repeat: int) -> float:
+    """
+    Return the median run time of `func` over `repeat` runs, in seconds.
+
+    (benchmarks.run.measure is not used here: importing benchmarks.run imports sklearn,
+    which would be counted in the memory of every backend.)
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_backend(backend: str, model_dir: Path, test_data: Path, threads: int, repeat: int,
+                single_row_calls: int) -> dict:
+    """
+    Load one backend and time it. Runs in a fresh process.
+    """
+    import pandas as pd
+    from predicting_publications.utils.profiling import current_rss_bytes
+
+    X = pd.read_csv(test_data).drop(columns=[TARGET_COLUMN], errors="ignore")
+    single_row = X.iloc[:1]
+    rss_before = current_rss_bytes()
+
+    start = time.perf_counter()
+    if backend == "joblib":
+        import joblib
+        model = joblib.load(model_dir / "model.joblib")
+    elif backend == "packed":
+        from predicting_publications.utils.packed_model import PackedTreeEnsemble
+        model = PackedTreeEnsemble.load(model_dir / "model.ptree")
+    else:
+        from predicting_publications.utils.onnx_model import OnnxModel
+        model = OnnxModel.load(model_dir / "model.onnx", intra_op_threads=threads)
+    load_s = time.perf_counter() - start
+
+    predictions = model.predict(X)
+    single_row_s = median_seconds(lambda: [model.predict(single_row) for _ in range(single_row_calls)], repeat)
+    return {
+        "load_s": round(load_s, 6),
+        "predict_single_row_ms": round(single_row_s / single_row_calls * 1e3, 4),
+        "predict_batch_ms": round(median_seconds(lambda: model.predict(X), repeat) * 1e3, 4),
+        "rss_bytes": current_rss_bytes(),
+        "rss_increase_bytes": current_rss_bytes() - rss_before,
+        "predictions": predictions.tolist(),
+    }
+
+
+def compare_backends(model_dir: Path, test_data: Path, threads: list, repeat: int,
+                     single_row_calls: int = 100) -> dict:
+    """
+    Benchmark every backend available in `model_dir` on the rows of `test_data`.
+    """
+    backends = [("joblib", "joblib", 0)]
+    if (model_dir / "model.ptree").exists():
+        backends.append(("packed", "packed", 0))
+    if (model_dir / "model.onnx").exists():
+        backends += [(f"onnx_threads_{n}", "onnx", n) for n in threads]
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name, backend, n_threads in backends:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_backend, (backend, model_dir, test_data, n_threads, repeat,
+                                                     single_row_calls))
+
+    reference = np.array(results["joblib"]["predictions"])
+    for result in results.values():
+        result["max_abs_diff"] = float(np.max(np.abs(np.array(result.pop("predictions")) - reference)))
+
+    onnx = {name: result for name, result in results.items() if name.startswith("onnx")}
+    report = {"rows": len(reference), "backends": results}
+    if onnx:
+        report["recommended_intra_op_threads"] = {
+            "single_row": int(min(onnx, key=lambda name: onnx[name]["predict_single_row_ms"]).rsplit("_", 1)[1]),
+            "batch": int(min(onnx, key=lambda name: onnx[name]["predict_batch_ms"]).rsplit("_", 1)[1]),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the joblib, packed and ONNX Runtime serving backends.")
+    parser.add_argument("--model-dir", type=Path, default=Path("artifacts/model_trainer"))
+    parser.add_argument("--test-data", type=Path, default=Path("artifacts/data_transformation/test_data.csv"))
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 0],
+                        help="ONNX Runtime intra-op thread counts to compare (0 lets ONNX Runtime decide)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(compare_backends(args.model_dir, args.test_data, args.threads, args.repeat), indent=4))
+
+
+if __name__ == "__main__":
+    main()
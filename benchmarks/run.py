@@ -0,0 +1,304 @@
+"""
+run.py
+
+Purpose:
+    Reproducible benchmarks of the transformation, training, evaluation and prediction
+    code paths on synthetic data, compared against stored baselines.
+
+    Each benchmark is timed `--repeat` times (setup excluded) and its median is compared
+    with benchmarks/baselines.json for the chosen size. Results are written to
+    artifacts/benchmarks/results_<size>.json.
+
+Usage:
+    python -m benchmarks.run --size small
+    python -m benchmarks.run --size medium --save-baseline
+    python -m benchmarks.run --size small --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.synthetic import generate_publications
+from predicting_publications.constants import PARAMS_FILE_PATH
+from predicting_publications.utils.common import read_yaml
+from predicting_publications.entity.config_entity import (DataTransformationConfig,
+                                                          ExecutorConfig,
+                                                          ModelTrainerConfig,
+                                                          ModelEvaluationConfig)
+from predicting_publications.components.data_transformation import DataTransformation
+from predicting_publications.components.model_trainer import ModelTrainer
+
+# Dataset sizes (rows of raw publications, distinct cells)
+SIZES = {
+    "small": {"rows": 50_000, "cells": 500},
+    "medium": {"rows": 500_000, "cells": 2_000},
+    "large": {"rows": 5_000_000, "cells": 5_000},
+}
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+TARGET_COLUMN = "publication_count"
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """
+    Time `func` `repeat` times, running the untimed `setup` before each run.
+
+    Returns:
+    - dict: Minimum, median and mean run time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.mean(timings), 6),
+    }
+
+
+@contextmanager
+def working_directory(path: Path):
+    """
+    Temporarily change the working directory (PredictionPipeline uses relative paths).
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class BenchmarkSuite:
+    """
+    Runs all benchmarks for one dataset size inside a temporary working directory.
+
+    Attributes:
+    - workdir (Path): Temporary directory holding the synthetic data and artifacts.
+    - size (str): Name of the dataset size (see SIZES).
+    - repeat (int): Number of timed runs per benchmark.
+    - results (dict): Timings of every benchmark run so far.
+    """
+
+    def __init__(self, workdir: Path, size: str, repeat: int, n_estimators: int = None, seed: int = 42):
+        self.workdir = workdir
+        self.size = size
+        self.repeat = repeat
+        self.seed = seed
+        self.params = read_yaml(PARAMS_FILE_PATH).GradientBoostingRegressor
+        self.n_estimators = n_estimators or self.params.n_estimators
+        self.results = {}
+
+        self.data_file = workdir / "data" / "train_data.csv"
+        self.transformation_dir = workdir / "artifacts" / "data_transformation"
+        self.trainer_dir = workdir / "artifacts" / "model_trainer"
+        self.evaluation_dir = workdir / "artifacts" / "model_evaluation"
+        for directory in (self.data_file.parent, self.transformation_dir, self.trainer_dir, self.evaluation_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def prepare_data(self):
+        """
+        Generate the synthetic raw data for the chosen size.
+        """
+        spec = SIZES[self.size]
+        generate_publications(spec["rows"], n_cells=spec["cells"], seed=self.seed).to_csv(self.data_file, index=False)
+
+    def bench_transformation(self):
+        """
+        Benchmark DataTransformation.generate_temporal_features_and_aggregate, then save the splits.
+        """
+        config = DataTransformationConfig(root_dir=self.transformation_dir,
+                                          data_source_file=self.data_file,
+                                          data_validation=self.workdir / "status.txt",
+                                          utc_offset_hours=0.0,
+                                          aggregation_partitions=1,
+                                          max_workers=1,
+                                          executor=ExecutorConfig(backend="serial", scheduler_address=None))
+        transformation = DataTransformation(config)
+        raw = transformation.df.copy()
+
+        def reset():
+            transformation.df = raw.copy()
+
+        self.results["transformation"] = measure(transformation.generate_temporal_features_and_aggregate,
+                                                 self.repeat, setup=reset)
+        self.results["transformation"]["rows"] = len(raw)
+
+        transformation.split_data_into_train_and_test()
+        transformation._save_datasets("train_data.csv", "test_data.csv")
+
+    def bench_training(self):
+        """
+        Benchmark ModelTrainer.train with the hyperparameters of params.yaml.
+        """
+        config = ModelTrainerConfig(root_dir=self.trainer_dir,
+                                    train_data_path=self.transformation_dir / "train_data.csv",
+                                    test_data_path=self.transformation_dir / "test_data.csv",
+                                    model_name="model.joblib",
+                                    target_column=TARGET_COLUMN,
+                                    n_estimators=self.n_estimators,
+                                    max_depth=self.params.max_depth,
+                                    learning_rate=self.params.learning_rate,
+                                    random_state=self.params.random_state,
+                                    subsample=self.params.subsample,
+                                    max_features=self.params.max_features,
+                                    min_samples_split=self.params.min_samples_split,
+                                    min_samples_leaf=self.params.min_samples_leaf,
+                                    packed_model_name="model.ptree",
+                                    onnx_model_name="model.onnx",
+                                    onnx_parity_tolerance=1e-4)
+        trainer = ModelTrainer(config)
+        self.results["training"] = measure(trainer.train, self.repeat)
+        self.results["training"]["n_estimators"] = self.n_estimators
+
+    def bench_evaluation(self):
+        """
+        Benchmark ModelEvaluation: loading the test data and model, scoring and computing metrics.
+
+        MLflow logging is excluded, as it depends on the tracking server.
+        """
+        try:
+            from predicting_publications.components.model_evaluation import ModelEvaluation
+        except ImportError as e:
+            self.results["evaluation"] = {"skipped": f"ModelEvaluation unavailable: {e}"}
+            return
+
+        config = ModelEvaluationConfig(root_dir=self.evaluation_dir,
+                                       test_data_path=self.transformation_dir / "test_data.csv",
+                                       model_path=self.trainer_dir / "model.joblib",
+                                       metric_file_name=str(self.evaluation_dir / "metrics.json"),
+                                       explanation_file_name=str(self.evaluation_dir / "explanations.json"),
+                                       all_params=dict(self.params),
+                                       target_column=TARGET_COLUMN,
+                                       mlflow_uri="")
+        evaluation = ModelEvaluation(config)
+
+        def evaluate():
+            evaluation.load_data()
+            evaluation.eval_metrics(evaluation.y_test, evaluation.model.predict(evaluation.X_test))
+
+        self.results["evaluation"] = measure(evaluate, self.repeat)
+
+    def bench_prediction(self, batch_size: int = 1000, single_row_calls: int = 100):
+        """
+        Benchmark PredictionPipeline model loading, single-row predict and batch predict.
+        """
+        import pandas as pd
+        from predicting_publications.pipeline.prediction import PredictionPipeline
+
+        test_data = pd.read_csv(self.transformation_dir / "test_data.csv").drop(columns=[TARGET_COLUMN])
+        single_row = test_data.iloc[:1]
+        batch = test_data.sample(n=batch_size, replace=len(test_data) < batch_size, random_state=self.seed)
+
+        with working_directory(self.workdir):
+            self.results["prediction_load"] = measure(PredictionPipeline, self.repeat)
+            pipeline = PredictionPipeline()
+
+        def predict_single_rows():
+            for _ in range(single_row_calls):
+                pipeline.predict(single_row)
+
+        self.results["prediction_single_row"] = measure(predict_single_rows, self.repeat)
+        self.results["prediction_single_row"]["calls"] = single_row_calls
+        self.results["prediction_batch"] = measure(lambda: pipeline.predict(batch), self.repeat)
+        self.results["prediction_batch"]["rows"] = batch_size
+
+    def run(self) -> dict:
+        """
+        Prepare the data and run every benchmark in order.
+        """
+        self.prepare_data()
+        self.bench_transformation()
+        self.bench_training()
+        self.bench_evaluation()
+        self.bench_prediction()
+        return self.results
+
+
+def compare_with_baselines(results: dict, baselines: dict, tolerance: float) -> dict:
+    """
+    Compare benchmark medians with their baselines.
+
+    Returns:
+    - dict: Per benchmark, the baseline, the ratio current/baseline and a status of
+      "regression", "improvement", "unchanged" or "no baseline".
+    """
+    comparison = {}
+    for name, result in results.items():
+        if "median_s" not in result:
+            continue
+        baseline = baselines.get(name)
+        if baseline is None:
+            comparison[name] = {"status": "no baseline"}
+            continue
+        ratio = result["median_s"] / baseline
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparison[name] = {"baseline_s": baseline, "ratio": round(ratio, 3), "status": status}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Predict Publications benchmarks.")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n-estimators", type=int, default=None,
+                        help="Override n_estimators from params.yaml to shorten training")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Relative change from the baseline reported as a regression/improvement")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baselines for this size")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--output-dir", type=Path, default=Path("artifacts/benchmarks"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="benchmarks_") as tmp:
+        suite = BenchmarkSuite(Path(tmp), args.size, args.repeat, args.n_estimators, args.seed)
+        results = suite.run()
+
+    all_baselines = {}
+    if BASELINES_FILE.exists():
+        with open(BASELINES_FILE) as f:
+            all_baselines = json.load(f)
+    comparison = compare_with_baselines(results, all_baselines.get(args.size, {}), args.tolerance)
+
+    report = {"size": args.size, **SIZES[args.size], "results": results, "comparison": comparison}
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = args.output_dir / f"results_{args.size}.json"
+    with open(output_file, "w") as f:
+        json.dump(report, f, indent=4)
+
+    for name, result in results.items():
+        status = comparison.get(name, {}).get("status", "")
+        print(f"{name:<24} {result.get('median_s', result.get('skipped'))!s:>12}  {status}")
+    print(f"Report saved to {output_file}")
+
+    if args.save_baseline:
+        all_baselines[args.size] = {name: r["median_s"] for name, r in results.items() if "median_s" in r}
+        with open(BASELINES_FILE, "w") as f:
+            json.dump(all_baselines, f, indent=4)
+        print(f"Baselines for '{args.size}' saved to {BASELINES_FILE}")
+
+    if args.fail_on_regression and any(c["status"] == "regression" for c in comparison.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+serving_load.py
+
+Purpose:
+    Local load generator comparing the synchronous Flask service (app.py) with the
+    micro-batching asyncio service (asgi.py).
+
+    Each target receives the same form-encoded `/predict` requests from a pool of
+    concurrent clients. Throughput and latency percentiles are printed and written as JSON.
+
+Usage:
+    python app.py                                      # Flask, port 8383
+    uvicorn asgi:app --port 8384                       # asyncio service
+    python -m benchmarks.serving_load \
+        --target flask=http://localhost:8383/predict \
+        --target asgi=http://localhost:8384/predict \
+        --concurrency 32 --requests 2000
+"""
+
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+# Used when no test data is available
+SAMPLE_ROW = {
+    'lon': 30.31, 'lat': 59.94, 'hour': 12, 'day': 15, 'dayofweek': 2, 'month': 6,
+    'likescount': 20.0, 'commentscount': 1.0, 'symbols_cnt': 120.0, 'words_cnt': 18.0,
+    'hashtags_cnt': 2.0, 'mentions_cnt': 0.0, 'links_cnt': 0.0, 'emoji_cnt': 1.0,
+}
+
+
+def load_payloads(test_data_path: Path, target_column: str, n: int) -> list:
+    """
+    Build `n` form-encoded request bodies from the test data, or from SAMPLE_ROW if it is missing.
+    """
+    if test_data_path.exists():
+        rows = pd.read_csv(test_data_path).drop(columns=[target_column]).to_dict("records")
+    else:
+        rows = [SAMPLE_ROW]
+    return [urlencode(rows[i % len(rows)]).encode() for i in range(n)]
+
+
+def send_request(url: str, body: bytes) -> tuple:
+    """
+    Send one POST request and return (latency in seconds, success flag).
+    """
+    request = urllib.request.Request(url, data=body, method="POST",
+                                     headers={"Content-Type": "application/x-www-form-urlencoded"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_load(url: str, payloads: list, concurrency: int) -> dict:
+    """
+    Send all payloads to `url` from `concurrency` client threads and summarise the results.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda body: send_request(url, body), payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "url": url,
+        "requests": len(results),
+        "errors": errors,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+        "latency_ms_p99": round(float(np.percentile(latencies, 99)), 2),
+        "latency_ms_mean": round(float(latencies.mean()), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serving throughput and latency.")
+    parser.add_argument("--target", action="append", required=True,
+                        help="name=url of a /predict endpoint, may be repeated")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--test-data", type=Path, default=Path("artifacts/data_transformation/test_data.csv"))
+    parser.add_argument("--target-column", default="publication_count")
+    parser.add_argument("--output", type=Path, default=Path("artifacts/benchmarks/serving_load.json"))
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.test_data, args.target_column, args.requests)
+    report = {}
+    for target in args.target:
+        name, url = target.split("=", 1)
+        run_load(url, payloads[:args.warmup], args.concurrency)
+        report[name] = run_load(url, payloads, args.concurrency)
+        print(json.dumps({name: report[name]}, indent=4))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
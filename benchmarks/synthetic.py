@@ -0,0 +1,137 @@
+"""
+synthetic.py
+
+Purpose:
+    Generates synthetic publications data matching schema.yaml, for benchmarks and
+    local experiments without access to the real dataset.
+
+    Distributions roughly follow the real data: posts are concentrated in a few popular
+    250x250 m cells around a city centre (Zipf-like cell popularity), follow a diurnal and
+    weekly rhythm over 13 months, and have heavy-tailed engagement and text counts.
+
+Usage:
+    python -m benchmarks.synthetic --rows 1000000 --output data/synthetic_train_data.csv
+"""
+
+import argparse
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 2019-01-01 00:00:00 UTC and 2020-02-01 00:00:00 UTC, the 13 months covered by the data
+START_TIMESTAMP = 1546300800
+END_TIMESTAMP = 1580515200
+
+# City centre (Saint Petersburg) and cell size in degrees (~250 m)
+CENTER_LON, CENTER_LAT = 30.3158, 59.9391
+CELL_LAT_DEG = 250 / 111_320
+CELL_LON_DEG = 250 / (111_320 * np.cos(np.radians(CENTER_LAT)))
+
+# Relative posting activity for each hour of the day (low at night, evening peak)
+HOURLY_ACTIVITY = np.array([3, 2, 1.5, 1, 1, 1.5, 3, 5, 7, 8, 8.5, 9,
+                            9.5, 9.5, 9.5, 10, 10.5, 11, 12, 13, 13, 11, 8, 5])
+
+# Relative posting activity for each day of the week (Monday = 0)
+WEEKLY_ACTIVITY = np.array([0.9, 0.9, 0.95, 1.0, 1.1, 1.25, 1.2])
+
+
+def _ewkb_point(lon: float, lat: float) -> str:
+    """
+    Encode a point as hex EWKB (SRID 4326), the format of the `point` column.
+    """
+    return struct.pack("<BIIdd", 1, 0x20000001, 4326, lon, lat).hex().upper()
+
+
+def generate_cells(n_cells: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Generate `n_cells` distinct cell centres scattered around the city centre,
+    each with a Zipf-like popularity weight.
+    """
+    cells = set()
+    while len(cells) < n_cells:
+        # Distance from the centre in cells, most activity within ~5 km
+        offsets = np.rint(rng.normal(0, 20, size=(n_cells, 2))).astype(int)
+        cells.update(map(tuple, offsets))
+    offsets = np.array(sorted(cells)[:n_cells])
+    rng.shuffle(offsets)
+
+    lon = np.round(CENTER_LON + offsets[:, 0] * CELL_LON_DEG, 6)
+    lat = np.round(CENTER_LAT + offsets[:, 1] * CELL_LAT_DEG, 6)
+    weights = 1.0 / np.arange(1, n_cells + 1) ** 1.1
+    return pd.DataFrame({"lon": lon, "lat": lat, "weight": weights / weights.sum()})
+
+
+def generate_timestamps(n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate `n_rows` epoch-second timestamps following the diurnal and weekly rhythm.
+    """
+    n_days = (END_TIMESTAMP - START_TIMESTAMP) // 86400
+    # 2019-01-01 was a Tuesday (dayofweek 1)
+    day_weights = WEEKLY_ACTIVITY[(np.arange(n_days) + 1) % 7]
+    days = rng.choice(n_days, size=n_rows, p=day_weights / day_weights.sum())
+    hours = rng.choice(24, size=n_rows, p=HOURLY_ACTIVITY / HOURLY_ACTIVITY.sum())
+    seconds = rng.integers(0, 3600, size=n_rows)
+    return START_TIMESTAMP + days * 86400 + hours * 3600 + seconds
+
+
+def generate_publications(n_rows: int, n_cells: int = 2000, seed: int = 42,
+                          hourly_timestamps: bool = True) -> pd.DataFrame:
+    """
+    Generate a synthetic publications dataset with the columns of schema.yaml.
+
+    Args:
+    - n_rows (int): Number of publications to generate.
+    - n_cells (int): Number of distinct spatial cells.
+    - seed (int): Seed for reproducibility.
+    - hourly_timestamps (bool): Truncate timestamps to the hour, so that posts in the same
+      cell and hour share a timestamp and aggregate into a publication count, as in the real data.
+
+    Returns:
+    - pd.DataFrame: The synthetic dataset.
+    """
+    rng = np.random.default_rng(seed)
+    cells = generate_cells(n_cells, rng)
+    cell_idx = rng.choice(n_cells, size=n_rows, p=cells["weight"].values)
+
+    timestamps = generate_timestamps(n_rows, rng)
+    if hourly_timestamps:
+        timestamps = timestamps - timestamps % 3600
+
+    symbols = np.rint(rng.lognormal(4.5, 1.0, size=n_rows)).astype(np.int64)
+    points = np.array([_ewkb_point(lon, lat) for lon, lat in zip(cells["lon"], cells["lat"])], dtype=object)
+
+    df = pd.DataFrame({
+        "timestamp": timestamps.astype(np.int64),
+        "lon": cells["lon"].values[cell_idx],
+        "lat": cells["lat"].values[cell_idx],
+        "likescount": rng.negative_binomial(1, 0.04, size=n_rows).astype(np.int64),
+        "commentscount": rng.negative_binomial(1, 0.6, size=n_rows).astype(np.int64),
+        "symbols_cnt": symbols,
+        "words_cnt": np.rint(symbols / rng.uniform(5, 8, size=n_rows)).astype(np.int64),
+        "hashtags_cnt": rng.negative_binomial(1, 0.3, size=n_rows).astype(np.int64),
+        "mentions_cnt": rng.poisson(0.3, size=n_rows).astype(np.int64),
+        "links_cnt": rng.binomial(1, 0.05, size=n_rows).astype(np.int64),
+        "emoji_cnt": rng.negative_binomial(1, 0.4, size=n_rows).astype(np.int64),
+        "point": points[cell_idx],
+    })
+    return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic publications data.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cells", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("data/synthetic_train_data.csv"))
+    args = parser.parse_args()
+
+    df = generate_publications(args.rows, n_cells=args.cells, seed=args.seed)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.output, index=False)
+    print(f"Wrote {len(df)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+temporal_features.py
+
+Purpose:
+    Compare the derivation of the temporal features from Unix epoch seconds: the integer
+    arithmetic kernel of utils/temporal.py against the pandas path it replaced (convert
+    to datetimes, then one `.dt` accessor per feature). Reports run times, the speedup
+    and whether both produce the same features.
+
+Usage:
+    python -m benchmarks.temporal_features --rows 10000000 --utc-offset-hours 3
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.run import measure
+from benchmarks.synthetic import START_TIMESTAMP, END_TIMESTAMP
+from predicting_publications.utils.temporal import TEMPORAL_COLUMNS, calendar_features
+
+
+def pandas_features(seconds: np.ndarray, utc_offset_hours: float) -> dict:
+    """
+    Derive the temporal features through datetimes and the `.dt` accessors.
+    """
+    timestamps = pd.to_datetime(pd.Series(seconds), unit='s') + pd.Timedelta(hours=utc_offset_hours)
+    return {column: getattr(timestamps.dt, column).to_numpy() for column in TEMPORAL_COLUMNS}
+
+
+def compare_paths(rows: int, utc_offset_hours: float, repeat: int, seed: int = 42) -> dict:
+    """
+    Benchmark both paths on `rows` random timestamps of the period covered by the data.
+    """
+    seconds = np.random.default_rng(seed).integers(START_TIMESTAMP, END_TIMESTAMP, size=rows, dtype=np.int64)
+
+    expected = pandas_features(seconds, utc_offset_hours)
+    actual = calendar_features(seconds, TEMPORAL_COLUMNS, utc_offset_hours)
+    results = {
+        "rows": rows,
+        "utc_offset_hours": utc_offset_hours,
+        "pandas": measure(lambda: pandas_features(seconds, utc_offset_hours), repeat),
+        "integer_kernel": measure(lambda: calendar_features(seconds, TEMPORAL_COLUMNS, utc_offset_hours), repeat),
+        "identical": all(np.array_equal(expected[column], actual[column]) for column in TEMPORAL_COLUMNS),
+    }
+    results["speedup"] = round(results["pandas"]["median_s"] / results["integer_kernel"]["median_s"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the integer and pandas temporal feature derivations.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--utc-offset-hours", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(compare_paths(args.rows, args.utc_offset_hours, args.repeat), indent=4))
+
+
+if __name__ == "__main__":
+    main()
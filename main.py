@@ -1,43 +1,91 @@
+import argparse
+
 from src.predicting_publications import logger
+from src.predicting_publications.config.configuration import ConfigurationManager
+from src.predicting_publications.utils.profiling import PipelineProfiler
+from src.predicting_publications.pipeline.scheduler import PipelineScheduler, Stage
 from src.predicting_publications.pipeline.stage_01_data_ingestion import DataIngestionPipeline
 from src.predicting_publications.pipeline.stage_02_initial_data_validation import InitialDataValidationPipeline
 from src.predicting_publications.pipeline.stage_03_data_transformation import DataTransformationPipeline
 from src.predicting_publications.pipeline.stage_04_model_training import ModelTrainerPipeline
 from src.predicting_publications.pipeline.stage_05_model_evaluation import ModelEvaluationPipeline
+from src.predicting_publications.pipeline.stage_06_prediction_grid import PredictionGridPipeline
+from src.predicting_publications.pipeline.stage_07_model_optimization import ModelOptimizationPipeline
+from src.predicting_publications.pipeline.stage_08_cross_validation import CrossValidationPipeline
+from src.predicting_publications.pipeline.stage_09_data_sampling import DataSamplingPipeline
+from src.predicting_publications.pipeline.stage_10_rollup_cube import RollupCubePipeline
+
+# The pipeline stages and the stages each of them depends on
+PIPELINE_STAGES = [
+    Stage("data_ingestion", DataIngestionPipeline, depends_on=()),
+    Stage("data_validation", InitialDataValidationPipeline, depends_on=("data_ingestion",)),
+    Stage("data_transformation", DataTransformationPipeline, depends_on=("data_validation",)),
+    Stage("model_training", ModelTrainerPipeline, depends_on=("data_transformation",)),
+    # The optimization stage may promote a new version, so the grid and the evaluation
+    # wait for it and use the production model of the run
+    Stage("model_optimization", ModelOptimizationPipeline, depends_on=("model_training",)),
+    Stage("prediction_grid", PredictionGridPipeline, depends_on=("model_optimization",)),
+    Stage("model_evaluation", ModelEvaluationPipeline, depends_on=("model_optimization",)),
+    Stage("cross_validation", CrossValidationPipeline, depends_on=("data_transformation",)),
+    Stage("rollup_cube", RollupCubePipeline, depends_on=("data_transformation",)),
+]
 
-def main():
+
+def dev_pipeline_stages(stages: list) -> list:
     """
-    Main orchestrator function to execute all the pipeline stages in the defined sequence.
-    
-    The function loops through each stage in the execution sequence, initiates, and runs it.
-    Any errors encountered during a stage's execution are logged, and the program is terminated.
+    Insert the data sampling stage between data validation and data transformation, so
+    every later stage runs on a sample of the ingested data.
     """
-    
-    # Define the list of pipeline stages to be executed in sequence
-    execution_sequence = [DataIngestionPipeline(), 
-                          InitialDataValidationPipeline(),
-                          DataTransformationPipeline(),
-                          ModelTrainerPipeline(),
-                          ModelEvaluationPipeline()]
-
-    for pipeline in execution_sequence:
-        try:
-            # Start and log the current pipeline stage
-            logger.info(f">>>>>> Stage: {pipeline.STAGE_NAME} started <<<<<<")
-            
-            # Execute the `run_pipeline` method of the current pipeline
-            pipeline.run_pipeline()
-            
-            # Log the successful completion of the current pipeline stage
-            logger.info(f">>>>>> Stage {pipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
-        except Exception as e:
-            # Log any errors encountered during the pipeline's execution
-            logger.exception(f"Error encountered during the {pipeline.STAGE_NAME}: {e}")
-            logger.error("Program terminated due to an error.")
-            
-            # Exit the program with an error status
-            exit(1)
+    sampling = Stage("data_sampling", DataSamplingPipeline, depends_on=("data_validation",))
+    return [sampling] + [stage._replace(depends_on=("data_sampling",)) if stage.name == "data_transformation" else stage
+                         for stage in stages]
+
+
+def main(dev: bool = False):
+    """
+    Main orchestrator function to execute all the pipeline stages.
+
+    Args:
+        dev (bool): Run in dev mode: the data is sampled (see the DataSampling section of
+            params.yaml) before being transformed, every artifact is written under
+            artifacts/dev, and the trained models are never promoted to production.
+
+    The configuration is read once and shared by all stages. Stages are run by the
+    PipelineScheduler as soon as the stages they depend on have completed, so independent
+    stages (e.g. the prediction grid and model evaluation) run concurrently.
+    Every stage is profiled (wall/CPU time, peak RSS, rows and bytes in/out) and the
+    profiling report is written to artifacts/ when the run ends.
+    When every stage runs in this process (a single scheduler worker) and
+    artifact_store.in_process is set, the train/test datasets are handed between stages
+    in memory and persisted in the background; with more workers the scheduler warns
+    that the setting is ignored.
+    If any stage fails, its dependent stages are cancelled, the error is logged,
+    and the program terminates with an error status once the remaining stages finish.
+    """
+    config_manager = ConfigurationManager(dev_mode=dev)
+    profiler = PipelineProfiler(config_manager.get_profiling_config())
+
+    stages = dev_pipeline_stages(PIPELINE_STAGES) if dev else PIPELINE_STAGES
+    if dev:
+        logger.info(f"Running in dev mode on a sample of the data, with artifacts in {config_manager.config.artifacts_root}")
+    scheduler = PipelineScheduler(stages, config_manager,
+                                  max_workers=config_manager.get_scheduler_config().max_workers,
+                                  profiler=profiler)
+    status = scheduler.run()
+    profiler.save_report()
+
+    failed = [name for name, stage_status in status.items() if stage_status != "completed"]
+    if failed:
+        logger.error(f"Stages not completed: {', '.join(failed)}")
+        logger.error("Program terminated due to an error.")
+
+        # Exit the program with an error status
+        exit(1)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the training pipeline.")
+    parser.add_argument("--dev", action="store_true",
+                        help="Run on a stratified sample of the data for fast iterations")
+
     # Start the main orchestrator function if the script is run as the main module
-    main()
+    main(dev=parser.parse_args().dev)
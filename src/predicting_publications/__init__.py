@@ -2,33 +2,24 @@
 logger.py
 
 Purpose:
-    Configures and provides a logger for this project. 
+    Configures and provides a logger for this project.
     The logger logs messages to both the console (stdout) and a specified log file.
+
+    Records are queued and written by a background thread (see utils/logging_setup.py),
+    with size-based rotation, per-module levels and an optional JSON format set in the
+    `logging` section of config/config.yaml.
 """
 
-import os
-import sys
 import logging
 
-# Logger format string
-logging_str = "[%(asctime)s: %(lineno)d: %(name)s: %(levelname)s: %(module)s:  %(message)s]"
-
-# Define log directory and log file path
-log_dir = "logs"
-log_file_path = os.path.join(log_dir, "running_logs.log")
+from predicting_publications.constants import CONFIG_FILE_PATH
+from predicting_publications.utils.logging_setup import load_logging_config, configure_logging
 
-# Check and create log directory if not exists
-os.makedirs(log_dir, exist_ok=True)
+# Logging configuration (read directly, as the configuration helpers themselves log)
+logging_config = load_logging_config(CONFIG_FILE_PATH)
 
-# Basic logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
-    handlers=[
-        logging.FileHandler(log_file_path),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Queue records to the background writer
+configure_logging(logging_config)
 
 # Create and provide logger instance
-logger = logging.getLogger("predict_publications_logger")
\ No newline at end of file
+logger = logging.getLogger("predict_publications_logger")
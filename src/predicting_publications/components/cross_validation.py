@@ -0,0 +1,172 @@
+import time
+import hashlib
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import KFold
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json, load_json
+from predicting_publications.utils.executor import create_executor
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.components.multi_model_trainer import build_candidate, validation_metrics
+from predicting_publications.entity.config_entity import CrossValidationConfig
+
+# Files of the cached fold datasets
+FEATURES_FILE = "X.npy"
+TARGET_FILE = "y.npy"
+FOLD_IDS_FILE = "fold_ids.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Return the SHA-256 hex digest of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def evaluate_fold(fold: int, folds_dir: Path, gbr_params: dict) -> dict:
+    """
+    Train the GradientBoostingRegressor on every fold but `fold` and evaluate it on `fold`.
+
+    This is a module-level function so it can run in worker processes. The cached
+    feature matrix is memory-mapped, so workers share its pages instead of each
+    parsing the CSV.
+
+    Returns:
+    - dict: Validation metrics, fit time and row counts of the fold.
+    """
+    X = np.load(Path(folds_dir) / FEATURES_FILE, mmap_mode="r")
+    y = np.load(Path(folds_dir) / TARGET_FILE, mmap_mode="r")
+    in_fold = np.load(Path(folds_dir) / FOLD_IDS_FILE) == fold
+
+    model = build_candidate("gbr", {}, gbr_params)
+    start = time.perf_counter()
+    model.fit(X[~in_fold], y[~in_fold])
+    fit_seconds = time.perf_counter() - start
+
+    return {
+        "fold": fold,
+        **validation_metrics(y[in_fold], model.predict(X[in_fold])),
+        "fit_seconds": round(fit_seconds, 3),
+        "train_rows": int((~in_fold).sum()),
+        "test_rows": int(in_fold.sum()),
+    }
+
+
+class CrossValidation:
+    """
+    CrossValidation evaluates the model training configuration with k-fold cross-validation.
+
+    The fold datasets are materialized once: the feature matrix and target are stored as
+    .npy files next to the fold id of every row, and a manifest records the data checksum
+    and the fold settings they were built from. Later runs reuse them as long as the data
+    and fold settings are unchanged, so evaluating a new parameter set skips the CSV parsing
+    and fold assignment. Folds are trained and evaluated in parallel on the configured executor.
+
+    Attributes:
+    - config (CrossValidationConfig): Configuration settings for cross-validation.
+    """
+
+    def __init__(self, config: CrossValidationConfig):
+        """
+        Initialize the CrossValidation component.
+
+        Args:
+        - config (CrossValidationConfig): Configuration settings for cross-validation.
+        """
+        self.config = config
+
+    def _fold_settings(self) -> dict:
+        return {
+            "data_sha256": file_sha256(self.config.train_data_path),
+            "n_splits": self.config.n_splits,
+            "shuffle": self.config.shuffle,
+            "random_state": self.config.random_state if self.config.shuffle else None,
+        }
+
+    def materialize_folds(self) -> bool:
+        """
+        Build the cached fold datasets, unless the cached ones match the data and fold settings.
+
+        Returns:
+        - bool: True when cached folds were reused.
+        """
+        folds_dir = Path(self.config.folds_dir)
+        manifest_path = folds_dir / MANIFEST_FILE
+        # The checksum needs the train file itself, which may still be being persisted
+        STORE.wait(self.config.train_data_path)
+        settings = self._fold_settings()
+
+        if manifest_path.exists():
+            manifest = load_json(manifest_path)
+            if all(manifest.get(key) == value for key, value in settings.items()):
+                logger.info(f"Reusing cached folds from {folds_dir}")
+                self.n_rows = int(manifest["n_rows"])
+                return True
+            # Invalidate the stale folds before overwriting them
+            manifest_path.unlink()
+
+        logger.info(f"Building {self.config.n_splits} folds from {self.config.train_data_path}")
+        data = STORE.get_dataframe(self.config.train_data_path)
+        X = data.drop([self.config.target_column], axis=1)
+        y = data[self.config.target_column].values.astype(np.float64)
+
+        kfold = KFold(n_splits=self.config.n_splits, shuffle=self.config.shuffle,
+                      random_state=settings["random_state"])
+        fold_ids = np.empty(len(data), dtype=np.int16)
+        for fold, (_, test_index) in enumerate(kfold.split(X)):
+            fold_ids[test_index] = fold
+
+        np.save(folds_dir / FEATURES_FILE, X.values.astype(np.float64))
+        np.save(folds_dir / TARGET_FILE, y)
+        np.save(folds_dir / FOLD_IDS_FILE, fold_ids)
+        # The manifest is written last, so interrupted builds are never reused
+        save_json(path=manifest_path, data={**settings, "n_rows": len(data), "feature_names": list(X.columns)})
+        self.n_rows = len(data)
+        return False
+
+    def evaluate(self) -> list:
+        """
+        Train and evaluate every fold in parallel on the configured executor.
+
+        Returns:
+        - list: The result of every fold, in fold order.
+        """
+        workers = max(1, min(self.config.max_workers, self.config.n_splits))
+        logger.info(f"Evaluating {self.config.n_splits} folds with {workers} workers ({self.config.executor.backend} executor)")
+        with create_executor(self.config.executor, workers) as executor:
+            futures = [executor.submit(evaluate_fold, fold, self.config.folds_dir, self.config.gbr_params)
+                       for fold in range(self.config.n_splits)]
+            return [future.result() for future in futures]
+
+    def orchestrate_cross_validation(self) -> dict:
+        """
+        Materialize (or reuse) the folds, evaluate them and save the report.
+
+        Returns:
+        - dict: Per-fold metrics, their mean and standard deviation, and the evaluated parameters.
+        """
+        folds_reused = self.materialize_folds()
+        folds = self.evaluate()
+
+        metrics = [key for key in folds[0] if key not in ("fold", "train_rows", "test_rows")]
+        report = {
+            "n_splits": self.config.n_splits,
+            "folds_reused": folds_reused,
+            "params": self.config.gbr_params,
+            "folds": folds,
+            "mean": {key: float(np.mean([f[key] for f in folds])) for key in metrics},
+            "std": {key: float(np.std([f[key] for f in folds])) for key in metrics},
+        }
+        for fold in folds:
+            logger.info(f"Fold {fold['fold']}: rmse={fold['rmse']:.4f}, mae={fold['mae']:.4f}, r2={fold['r2']:.4f}")
+        logger.info(f"Cross-validation rmse: {report['mean']['rmse']:.4f} +/- {report['std']['rmse']:.4f}")
+
+        save_json(path=self.config.report_file, data=report)
+        return report
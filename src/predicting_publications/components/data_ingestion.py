@@ -1,17 +1,80 @@
 import os
+import time
 import shutil
+
+import numpy as np
+import pandas as pd
+
 from predicting_publications import logger
-from predicting_publications.utils.common import get_size
+from predicting_publications.utils.common import get_size, save_json
+from predicting_publications.utils.temporal import epoch_seconds
+from predicting_publications.utils.bloom_filter import BloomFilter
 from predicting_publications.entity.config_entity import DataIngestionConfig
 from pathlib import Path
 
+
+class PartitionedHashSet:
+    """
+    Exact set of row hashes, kept as sorted uint64 runs per time partition.
+
+    Rows of different time partitions never share a hash when the timestamp is part of
+    the hashed columns, so a lookup only searches the (small) runs of its partition,
+    and adding rows only touches the partitions they belong to.
+
+    The new hashes of a partition are added as a sorted run, and a run is merged into
+    the previous one as soon as it is at least half its size. A partition thus holds
+    O(log n) runs, each hash is merged O(log n) times, and adding n hashes costs
+    O(n log n) overall, however many chunks the partition spans.
+
+    The set is never pruned: it holds 8 bytes per distinct row of the whole input, for
+    every partition, as the input is not assumed to be time-ordered. For inputs too
+    large for that, use the fixed-size Bloom filter (dedup_method: bloom).
+    """
+
+    def __init__(self):
+        self.partitions = {}
+
+    def add(self, partitions: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add distinct hashes and return which ones were not in the set before.
+        """
+        new = np.zeros(len(hashes), dtype=bool)
+        order = np.argsort(partitions, kind='stable')
+        for rows in np.split(order, np.flatnonzero(np.diff(partitions[order])) + 1):
+            if len(rows) == 0:
+                continue
+            runs = self.partitions.setdefault(int(partitions[rows[0]]), [])
+            # Sorted queries make the binary searches walk each run in order
+            rows = rows[np.argsort(hashes[rows])]
+            candidates = hashes[rows]
+            found = np.zeros(len(rows), dtype=bool)
+            for run in runs:
+                found |= run[np.minimum(np.searchsorted(run, candidates), len(run) - 1)] == candidates
+            new[rows[~found]] = True
+
+            if (~found).any():
+                runs.append(candidates[~found])
+            while len(runs) > 1 and 2 * len(runs[-1]) >= len(runs[-2]):
+                # Linear merge of two sorted runs
+                run = runs.pop()
+                runs[-1] = np.insert(runs[-1], np.searchsorted(runs[-1], run), run)
+        return new
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for runs in self.partitions.values() for run in runs)
+
+
 class DataIngestion:
     """
     DataIngestion handles the process of transferring data from a local directory 
     to the project's official artifact directories.
 
     The class currently assumes that the data is already present locally, 
-    and focuses on transferring this data to the specified directory.
+    and focuses on transferring this data to the specified directory. Duplicate rows
+    (same values of the configured columns, e.g. from re-exported or overlapping dumps)
+    are dropped on the way in a single streaming pass, so they don't inflate the
+    publication counts of the downstream stages.
 
     Attributes:
     - config (DataIngestionConfig): Configuration settings for data ingestion.
@@ -45,7 +108,8 @@ class DataIngestion:
         Transfer the data from the local directory to the project's artifact directory.
 
         This method ensures that the artifact directory exists, and then transfers 
-        the data file to this directory.
+        the data file to this directory, without its duplicate rows when deduplication
+        is enabled.
 
         Raises:
         - FileNotFoundError: If the local data file does not exist.
@@ -64,7 +128,98 @@ class DataIngestion:
         # Ensure the transfer directory exists
         os.makedirs(root_dir, exist_ok=True)
 
+        if self.config.deduplicate:
+            self.deduplicate_data(local_data_path, root_dir / local_data_path.name)
+            return
+
         # Transfer the file
         shutil.copy2(local_data_path, root_dir)
         logger.info(f"Data transferred from {local_data_path} to {root_dir}. File size: {file_size}.")
 
+    def _row_hashes(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Return the uint64 hash of the dedup columns of every row.
+
+        Raises:
+        - ValueError: If a dedup column is missing.
+        """
+        missing = [column for column in self.config.dedup_columns if column not in chunk]
+        if missing:
+            raise ValueError(f"Dedup columns not found in the data: {', '.join(missing)}")
+        # Numbers are hashed by value, so a column parsed as int in one chunk and as float
+        # in another (e.g. with missing values) hashes alike
+        key = pd.DataFrame({column: chunk[column].astype(np.float64)
+                            if pd.api.types.is_numeric_dtype(chunk[column]) else chunk[column]
+                            for column in self.config.dedup_columns})
+        return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+    def deduplicate_data(self, source: Path, destination: Path) -> dict:
+        """
+        Copy the data from `source` to `destination` without its duplicate rows, in one streaming pass.
+
+        The data is read in chunks of `chunk_rows` rows, and the first occurrence of every
+        row is kept. Seen rows are remembered by the 64-bit hash of their dedup columns,
+        either exactly (per time partition) or in a Bloom filter of fixed size.
+
+        Returns:
+        - dict: Rows read, written and dropped, the memory of the seen hashes and the throughput.
+        """
+        method = self.config.dedup_method
+        if method == "bloom":
+            seen = BloomFilter(self.config.bloom_capacity, self.config.bloom_error_rate)
+        else:
+            seen = PartitionedHashSet()
+        # Duplicates can only share a time partition when the timestamp identifies rows
+        partitioned = "timestamp" in self.config.dedup_columns
+        partition_seconds = self.config.partition_hours * 3600
+
+        logger.info(f"Deduplicating {source} ({method}) on {', '.join(self.config.dedup_columns)}")
+        start = time.perf_counter()
+        rows_in = rows_out = 0
+        tmp_path = f"{destination}.tmp"
+        with open(tmp_path, "w", newline="") as f:
+            header = True
+            for chunk in pd.read_csv(source, chunksize=self.config.chunk_rows):
+                hashes = self._row_hashes(chunk)
+                # First occurrence of every row of the chunk, in row order
+                _, first = np.unique(hashes, return_index=True)
+                first.sort()
+                if method == "bloom":
+                    new = seen.add(hashes[first])
+                else:
+                    partitions = (epoch_seconds(chunk['timestamp'].to_numpy()) // partition_seconds
+                                  if partitioned else np.zeros(len(chunk), dtype=np.int64))
+                    new = seen.add(partitions[first], hashes[first])
+
+                keep = np.zeros(len(chunk), dtype=bool)
+                keep[first[new]] = True
+                chunk[keep].to_csv(f, header=header, index=False)
+                header = False
+                rows_in += len(chunk)
+                rows_out += int(keep.sum())
+        os.replace(tmp_path, destination)
+        seconds = time.perf_counter() - start
+
+        report = {
+            "method": method,
+            "dedup_columns": list(self.config.dedup_columns),
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "duplicates_dropped": rows_in - rows_out,
+            "duplicate_fraction": round((rows_in - rows_out) / rows_in, 6) if rows_in else 0.0,
+            "hash_bytes": seen.nbytes,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows_in / seconds) if seconds > 0 else None,
+            "mb_per_second": round(os.path.getsize(source) / 2 ** 20 / seconds, 2) if seconds > 0 else None,
+        }
+        if method == "bloom":
+            report["expected_false_positive_rate"] = seen.false_positive_rate
+        else:
+            report["partitions"] = len(seen.partitions)
+        self.rows_in, self.rows_out = rows_in, rows_out
+
+        logger.info(f"Data transferred from {source} to {destination}: dropped {rows_in - rows_out} duplicate "
+                    f"rows of {rows_in} ({report['rows_per_second']} rows/s)")
+        save_json(path=self.config.report_file, data=report)
+        return report
+
@@ -0,0 +1,159 @@
+import os
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.utils.temporal import to_datetime
+from predicting_publications.entity.config_entity import DataSamplingConfig
+
+# Columns identifying a sampling unit: the publications of one location in one hour,
+# aggregated into one row (and one publication count) by the data transformation
+UNIT_COLUMNS = ['timestamp', 'lon', 'lat']
+
+# Columns identifying a stratum: spatial cell, month and hour
+STRATUM_COLUMNS = ['lon', 'lat', 'month', 'hour']
+
+
+class DataSampling:
+    """
+    DataSampling draws a reproducible sample of the ingested data in a single streaming pass.
+
+    The data is read in chunks, so inputs of any size are sampled in bounded memory. The
+    sampling unit is a publication hour: all publications of one (timestamp, lon, lat),
+    which the data transformation aggregates into one row and one publication count, so
+    the counts of the sample are exact. Every unit gets a pseudo-random key in [0, 1)
+    from a seeded hash of its columns; as the key depends on the unit only, the sample
+    does not depend on the row order or the chunking.
+
+    - stratified: units whose key is below `fraction` are written as they are read. Per
+      stratum (spatial cell, month, hour), the `min_per_stratum` units with the smallest
+      keys are also kept in a bounded reservoir, so rare strata are still represented.
+    - reservoir: the `reservoir_size` units with the smallest keys (a uniform sample of
+      fixed size) are kept in the reservoir.
+
+    Attributes:
+    - config (DataSamplingConfig): Configuration settings for data sampling.
+    """
+
+    def __init__(self, config: DataSamplingConfig):
+        """
+        Initialize the DataSampling component.
+
+        Args:
+        - config (DataSamplingConfig): Configuration settings for data sampling.
+        """
+        self.config = config
+        # Mixed into the unit hashes (pandas' hash key only applies to string columns)
+        self.seed_hash = pd.util.hash_array(np.array([config.seed], dtype=np.uint64))[0]
+        if config.method == "stratified":
+            self.fraction = config.fraction
+            self.reservoir_size = config.min_per_stratum
+        else:
+            self.fraction = 0.0
+            self.reservoir_size = config.reservoir_size
+
+        # Reservoir of every stratum: a max-heap of (-key, unit), and the rows of its
+        # units that are not already written
+        self._heaps = {}
+        self._members = set()
+        self._buffers = {}
+
+    def _unit_keys(self, chunk: pd.DataFrame) -> tuple:
+        """
+        Return the unit hash and the sampling key in [0, 1) of every row.
+        """
+        units = pd.util.hash_pandas_object(chunk[UNIT_COLUMNS], index=False).to_numpy()
+        keys = pd.util.hash_array(units ^ self.seed_hash)
+        return units, keys / float(2 ** 64)
+
+    def _strata(self, chunk: pd.DataFrame) -> np.ndarray:
+        if self.config.method == "reservoir":
+            return np.zeros(len(chunk), dtype=np.uint64)
+        timestamps = to_datetime(chunk['timestamp']).dt
+        strata = pd.DataFrame({'lon': chunk['lon'].to_numpy(), 'lat': chunk['lat'].to_numpy(),
+                               'month': timestamps.month.to_numpy(), 'hour': timestamps.hour.to_numpy()})
+        return pd.util.hash_pandas_object(strata[STRATUM_COLUMNS], index=False).to_numpy()
+
+    def _update_reservoirs(self, chunk: pd.DataFrame, units: np.ndarray, keys: np.ndarray, written: np.ndarray):
+        """
+        Offer the units of a chunk to the reservoir of their stratum and buffer the rows of its members.
+        """
+        candidates = pd.DataFrame({'unit': units, 'key': keys, 'stratum': self._strata(chunk)})
+        # Only the units with the smallest keys of each stratum in the chunk can enter its reservoir
+        candidates = (candidates.drop_duplicates('unit').sort_values('key')
+                      .groupby('stratum', sort=False).head(self.reservoir_size))
+
+        for unit, key, stratum in candidates.itertuples(index=False):
+            if unit in self._members:
+                continue
+            heap = self._heaps.setdefault(stratum, [])
+            if len(heap) < self.reservoir_size:
+                heapq.heappush(heap, (-key, unit))
+            elif key < -heap[0][0]:
+                _, evicted = heapq.heapreplace(heap, (-key, unit))
+                self._members.discard(evicted)
+                self._buffers.pop(evicted, None)
+            else:
+                continue
+            self._members.add(unit)
+
+        # Rows of reservoir members that were not written with the chunk
+        members = np.fromiter(self._members, dtype=np.uint64, count=len(self._members))
+        buffered = np.isin(units, members) & ~written
+        if buffered.any():
+            for unit, rows in chunk[buffered].groupby(units[buffered], sort=False):
+                self._buffers.setdefault(unit, []).append(rows)
+
+    def sample(self) -> dict:
+        """
+        Sample the ingested data and write the sample and its report.
+
+        Returns:
+        - dict: Rows read and written, and the number of strata seen.
+
+        Raises:
+        - FileNotFoundError: If the ingested data does not exist.
+        """
+        if not os.path.exists(self.config.data_source_file):
+            logger.error(f"File not found: {self.config.data_source_file}")
+            raise FileNotFoundError(f"No file found at {self.config.data_source_file}")
+
+        logger.info(f"Sampling {self.config.data_source_file} ({self.config.method}, "
+                    f"fraction={self.fraction}, reservoir_size={self.reservoir_size}, seed={self.config.seed})")
+        rows_in = rows_out = 0
+        tmp_path = f"{self.config.sampled_data_file}.tmp"
+        with open(tmp_path, "w", newline="") as f:
+            header = True
+            for chunk in pd.read_csv(self.config.data_source_file, chunksize=self.config.chunk_rows):
+                units, keys = self._unit_keys(chunk)
+                written = keys < self.fraction
+                chunk[written].to_csv(f, header=header, index=False)
+                header = False
+                if self.reservoir_size > 0:
+                    self._update_reservoirs(chunk, units, keys, written)
+                rows_in += len(chunk)
+                rows_out += int(written.sum())
+
+            # Units kept by a reservoir only, whose rows were buffered
+            for unit_rows in self._buffers.values():
+                for rows in unit_rows:
+                    rows.to_csv(f, header=header, index=False)
+                    header = False
+                    rows_out += len(rows)
+        os.replace(tmp_path, self.config.sampled_data_file)
+
+        report = {
+            "method": self.config.method,
+            "fraction": self.fraction,
+            "reservoir_size": self.reservoir_size,
+            "seed": self.config.seed,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "strata": len(self._heaps),
+        }
+        logger.info(f"Sampled {rows_out} of {rows_in} rows into {self.config.sampled_data_file}")
+        save_json(path=self.config.report_file, data=report)
+        return report
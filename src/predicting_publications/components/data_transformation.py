@@ -4,6 +4,37 @@ from sklearn.model_selection import train_test_split
 from pathlib import Path
 
 from predicting_publications.config.configuration import DataTransformationConfig
+from predicting_publications.utils.temporal import add_temporal_features
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.executor import create_executor
+
+# Columns identifying an aggregated row: one hour at one location (the temporal features
+# derive from the timestamp, so they don't split groups)
+GROUP_COLUMNS = ['timestamp', 'lon', 'lat', 'hour', 'day', 'dayofweek', 'month']
+
+# Aggregation of the content features of the publications of a row
+AGG_COLUMNS = {
+    'likescount': 'mean',
+    'commentscount': 'mean',
+    'symbols_cnt': 'mean',
+    'words_cnt': 'mean',
+    'hashtags_cnt': 'mean',
+    'mentions_cnt': 'mean',
+    'links_cnt': 'mean',
+    'emoji_cnt': 'mean'
+}
+
+
+def aggregate_publications(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate publications by hour and location, with their publication count.
+
+    This is a module-level function so it can run on executor workers.
+    """
+    grouped_data = df.groupby(GROUP_COLUMNS).agg(AGG_COLUMNS).reset_index()
+    grouped_data['publication_count'] = df.groupby(['timestamp', 'lon', 'lat']).size().values
+    return grouped_data
+
 
 class DataTransformation:
     """
@@ -30,36 +61,31 @@ class DataTransformation:
             raise
 
     def generate_temporal_features_and_aggregate(self):
-        # Convert the 'timestamp' column to a datetime format if it's not already
-        if self.df['timestamp'].dtype != 'datetime64[ns]':
-            self.df['timestamp'] = pd.to_datetime(self.df['timestamp'], unit='s')
-
         """
         Generate temporal features and aggregate the dataset.
         """
-        # Generating temporal features
-        self.df['hour'] = self.df['timestamp'].dt.hour
-        self.df['day'] = self.df['timestamp'].dt.day
-        self.df['dayofweek'] = self.df['timestamp'].dt.dayofweek
-        self.df['month'] = self.df['timestamp'].dt.month
+        # Generating temporal features (shared with the forecast API, see utils/temporal.py)
+        add_temporal_features(self.df, 'timestamp', self.config.utc_offset_hours)
 
         # Aggregating data by hour and location
-        agg_columns = {
-            'likescount': 'mean',
-            'commentscount': 'mean',
-            'symbols_cnt': 'mean',
-            'words_cnt': 'mean',
-            'hashtags_cnt': 'mean',
-            'mentions_cnt': 'mean',
-            'links_cnt': 'mean',
-            'emoji_cnt': 'mean'
-        }
-
         logger.info("Grouping data by timestamp, lon, lat, hour, day, day of week, and month")
-        self.grouped_data = self.df.groupby(['timestamp', 'lon', 'lat', 'hour', 'day', 'dayofweek', 'month']).agg(agg_columns).reset_index()
-        
-        logger.info("Setting publication count grouped by timestamp, lon, and lat")
-        self.grouped_data['publication_count'] = self.df.groupby(['timestamp', 'lon', 'lat']).size().values
+        partitions = self.config.aggregation_partitions
+        if partitions <= 1:
+            self.grouped_data = aggregate_publications(self.df)
+            return
+
+        # All the publications of an hour and location fall in the same partition, so the
+        # partitions are aggregated independently
+        partition_of_row = pd.util.hash_pandas_object(self.df[['timestamp', 'lon', 'lat']], index=False).to_numpy() % partitions
+        workers = min(self.config.max_workers, partitions)
+        logger.info(f"Aggregating {partitions} partitions with {workers} workers ({self.config.executor.backend} executor)")
+        with create_executor(self.config.executor, workers) as executor:
+            futures = [executor.submit(aggregate_publications, self.df[partition_of_row == partition])
+                       for partition in range(partitions)]
+            aggregated = [future.result() for future in futures]
+
+        # Rows in the order of a single aggregation, so the train and test split is unchanged
+        self.grouped_data = pd.concat(aggregated).sort_values(GROUP_COLUMNS).reset_index(drop=True)
 
     def split_data_into_train_and_test(self):
         """
@@ -89,29 +115,37 @@ class DataTransformation:
         try:
             # Save training data
             train_data = pd.concat([self.X_train, self.y_train], axis=1)
-            train_data.to_csv(train_output_path, index=False)
+            STORE.put_dataframe(train_output_path, train_data)
             logger.info(f"Training Data saved successfully to {train_output_path}")
 
             # Save test data
             test_data = pd.concat([self.X_val, self.y_val], axis=1)
-            test_data.to_csv(test_output_path, index=False)
+            STORE.put_dataframe(test_output_path, test_data)
             logger.info(f"Test Data saved successfully to {test_output_path}")
 
         except Exception as e:
             logger.error(f"Error while saving the datasets: {e}")
             raise
 
-    def orchestrate_transformation(self, train_filename: str = "train_data.csv", test_filename: str = "test_data.csv"):
+    def orchestrate_transformation(self, train_filename: str = "train_data.csv", test_filename: str = "test_data.csv",
+                                   aggregated_filename: str = "aggregated_data.csv"):
         """
         Orchestrates the data transformation process by:
         1. Generating temporal features and aggregating the data.
         2. Splitting data into training and test sets.
-        3. Saving the training and test datasets.
+        3. Saving the training and test datasets, and the aggregated data (with its
+           timestamps) used by the rollup cube.
 
         Args:
         - train_filename (str): Name of the file to save the training data. Default is "train_data.csv".
         - test_filename (str): Name of the file to save the test data. Default is "test_data.csv".
+        - aggregated_filename (str): Name of the file to save the aggregated data. Default is "aggregated_data.csv".
         """
         self.generate_temporal_features_and_aggregate()
         self.split_data_into_train_and_test()
-        self._save_datasets(train_filename, test_filename)
\ No newline at end of file
+        self._save_datasets(train_filename, test_filename)
+
+        # Publication counts per hour and location, rolled up by the Rollup Cube stage
+        aggregated_output_path = self.config.root_dir / aggregated_filename
+        STORE.put_dataframe(aggregated_output_path, self.grouped_data[['timestamp', 'lon', 'lat', 'publication_count']])
+        logger.info(f"Aggregated Data saved successfully to {aggregated_output_path}")
\ No newline at end of file
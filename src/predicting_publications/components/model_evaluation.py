@@ -5,7 +5,10 @@ from urllib.parse import urlparse
 import joblib
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import mlflow
+from predicting_publications import logger
 from predicting_publications.utils.common import save_json
+from predicting_publications.utils.packed_model import PackedTreeEnsemble, pack_gradient_boosting
+from predicting_publications.utils.artifact_store import STORE
 from predicting_publications.config.configuration import ModelEvaluationConfig
 from pathlib import Path
 
@@ -46,11 +49,48 @@ class ModelEvaluation:
         """
         Load test data and the trained model.
         """
-        self.test_data = pd.read_csv(self.config.test_data_path)
+        self.test_data = STORE.get_dataframe(self.config.test_data_path)
         self.model = joblib.load(self.config.model_path)
+        logger.info(f"Evaluating model version {self.config.model_version} ({self.config.model_path})")
         self.X_test = self.test_data.drop([self.config.target_column], axis=1)
         self.y_test = self.test_data[self.config.target_column]
 
+    def explanation_report(self) -> dict:
+        """
+        Explain the test predictions by per-feature contributions and save their aggregate report.
+
+        The contributions of all test rows are computed in one batch on the packed trees
+        (see `PackedTreeEnsemble.contributions`). For every feature, the report holds the
+        mean contribution, the mean absolute contribution and its share of the total,
+        ordered by mean absolute contribution.
+
+        Returns:
+        - dict: The report, or None if the model is not a gradient boosting tree ensemble.
+        """
+        try:
+            explainer = PackedTreeEnsemble.from_packed(pack_gradient_boosting(self.model))
+        except TypeError as e:
+            logger.warning(f"Skipping the explanation report: {e}")
+            return None
+
+        bias, contributions = explainer.contributions(self.X_test)
+        mean_abs = np.abs(contributions).mean(axis=0)
+        order = np.argsort(-mean_abs, kind='stable')
+        report = {
+            "rows": len(self.X_test),
+            "bias": bias,
+            "features": {
+                explainer.feature_names[i]: {
+                    "mean_contribution": float(contributions[:, i].mean()),
+                    "mean_abs_contribution": float(mean_abs[i]),
+                    "share": float(mean_abs[i] / mean_abs.sum()) if mean_abs.sum() > 0 else 0.0,
+                }
+                for i in order
+            },
+        }
+        save_json(path=Path(self.config.explanation_file_name), data=report)
+        return report
+
     def log_into_mlflow(self):
         """
         Log model parameters, metrics, and the model itself into MLflow.
@@ -70,12 +110,19 @@ class ModelEvaluation:
             # Save evaluation metrics to a JSON file
             save_json(path=Path(self.config.metric_file_name), data=scores)
 
+            # Save the mean feature contributions to the test predictions
+            report = self.explanation_report()
+
             # Log parameters and metrics into MLflow
             mlflow.log_params(self.config.all_params)
+            mlflow.set_tag("model_version", self.config.model_version)
             mlflow.log_metric("rmse", rmse)
             mlflow.log_metric("mae", mae)
             mlflow.log_metric("r2", r2)
             mlflow.log_metric("average_relative_error", average_relative_error)
+            if report is not None:
+                mlflow.log_metrics({f"contribution_share_{feature}": values["share"]
+                                    for feature, values in report["features"].items()})
 
 
             # Log the model into MLflow based on the type of tracking URL
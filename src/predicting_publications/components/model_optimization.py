@@ -0,0 +1,172 @@
+import os
+import time
+import joblib
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json, create_directories
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.packed_model import (PackedTreeEnsemble, pack_gradient_boosting,
+                                                       packed_nbytes, quantize_thresholds,
+                                                       merge_duplicate_leaves, prune_trailing_trees,
+                                                       write_packed_arrays)
+from predicting_publications.entity.config_entity import ModelOptimizationConfig
+
+
+class ModelOptimization:
+    """
+    ModelOptimization shrinks the trained tree ensemble for low-latency serving.
+
+    Starting from the packed copy of the trained GradientBoostingRegressor, the steps are
+    applied one after another: threshold quantization (lossless), merging of sibling leaves
+    with nearly equal values, and pruning of trailing trees with a negligible contribution.
+    Every step is scored on the test data (RMSE, MAE, size, batch and single-row latency)
+    and the resulting report is saved. Serving only scores small calls with a packed model
+    (larger batches go to the joblib model), so the optimized model is accepted only when
+    its test RMSE is within `max_rmse_increase` of the original model and its single-row
+    latency is at least `min_latency_reduction` below that of the production model as
+    served (its packed copy, or the joblib model without one). It is then written to its
+    own path, for the pipeline stage to register it.
+
+    Attributes:
+    - config (ModelOptimizationConfig): Configuration settings for model optimization.
+    """
+
+    # Single-row predict calls timed per variant, in repeats of which the fastest is kept
+    SINGLE_ROW_CALLS = 50
+    SINGLE_ROW_REPEATS = 5
+
+    def __init__(self, config: ModelOptimizationConfig):
+        """
+        Initialize the ModelOptimization component.
+
+        Args:
+        - config (ModelOptimizationConfig): Configuration settings for model optimization.
+        """
+        self.config = config
+
+    def load_data(self):
+        """
+        Load the trained model and the train and test data.
+        """
+        self.model = joblib.load(self.config.model_path)
+        self.X_train = STORE.get_dataframe(self.config.train_data_path).drop([self.config.target_column], axis=1)
+        test_data = STORE.get_dataframe(self.config.test_data_path)
+        self.X_test = test_data.drop([self.config.target_column], axis=1)
+        self.y_test = test_data[self.config.target_column].values
+
+    def evaluate(self, model, size_bytes: int, n_trees: int, n_nodes: int) -> dict:
+        """
+        Score one model variant on the test data.
+
+        Returns:
+        - dict: Test RMSE and MAE, size, tree and node counts, and predict latency.
+        """
+        start = time.perf_counter()
+        predictions = model.predict(self.X_test)
+        batch_seconds = time.perf_counter() - start
+
+        single_row = self.X_test.iloc[:1]
+        single_row_seconds = float("inf")
+        for _ in range(self.SINGLE_ROW_REPEATS):
+            start = time.perf_counter()
+            for _ in range(self.SINGLE_ROW_CALLS):
+                model.predict(single_row)
+            single_row_seconds = min(single_row_seconds, (time.perf_counter() - start) / self.SINGLE_ROW_CALLS)
+
+        return {
+            "rmse": float(np.sqrt(mean_squared_error(self.y_test, predictions))),
+            "mae": float(mean_absolute_error(self.y_test, predictions)),
+            "size_bytes": int(size_bytes),
+            "n_trees": int(n_trees),
+            "n_nodes": int(n_nodes),
+            "batch_predict_ms": round(batch_seconds * 1000, 3),
+            "single_row_predict_ms": round(single_row_seconds * 1000, 4),
+        }
+
+    def _evaluate_packed(self, packed: dict) -> dict:
+        return self.evaluate(PackedTreeEnsemble.from_packed(packed), packed_nbytes(packed),
+                             len(packed["tree_offsets"]) - 1, len(packed["value"]))
+
+    def optimize(self) -> dict:
+        """
+        Apply the optimization steps, save the report and, if accurate enough, the optimized model.
+
+        This method:
+        1. Scores the trained model, the packed copy it is served with (if any), and its
+           packed version.
+        2. Quantizes the thresholds, merges sibling leaves and prunes trailing trees,
+           scoring the model after each step.
+        3. Saves the optimized model when its test RMSE is acceptable and it is faster
+           than the production model on single rows.
+        4. Saves the accuracy-versus-latency report.
+
+        Returns:
+        - dict: The report, or an empty dict when the model is not a GradientBoostingRegressor.
+        """
+        self.load_data()
+        if not isinstance(self.model, GradientBoostingRegressor):
+            logger.info(f"Skipping model optimization: {type(self.model).__name__} is not a tree ensemble that can be packed")
+            return {}
+
+        n_nodes = sum(estimator.tree_.node_count for estimator in self.model.estimators_[:, 0])
+        report = {"steps": {"sklearn": self.evaluate(self.model, os.path.getsize(self.config.model_path),
+                                                     self.model.n_estimators_, n_nodes)}}
+
+        # Single rows are served by the packed copy of the production model when it is
+        # up to date (see PredictionPipeline), else by the joblib model
+        served = "sklearn"
+        production_packed_path = self.config.model_path.with_name("model.ptree")
+        if (production_packed_path.exists()
+                and os.path.getmtime(production_packed_path) >= os.path.getmtime(self.config.model_path)):
+            production = PackedTreeEnsemble.load(production_packed_path)
+            report["steps"]["production_packed"] = self.evaluate(production, os.path.getsize(production_packed_path),
+                                                                 production.n_trees, len(production.value))
+            served = "production_packed"
+        report["served_step"] = served
+
+        packed = pack_gradient_boosting(self.model)
+        report["steps"]["packed"] = self._evaluate_packed(packed)
+
+        if self.config.threshold_encoding != "float64":
+            try:
+                packed = quantize_thresholds(packed, self.config.threshold_encoding)
+            except ValueError as e:
+                logger.warning(f"{e}; falling back to float32 thresholds")
+                packed = quantize_thresholds(packed, "float32")
+            report["steps"]["quantized_thresholds"] = self._evaluate_packed(packed)
+
+        packed = merge_duplicate_leaves(packed, self.config.leaf_merge_tolerance)
+        report["steps"]["merged_leaves"] = self._evaluate_packed(packed)
+
+        if self.config.prune_tolerance > 0:
+            packed = prune_trailing_trees(packed, self.X_train, self.config.prune_tolerance)
+            report["steps"]["pruned_trees"] = self._evaluate_packed(packed)
+
+        baseline_rmse = report["steps"]["sklearn"]["rmse"]
+        optimized = report["steps"][list(report["steps"])[-1]]
+        report["rmse_increase"] = round(optimized["rmse"] / baseline_rmse - 1, 6) if baseline_rmse else 0.0
+        served_latency = report["steps"][served]["single_row_predict_ms"]
+        report["latency_reduction"] = (round(1 - optimized["single_row_predict_ms"] / served_latency, 4)
+                                       if served_latency else 0.0)
+        accurate = report["rmse_increase"] <= self.config.max_rmse_increase
+        faster = report["latency_reduction"] >= self.config.min_latency_reduction
+        report["accepted"] = accurate and faster
+
+        if report["accepted"]:
+            create_directories([self.config.packed_model_path.parent])
+            write_packed_arrays(packed, self.config.packed_model_path)
+            logger.info(f"Optimized model saved at: {self.config.packed_model_path}")
+        elif not accurate:
+            logger.warning(f"Optimized model rejected: test RMSE increased by {report['rmse_increase']:.2%}, "
+                           f"more than the accepted {self.config.max_rmse_increase:.2%}")
+        else:
+            logger.warning(f"Optimized model rejected: single-row latency reduced by {report['latency_reduction']:.2%} "
+                           f"against the production model ({served}), less than the required "
+                           f"{self.config.min_latency_reduction:.2%}")
+
+        save_json(path=self.config.report_file, data=report)
+        self.report = report
+        return report
@@ -9,6 +9,9 @@ from scipy.stats import randint as sp_randint
 from scipy.stats import uniform as sp_uniform
 
 from predicting_publications.config.configuration import ModelTrainerConfig
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.packed_model import save_packed_model
+from predicting_publications.utils.onnx_model import export_onnx
 
 class ModelTrainer:
     """
@@ -74,14 +77,16 @@ class ModelTrainer:
         2. Separates the predictors and target variables.
         3. Initializes a Gradient Boosting Regressor model with the specified hyperparameters.
         4. Fits the model on the training data.
-        5. Saves the trained model to the path specified in the configuration.
+        5. Saves the trained model to the path specified in the configuration,
+           along with its packed, memory-mappable copy used by serving and its ONNX export.
         """
         # Load training dataset
-        train_data = pd.read_csv(self.config.train_data_path)
+        train_data = STORE.get_dataframe(self.config.train_data_path)
 
         # Separate predictors and target variable
         X_train = train_data.drop([self.config.target_column], axis=1)
         y_train = train_data[[self.config.target_column]].values.ravel()
+        self.rows_trained = len(train_data)
 
         # Perform hyperparameter tuning
         # best_params = self.hyperparameter_tuning(X_train, y_train)
@@ -109,3 +114,10 @@ class ModelTrainer:
         model_save_path = os.path.join(self.config.root_dir, self.config.model_name)
         joblib.dump(gb_model, model_save_path)
         logger.info(f"Model saved successfully to {model_save_path}")
+
+        # Save the packed copy of the model, loaded by serving through np.memmap
+        save_packed_model(gb_model, os.path.join(self.config.root_dir, self.config.packed_model_name))
+
+        # Export the model to ONNX, checked against the model on the train data
+        self.onnx_parity = export_onnx(gb_model, X_train, os.path.join(self.config.root_dir, self.config.onnx_model_name),
+                                       self.config.onnx_parity_tolerance)
@@ -0,0 +1,231 @@
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge, PoissonRegressor
+from sklearn.metrics import mean_squared_error, mean_absolute_error, mean_poisson_deviance, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.utils.executor import create_executor
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.packed_model import save_packed_model
+from predicting_publications.utils.onnx_model import export_onnx
+from predicting_publications.entity.config_entity import MultiModelTrainerConfig
+
+
+def build_candidate(name: str, params: dict, gbr_params: dict):
+    """
+    Build an unfitted candidate model.
+
+    Args:
+    - name (str): Candidate name, one of gbr, hist_gbm, hist_gbm_poisson, ridge or poisson_glm.
+    - params (dict): Hyperparameters of the candidate.
+    - gbr_params (dict): Hyperparameters of the GradientBoostingRegressor section of params.yaml.
+
+    Raises:
+    - ValueError: If the candidate name is unknown.
+    """
+    params = dict(params or {})
+    if name == "gbr":
+        params = {**gbr_params, **params}
+        if params.get("max_features") == "None":
+            params["max_features"] = None
+        return GradientBoostingRegressor(**params)
+    if name == "hist_gbm":
+        return HistGradientBoostingRegressor(random_state=gbr_params.get("random_state"), **params)
+    if name == "hist_gbm_poisson":
+        params.setdefault("loss", "poisson")
+        return HistGradientBoostingRegressor(random_state=gbr_params.get("random_state"), **params)
+    if name == "ridge":
+        return make_pipeline(StandardScaler(), Ridge(**params))
+    if name == "poisson_glm":
+        return make_pipeline(StandardScaler(), PoissonRegressor(**params))
+    raise ValueError(f"Unknown candidate model: {name}")
+
+
+def validation_metrics(actual, pred) -> dict:
+    """
+    Compute the validation metrics used to compare candidates.
+    """
+    # Poisson deviance is only defined for strictly positive predictions
+    clipped = np.clip(pred, 1e-6, None)
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(actual, pred))),
+        "mae": float(mean_absolute_error(actual, pred)),
+        "r2": float(r2_score(actual, pred)),
+        "poisson_deviance": float(mean_poisson_deviance(actual, clipped)),
+    }
+
+
+def blend_weights_of(errors: list, metric: str) -> np.ndarray:
+    """
+    Return blend weights inversely proportional to the candidates' validation errors.
+
+    The errors are those of the selection metric; RMSE is squared, so its weights are
+    the inverse-variance (inverse-MSE) weights. The weights sum to 1.
+    """
+    errors = np.asarray(errors, dtype=float)
+    if metric == "rmse":
+        errors = errors ** 2
+    # A perfect candidate would get an infinite weight
+    inverse = 1.0 / np.maximum(errors, np.finfo(float).tiny)
+    return inverse / inverse.sum()
+
+
+def fit_candidate(name: str, params: dict, gbr_params: dict, X_fit, y_fit, X_val=None, y_val=None) -> tuple:
+    """
+    Fit one candidate and score it on the validation data.
+
+    This is a module-level function so it can run in worker processes.
+
+    Returns:
+    - tuple: (name, fitted model, validation predictions or None, fit time in seconds).
+    """
+    model = build_candidate(name, params, gbr_params)
+    start = time.perf_counter()
+    model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+    predictions = model.predict(X_val) if X_val is not None else None
+    return name, model, predictions, fit_seconds
+
+
+class BlendedRegressor:
+    """
+    Weighted average of several fitted regressors, served as a single model.
+
+    Attributes:
+    - names (list): Names of the blended candidates.
+    - models (list): The fitted candidate models.
+    - weights (np.ndarray): Blend weights, summing to 1.
+    """
+
+    def __init__(self, names: list, models: list, weights):
+        self.names = list(names)
+        self.models = list(models)
+        self.weights = np.asarray(weights, dtype=float)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict the weighted average of the blended models.
+        """
+        prediction = np.zeros(len(X))
+        for weight, model in zip(self.weights, self.models):
+            prediction += weight * model.predict(X)
+        return prediction
+
+
+class MultiModelTrainer:
+    """
+    MultiModelTrainer fits several candidate regressors in parallel on the configured
+    executor and hands the best one (or a blend of the best ones) to serving as a single model.
+
+    Candidates are fitted on the same transformed train data minus a held-out validation
+    split, and ranked by the configured validation metric. The top `blend_top_k` candidates
+    are blended with weights inversely proportional to their validation metric; the blend is kept only when it beats the best
+    single candidate. The selected models are then optionally refitted on the full train
+    data and saved to the same path as the single-model trainer, so `PredictionPipeline`
+    and the downstream stages are unchanged.
+
+    Attributes:
+    - config (MultiModelTrainerConfig): Configuration settings for multi-model training.
+    """
+
+    def __init__(self, config: MultiModelTrainerConfig):
+        """
+        Initialize MultiModelTrainer with the given configurations.
+
+        Args:
+        - config (MultiModelTrainerConfig): Configuration settings for multi-model training.
+        """
+        self.config = config
+
+    def _fit_all(self, names: list, X_fit, y_fit, X_val=None, y_val=None) -> dict:
+        """
+        Fit the named candidates in parallel and return {name: (model, predictions, fit seconds)}.
+        """
+        workers = max(1, min(self.config.max_workers, len(names)))
+        with create_executor(self.config.executor, workers) as executor:
+            futures = [executor.submit(fit_candidate, name, self.config.candidates[name], self.config.gbr_params,
+                                       X_fit, y_fit, X_val, y_val)
+                       for name in names]
+            results = [future.result() for future in futures]
+        return {name: (model, predictions, seconds) for name, model, predictions, seconds in results}
+
+    def train(self):
+        """
+        Fit, compare and select candidate models, then save the serving artifact and a report.
+
+        This method:
+        1. Loads the train data and holds out a validation split.
+        2. Fits every candidate in parallel on the configured executor.
+        3. Ranks the candidates and decides between the best one and a blend of the best ones.
+        4. Refits the selected candidates on the full train data (if configured).
+        5. Saves the model (with its packed copy and ONNX export when possible) and the candidates report.
+        """
+        train_data = STORE.get_dataframe(self.config.train_data_path)
+        X = train_data.drop([self.config.target_column], axis=1)
+        y = train_data[[self.config.target_column]].values.ravel()
+        self.rows_trained = len(train_data)
+
+        X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=self.config.validation_size,
+                                                      random_state=self.config.random_state)
+
+        names = list(self.config.candidates)
+        logger.info(f"Fitting {len(names)} candidate models in parallel: {', '.join(names)}")
+        fitted = self._fit_all(names, X_fit, y_fit, X_val, y_val)
+
+        report = {"selection_metric": self.config.selection_metric, "candidates": {}}
+        for name, (_, predictions, seconds) in fitted.items():
+            report["candidates"][name] = {**validation_metrics(y_val, predictions), "fit_seconds": round(seconds, 3)}
+            logger.info(f"Candidate {name}: {report['candidates'][name]}")
+
+        metric = self.config.selection_metric
+        ranked = sorted(names, key=lambda name: report["candidates"][name][metric])
+        selected, weights = [ranked[0]], np.array([1.0])
+
+        top = ranked[:max(1, self.config.blend_top_k)]
+        if len(top) > 1:
+            blend_weights = blend_weights_of([report["candidates"][name][metric] for name in top], metric)
+            blend_predictions = sum(w * fitted[name][1] for w, name in zip(blend_weights, top))
+            report["blend"] = {"members": top, "weights": blend_weights.round(6).tolist(),
+                               **validation_metrics(y_val, blend_predictions)}
+            if report["blend"][metric] < report["candidates"][ranked[0]][metric]:
+                selected, weights = top, blend_weights
+
+        report["selected"] = {"members": selected, "weights": weights.round(6).tolist()}
+        logger.info(f"Selected {' + '.join(selected)} by validation {metric}")
+
+        if self.config.refit:
+            logger.info("Refitting the selected candidates on the full train data")
+            models = {name: model for name, (model, _, _) in self._fit_all(selected, X, y).items()}
+        else:
+            models = {name: fitted[name][0] for name in selected}
+
+        if len(selected) == 1:
+            final_model = models[selected[0]]
+        else:
+            final_model = BlendedRegressor(selected, [models[name] for name in selected], weights)
+
+        model_save_path = os.path.join(self.config.root_dir, self.config.model_name)
+        joblib.dump(final_model, model_save_path)
+        logger.info(f"Model saved successfully to {model_save_path}")
+
+        # Only a single GradientBoostingRegressor has a packed copy; remove a stale one otherwise
+        packed_save_path = os.path.join(self.config.root_dir, self.config.packed_model_name)
+        if isinstance(final_model, GradientBoostingRegressor):
+            save_packed_model(final_model, packed_save_path)
+        elif os.path.exists(packed_save_path):
+            os.remove(packed_save_path)
+
+        # Export the model to ONNX when it can be converted, checked against the model on the train data
+        self.onnx_parity = export_onnx(final_model, X, os.path.join(self.config.root_dir, self.config.onnx_model_name),
+                                       self.config.onnx_parity_tolerance)
+        report["onnx_parity"] = self.onnx_parity
+
+        save_json(path=self.config.report_file, data=report)
@@ -0,0 +1,134 @@
+import datetime
+import numpy as np
+import pandas as pd
+import joblib
+from pathlib import Path
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.temporal import TEMPORAL_COLUMNS
+from predicting_publications.entity.config_entity import PredictionGridConfig
+
+
+class PredictionGrid:
+    """
+    PredictionGrid precomputes model predictions for every known spatial cell over
+    every hour of a fixed calendar horizon.
+
+    Each cell is scored with its content profile, i.e. the mean content features
+    (likes, comments, symbols, ...) observed for that cell in the training data.
+    The predictions are stored as a float32 array of shape (cells, days, 24) that
+    the serving side memory-maps, together with a JSON index that maps cells and
+    calendar days onto the array axes. The grid is filled with the production model of
+    the model registry, whose version is recorded in the index.
+
+    Attributes:
+    - config (PredictionGridConfig): Configuration settings for the prediction grid.
+    """
+
+    # Number of rows scored per `model.predict` call while filling the grid
+    CHUNK_SIZE = 200_000
+
+    def __init__(self, config: PredictionGridConfig):
+        """
+        Initialize the PredictionGrid component.
+
+        Args:
+        - config (PredictionGridConfig): Configuration settings for the prediction grid.
+        """
+        self.config = config
+
+    def _horizon_dates(self) -> list:
+        """
+        Return the calendar days of the horizon as a list of datetime.date objects.
+        """
+        if self.config.start_date:
+            start = datetime.date.fromisoformat(str(self.config.start_date))
+        else:
+            start = datetime.datetime.utcnow().date()
+        return [start + datetime.timedelta(days=i) for i in range(self.config.horizon_days)]
+
+    def load_cells(self):
+        """
+        Load the train data and derive the known cells and their content profiles.
+        """
+        train_data = STORE.get_dataframe(self.config.train_data_path)
+        self.feature_columns = [c for c in train_data.columns if c != self.config.target_column]
+        self.content_columns = [c for c in self.feature_columns
+                                if c not in TEMPORAL_COLUMNS and c not in ('lon', 'lat')]
+
+        self.profiles = train_data.groupby(['lon', 'lat'])[self.content_columns].mean().reset_index()
+        logger.info(f"Found {len(self.profiles)} known cells in {self.config.train_data_path}")
+
+    def build_grid(self) -> np.ndarray:
+        """
+        Score every cell x day x hour combination of the horizon with the trained model.
+
+        Returns:
+        - np.ndarray: Predictions of shape (cells, days, 24) as float32.
+        """
+        model = joblib.load(self.config.model_path)
+        logger.info(f"Filling the grid with model version {self.config.model_version} ({self.config.model_path})")
+        self.dates = self._horizon_dates()
+
+        n_cells, n_days = len(self.profiles), len(self.dates)
+        calendar = np.array([(d.day, d.weekday(), d.month) for d in self.dates], dtype=np.int64)
+
+        # One row per (cell, day, hour), laid out in the same order as the grid axes
+        cell_idx = np.repeat(np.arange(n_cells), n_days * 24)
+        day_idx = np.tile(np.repeat(np.arange(n_days), 24), n_cells)
+        hours = np.tile(np.arange(24), n_cells * n_days)
+
+        rows = pd.DataFrame({
+            'lon': self.profiles['lon'].values[cell_idx],
+            'lat': self.profiles['lat'].values[cell_idx],
+            'hour': hours,
+            'day': calendar[day_idx, 0],
+            'dayofweek': calendar[day_idx, 1],
+            'month': calendar[day_idx, 2],
+        })
+        for column in self.content_columns:
+            rows[column] = self.profiles[column].values[cell_idx]
+        rows = rows[self.feature_columns]
+
+        logger.info(f"Scoring {len(rows)} grid rows ({n_cells} cells x {n_days} days x 24 hours)")
+        predictions = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), self.CHUNK_SIZE):
+            chunk = rows.iloc[start:start + self.CHUNK_SIZE]
+            predictions[start:start + len(chunk)] = model.predict(chunk)
+
+        self.rows_scored = len(rows)
+        return predictions.reshape(n_cells, n_days, 24)
+
+    def save_grid(self, grid: np.ndarray):
+        """
+        Save the grid as a .npy file and its lookup index as JSON.
+
+        Args:
+        - grid (np.ndarray): Predictions of shape (cells, days, 24).
+        """
+        np.save(self.config.grid_file, grid)
+        logger.info(f"Prediction grid of shape {grid.shape} saved to {self.config.grid_file}")
+
+        # Serving only answers from the grid while this version is in production
+        index = {
+            'model_version': self.config.model_version,
+            'feature_columns': self.feature_columns,
+            'content_columns': self.content_columns,
+            'cells': self.profiles[['lon', 'lat']].values.tolist(),
+            'profiles': self.profiles[self.content_columns].values.tolist(),
+            'dates': [[d.day, d.weekday(), d.month] for d in self.dates],
+        }
+        save_json(path=Path(self.config.index_file), data=index)
+
+    def orchestrate_grid(self):
+        """
+        Orchestrates the precomputation by:
+        1. Loading the known cells and their content profiles.
+        2. Scoring every cell x day x hour combination.
+        3. Saving the grid and its index.
+        """
+        self.load_cells()
+        grid = self.build_grid()
+        self.save_grid(grid)
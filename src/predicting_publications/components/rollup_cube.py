@@ -0,0 +1,148 @@
+import os
+import numpy as np
+from pathlib import Path
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.temporal import to_datetime
+from predicting_publications.entity.config_entity import RollupCubeConfig
+
+# Rollups of the cube: name -> (spatial level, NumPy datetime unit of the time buckets)
+ROLLUPS = {
+    'cell_hour': ('cell', 'h'),
+    'cell_day': ('cell', 'D'),
+    'region_month': ('region', 'M'),
+}
+
+# Columns of a rollup, one .npy file each, in its own directory
+KEYS_FILE = 'keys.npy'                  # int64: entity << 32 | period, sorted
+PUBLICATIONS_FILE = 'publications.npy'  # int32: publications of the entity in the period
+CUMULATIVE_FILE = 'cumulative.npy'      # int64: running total of publications, starting at 0
+
+# Number of bits of a key holding the period (the rest holds the entity)
+PERIOD_BITS = 32
+
+
+class RollupCube:
+    """
+    RollupCube precomputes publication counts at several spatial and temporal resolutions.
+
+    The aggregated data (publications per hour and location) is rolled up to cell x hour,
+    cell x day and region x month, where a cell is one (lon, lat) location and a region a
+    block of `region_cells` x `region_cells` neighbouring cells. Every rollup is stored as
+    columns of a sorted key (entity, period), the publication count and its running total,
+    so the time series of an entity is a contiguous slice found by binary search, and the
+    total of any time range is the difference of two running totals.
+
+    Attributes:
+    - config (RollupCubeConfig): Configuration settings for the rollup cube.
+    """
+
+    def __init__(self, config: RollupCubeConfig):
+        """
+        Initialize the RollupCube component.
+
+        Args:
+        - config (RollupCubeConfig): Configuration settings for the rollup cube.
+        """
+        self.config = config
+
+    def load_data(self):
+        """
+        Load the aggregated data and index its cells and regions.
+
+        Raises:
+        - FileNotFoundError: If the aggregated data does not exist.
+        """
+        try:
+            data = STORE.get_dataframe(self.config.aggregated_data_path)
+        except FileNotFoundError:
+            logger.error(f"File not found: {self.config.aggregated_data_path}")
+            raise
+        self.rows = len(data)
+
+        # Cells in (lon, lat) order; regions group neighbouring grid points of both axes
+        lons, lon_index = np.unique(data['lon'].to_numpy(), return_inverse=True)
+        lats, lat_index = np.unique(data['lat'].to_numpy(), return_inverse=True)
+        cell_codes = lon_index.astype(np.int64) * len(lats) + lat_index
+        cells, self.cell_of_row = np.unique(cell_codes, return_inverse=True)
+        cell_lon, cell_lat = cells // len(lats), cells % len(lats)
+        self.cells = np.column_stack([lons[cell_lon], lats[cell_lat]])
+
+        size = self.config.region_cells
+        region_codes = (cell_lon // size) * ((len(lats) + size - 1) // size) + cell_lat // size
+        region_codes, self.region_of_cell = np.unique(region_codes, return_inverse=True)
+        self.regions = [
+            [float(lons[cell_lon[members]].min()), float(lats[cell_lat[members]].min()),
+             float(lons[cell_lon[members]].max()), float(lats[cell_lat[members]].max())]
+            for members in (np.flatnonzero(self.region_of_cell == region) for region in range(len(region_codes)))
+        ]
+
+        self.timestamps = to_datetime(data['timestamp']).to_numpy()
+        self.publications = data['publication_count'].to_numpy(dtype=np.int64)
+        logger.info(f"Loaded {self.rows} aggregated rows of {len(self.cells)} cells in {len(self.regions)} regions")
+
+    def build_rollup(self, level: str, unit: str) -> dict:
+        """
+        Roll the aggregated data up to one spatial level and time unit.
+
+        Args:
+        - level (str): 'cell' or 'region'.
+        - unit (str): NumPy datetime unit of the periods ('h', 'D' or 'M').
+
+        Returns:
+        - dict: The columns of the rollup (keys, publications and cumulative) and its first period.
+        """
+        entities = self.cell_of_row if level == 'cell' else self.region_of_cell[self.cell_of_row]
+        periods = self.timestamps.astype(f'datetime64[{unit}]').astype(np.int64)
+        base = int(periods.min())
+
+        keys = (entities.astype(np.int64) << PERIOD_BITS) | (periods - base)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        publications = np.bincount(inverse.ravel(), weights=self.publications, minlength=len(keys)).astype(np.int64)
+        cumulative = np.concatenate([[0], np.cumsum(publications)])
+        return {
+            'keys': keys,
+            'publications': publications.astype(np.int32),
+            'cumulative': cumulative,
+            'base': base,
+        }
+
+    def save_rollup(self, name: str, rollup: dict):
+        """
+        Save the columns of a rollup as .npy files in their own directory.
+        """
+        rollup_dir = Path(self.config.root_dir) / name
+        os.makedirs(rollup_dir, exist_ok=True)
+        np.save(rollup_dir / KEYS_FILE, rollup['keys'])
+        np.save(rollup_dir / PUBLICATIONS_FILE, rollup['publications'])
+        np.save(rollup_dir / CUMULATIVE_FILE, rollup['cumulative'])
+        logger.info(f"Rollup {name} of {len(rollup['keys'])} entries saved to {rollup_dir}")
+
+    def orchestrate_cube(self) -> dict:
+        """
+        Orchestrates the precomputation by:
+        1. Loading the aggregated data and indexing its cells and regions.
+        2. Building and saving every rollup.
+        3. Saving the index of the cube.
+
+        Returns:
+        - dict: Number of entries of every rollup.
+        """
+        self.load_data()
+        rollups = {}
+        for name, (level, unit) in ROLLUPS.items():
+            rollup = self.build_rollup(level, unit)
+            self.save_rollup(name, rollup)
+            rollups[name] = {'level': level, 'unit': unit, 'base': rollup['base'], 'entries': len(rollup['keys'])}
+
+        index = {
+            'region_cells': self.config.region_cells,
+            'cells': self.cells.tolist(),
+            'cell_regions': self.region_of_cell.tolist(),
+            'regions': self.regions,
+            'rollups': rollups,
+        }
+        save_json(path=Path(self.config.index_file), data=index)
+        return {name: rollup['entries'] for name, rollup in rollups.items()}
@@ -0,0 +1,251 @@
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.cluster import KMeans
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.utils.executor import create_executor
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.onnx_model import export_onnx
+from predicting_publications.entity.config_entity import ShardedModelTrainerConfig
+from predicting_publications.components.multi_model_trainer import build_candidate
+
+# Shard id of the global fallback model in reports and worker results
+FALLBACK_SHARD = -1
+
+
+class SpatialPartition:
+    """
+    Partition of the (lon, lat) plane into shards.
+
+    - grid: `lon_edges` x `lat_edges` cells; the edges are quantiles of the train
+      coordinates, so the shards along each axis hold about as many rows.
+    - kmeans: one shard per cluster centre of the train coordinates; a location
+      belongs to the nearest centre.
+
+    Attributes:
+    - method (str): 'grid' or 'kmeans'.
+    - n_shards (int): Number of shards, numbered from 0.
+    """
+
+    def __init__(self, method: str, lon_edges=None, lat_edges=None, centers=None):
+        self.method = method
+        self.lon_edges = None if lon_edges is None else np.asarray(lon_edges, dtype=float)
+        self.lat_edges = None if lat_edges is None else np.asarray(lat_edges, dtype=float)
+        self.centers = None if centers is None else np.asarray(centers, dtype=float)
+        if method == "grid":
+            self.n_shards = (len(self.lon_edges) + 1) * (len(self.lat_edges) + 1)
+        else:
+            self.n_shards = len(self.centers)
+
+    @classmethod
+    def grid(cls, lon: np.ndarray, lat: np.ndarray, shape: tuple) -> "SpatialPartition":
+        """
+        Build a grid of shape[0] x shape[1] shards with quantile edges (duplicate edges are merged).
+        """
+        def edges(values, n):
+            return np.unique(np.quantile(values, np.linspace(0, 1, n + 1)[1:-1]))
+        return cls("grid", lon_edges=edges(lon, shape[0]), lat_edges=edges(lat, shape[1]))
+
+    @classmethod
+    def kmeans(cls, lon: np.ndarray, lat: np.ndarray, n_clusters: int, random_state=None) -> "SpatialPartition":
+        """
+        Cluster the coordinates into at most `n_clusters` shards (fewer when there are fewer locations).
+        """
+        points = np.unique(np.column_stack([lon, lat]), axis=0)
+        n_clusters = min(n_clusters, len(points))
+        # Weighting every location by its rows would put all centres in the busiest area;
+        # clustering the distinct locations partitions the covered area instead
+        clustering = KMeans(n_clusters=n_clusters, n_init=10, random_state=random_state).fit(points)
+        return cls("kmeans", centers=clustering.cluster_centers_)
+
+    def assign(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """
+        Return the shard of every location, with vectorized lookups.
+        """
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        if self.method == "grid":
+            return (np.searchsorted(self.lon_edges, lon, side="right") * (len(self.lat_edges) + 1)
+                    + np.searchsorted(self.lat_edges, lat, side="right"))
+        distances = (lon[:, None] - self.centers[:, 0]) ** 2 + (lat[:, None] - self.centers[:, 1]) ** 2
+        return np.argmin(distances, axis=1)
+
+    def describe(self, shard: int) -> dict:
+        """
+        Return the area of a shard: its grid bounds (None where unbounded) or its cluster centre.
+        """
+        if self.method == "kmeans":
+            return {"center": self.centers[shard].round(6).tolist()}
+        lon_bounds = [None] + self.lon_edges.tolist() + [None]
+        lat_bounds = [None] + self.lat_edges.tolist() + [None]
+        i, j = divmod(shard, len(self.lat_edges) + 1)
+        return {"lon": lon_bounds[i:i + 2], "lat": lat_bounds[j:j + 2]}
+
+
+class ShardedRegressor:
+    """
+    Regressors of spatial shards, served as a single model.
+
+    Every row is routed to the model of the shard of its coordinates; rows of shards
+    without a model (too few train rows) are predicted by the global fallback model.
+    Each model is called once per batch, on all the rows routed to it.
+
+    Attributes:
+    - partition (SpatialPartition): The shards of the coordinates.
+    - models (dict): Shard -> fitted regressor.
+    - fallback: Regressor fitted on all the train data.
+    - feature_names (list): Columns of the train data.
+    """
+
+    def __init__(self, partition: SpatialPartition, models: dict, fallback, feature_names: list):
+        self.partition = partition
+        self.models = dict(models)
+        self.fallback = fallback
+        self.feature_names = list(feature_names)
+
+        # Model of every shard: its index in `models`, or -1 for the fallback
+        self._shard_models = list(self.models.values())
+        self._route = np.full(partition.n_shards, -1, dtype=np.int64)
+        for i, shard in enumerate(self.models):
+            self._route[shard] = i
+
+    def _coordinates(self, X) -> tuple:
+        if hasattr(X, "columns"):
+            return X["lon"].to_numpy(), X["lat"].to_numpy()
+        X = np.asarray(X)
+        return X[:, self.feature_names.index("lon")], X[:, self.feature_names.index("lat")]
+
+    def route(self, X) -> np.ndarray:
+        """
+        Return the index in `models` of the model of every row (-1 for the fallback model).
+        """
+        return self._route[self.partition.assign(*self._coordinates(X))]
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict every row with the model of its shard.
+        """
+        routes = self.route(X)
+        prediction = np.empty(len(routes))
+        for route in np.unique(routes):
+            rows = np.flatnonzero(routes == route)
+            model = self.fallback if route < 0 else self._shard_models[route]
+            prediction[rows] = model.predict(X.iloc[rows] if hasattr(X, "iloc") else np.asarray(X)[rows])
+        return prediction
+
+
+def fit_shard(shard: int, gbr_params: dict, X, y) -> tuple:
+    """
+    Fit the GradientBoostingRegressor of one shard (or the fallback model).
+
+    This is a module-level function so it can run in worker processes.
+
+    Returns:
+    - tuple: (shard, fitted model, fit time in seconds).
+    """
+    model = build_candidate("gbr", {}, gbr_params)
+    start = time.perf_counter()
+    model.fit(X, y)
+    return shard, model, time.perf_counter() - start
+
+
+class ShardedModelTrainer:
+    """
+    ShardedModelTrainer partitions the train data into spatial shards (a quantile grid or
+    k-means clusters of the coordinates) and fits one GradientBoostingRegressor per shard,
+    plus a global fallback model, in parallel on the configured executor.
+
+    Each model only learns the area of its shard, and fitting several small models is
+    cheaper than one model on all the data, as the fit time grows faster than linearly
+    with the rows. The models are saved as a single ShardedRegressor to the same path as
+    the single-model trainer, so `PredictionPipeline` and the downstream stages are unchanged.
+
+    Attributes:
+    - config (ShardedModelTrainerConfig): Configuration settings for sharded training.
+    """
+
+    def __init__(self, config: ShardedModelTrainerConfig):
+        """
+        Initialize ShardedModelTrainer with the given configurations.
+
+        Args:
+        - config (ShardedModelTrainerConfig): Configuration settings for sharded training.
+        """
+        self.config = config
+
+    def partition(self, lon: np.ndarray, lat: np.ndarray) -> SpatialPartition:
+        """
+        Partition the train coordinates with the configured method.
+        """
+        if self.config.method == "grid":
+            return SpatialPartition.grid(lon, lat, self.config.grid_shape)
+        return SpatialPartition.kmeans(lon, lat, self.config.n_clusters, self.config.random_state)
+
+    def train(self):
+        """
+        Fit one model per shard and the fallback model, then save the serving artifact and a report.
+
+        This method:
+        1. Loads the train data and partitions its coordinates into shards.
+        2. Fits the models of the shards with at least `min_shard_rows` rows and the
+           fallback model on all rows, in parallel on the configured executor.
+        3. Saves the ShardedRegressor and the shards report.
+        """
+        train_data = STORE.get_dataframe(self.config.train_data_path)
+        X = train_data.drop([self.config.target_column], axis=1)
+        y = train_data[[self.config.target_column]].values.ravel()
+        self.rows_trained = len(train_data)
+
+        partition = self.partition(X["lon"].to_numpy(), X["lat"].to_numpy())
+        shards = partition.assign(X["lon"].to_numpy(), X["lat"].to_numpy())
+        rows = np.bincount(shards, minlength=partition.n_shards)
+        trained = [shard for shard in range(partition.n_shards) if rows[shard] >= self.config.min_shard_rows]
+        logger.info(f"Partitioned {len(X)} rows into {partition.n_shards} {self.config.method} shards, "
+                    f"{len(trained)} with their own model")
+
+        # The fallback model has the most rows, so it is submitted first
+        tasks = [(FALLBACK_SHARD, X, y)] + [(shard, X[shards == shard], y[shards == shard]) for shard in trained]
+        workers = max(1, min(self.config.max_workers, len(tasks)))
+        start = time.perf_counter()
+        with create_executor(self.config.executor, workers) as executor:
+            futures = [executor.submit(fit_shard, shard, self.config.gbr_params, X_shard, y_shard)
+                       for shard, X_shard, y_shard in tasks]
+            fitted = {shard: (model, seconds) for shard, model, seconds in (future.result() for future in futures)}
+        wall_seconds = time.perf_counter() - start
+
+        final_model = ShardedRegressor(partition, {shard: fitted[shard][0] for shard in trained},
+                                       fitted[FALLBACK_SHARD][0], X.columns)
+
+        report = {
+            "method": self.config.method,
+            "min_shard_rows": self.config.min_shard_rows,
+            "fit_wall_seconds": round(wall_seconds, 3),
+            "fallback": {"rows": len(X), "fit_seconds": round(fitted[FALLBACK_SHARD][1], 3)},
+            "shards": {
+                str(shard): {**partition.describe(shard), "rows": int(rows[shard]),
+                             "model": "shard" if shard in fitted else "fallback",
+                             "fit_seconds": round(fitted[shard][1], 3) if shard in fitted else None}
+                for shard in range(partition.n_shards)
+            },
+        }
+        logger.info(f"Fitted {len(tasks)} models in {wall_seconds:.1f}s with {workers} workers")
+
+        model_save_path = os.path.join(self.config.root_dir, self.config.model_name)
+        joblib.dump(final_model, model_save_path)
+        logger.info(f"Model saved successfully to {model_save_path}")
+
+        # A sharded model has no packed copy; remove a stale one
+        packed_save_path = os.path.join(self.config.root_dir, self.config.packed_model_name)
+        if os.path.exists(packed_save_path):
+            os.remove(packed_save_path)
+
+        # No ONNX converter exists for the routing; this removes a stale export
+        self.onnx_parity = export_onnx(final_model, X, os.path.join(self.config.root_dir, self.config.onnx_model_name),
+                                       self.config.onnx_parity_tolerance)
+        report["onnx_parity"] = self.onnx_parity
+
+        save_json(path=self.config.report_file, data=report)
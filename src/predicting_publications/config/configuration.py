@@ -2,12 +2,145 @@ from predicting_publications.constants import *
 from predicting_publications.utils.common import read_yaml, create_directories
 from predicting_publications import logger
 from predicting_publications.entity.config_entity import (DataIngestionConfig, 
+                                                          ExecutorConfig,
                                                           DataValidationConfig,
                                                           DataTransformationConfig,
                                                           ModelTrainerConfig,
-                                                          ModelEvaluationConfig)
+                                                          ModelEvaluationConfig,
+                                                          PredictionGridConfig,
+                                                          AsyncServingConfig,
+                                                          ServingMetricsConfig,
+                                                          ProfilingConfig,
+                                                          SchedulerConfig,
+                                                          MultiModelTrainerConfig,
+                                                          ShardedModelTrainerConfig,
+                                                          ModelOptimizationConfig,
+                                                          CrossValidationConfig,
+                                                          ArtifactStoreConfig,
+                                                          DriftMonitoringConfig,
+                                                          DataSamplingConfig,
+                                                          ModelRegistryConfig,
+                                                          ServingBackendConfig,
+                                                          RollupCubeConfig,
+                                                          ConfigSnapshot)
 
 import os
+import threading
+from box import ConfigBox
+
+# Snapshots by the absolute paths of their files (see load_config_snapshot)
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+# Dev mode runs write their artifacts in this subdirectory of artifacts_root
+DEV_ARTIFACTS_DIR = "dev"
+
+
+def _file_version(filepath) -> tuple:
+    try:
+        stat = os.stat(filepath)
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
+
+def _read_config_file(filepath, config_name: str) -> ConfigBox:
+    """
+    Read a configuration file into a frozen ConfigBox.
+
+    Raises:
+    - Exception: If there's an error reading the file, or its content is not a mapping.
+    """
+    try:
+        content = read_yaml(Path(filepath))
+        return ConfigBox(content.to_dict(), frozen_box=True)
+    except Exception as e:
+        logger.error(f"Error reading {config_name} file: {filepath}. Error: {e}")
+        raise
+
+
+def _validate_snapshot(snapshot: ConfigSnapshot):
+    """
+    Check the sections every stage relies on, so a broken file fails at load time.
+
+    Raises:
+    - ValueError: If a required key is missing.
+    """
+    required = [(snapshot.config, "config", "artifacts_root"),
+                (snapshot.schema, "initial_schema", "columns"),
+                (snapshot.feature_schema, "feature_engineered_schema", "columns"),
+                (snapshot.feature_schema, "feature_engineered_schema", "target_column")]
+    for content, config_name, key in required:
+        if key not in content:
+            raise ValueError(f"The '{key}' key does not exist in the {config_name} file.")
+
+
+def load_config_snapshot(config_filepath = CONFIG_FILE_PATH,
+                         params_filepath = PARAMS_FILE_PATH,
+                         schema_filepath = SCHEMA_FILE_PATH,
+                         feature_schema_filepath = FEATURE_SCHEMA_FILE_PATH) -> ConfigSnapshot:
+    """
+    Return the parsed configuration, parameters and schema files, reading them only when
+    one of them changed (modification time or size) since the last call.
+
+    The snapshot is shared by every ConfigurationManager of the process (pipeline stages,
+    the web app) and its content is frozen, so it can't be modified by one of them.
+
+    Args:
+    - config_filepath (Path): Path to the configuration file.
+    - params_filepath (Path): Path to the parameters file.
+    - schema_filepath (Path): Path to the schema file.
+    - feature_schema_filepath (Path): Path to the feature engineered schema file.
+
+    Returns:
+    - ConfigSnapshot: The parsed and validated files.
+    """
+    filepaths = (config_filepath, params_filepath, schema_filepath, feature_schema_filepath)
+    key = tuple(os.path.abspath(filepath) for filepath in filepaths)
+    versions = tuple(_file_version(filepath) for filepath in filepaths)
+
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and snapshot.versions == versions:
+            return snapshot
+
+        snapshot = ConfigSnapshot(
+            config=_read_config_file(config_filepath, "config"),
+            params=_read_config_file(params_filepath, "params"),
+            schema=_read_config_file(schema_filepath, "initial_schema"),
+            feature_schema=_read_config_file(feature_schema_filepath, "feature_engineered_schema"),
+            versions=versions,
+        )
+        _validate_snapshot(snapshot)
+
+        # Create the directory for storing artifacts if it doesn't exist
+        create_directories([snapshot.config.artifacts_root])
+        _snapshots[key] = snapshot
+        return snapshot
+
+
+def dev_mode_config(config: ConfigBox) -> ConfigBox:
+    """
+    Return the configuration with every artifact path moved under artifacts_root/dev.
+
+    Dev mode runs the whole pipeline on a sample of the data: its datasets, models,
+    prediction grid, rollup cube, registry and reports must never replace the artifacts
+    served in production.
+    """
+    root = str(config.artifacts_root).rstrip("/")
+    dev_root = f"{root}/{DEV_ARTIFACTS_DIR}"
+
+    def relocate(value):
+        if isinstance(value, dict):
+            return {key: relocate(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [relocate(item) for item in value]
+        if isinstance(value, str) and (value == root or value.startswith(root + "/")):
+            return dev_root + value[len(root):]
+        return value
+
+    return ConfigBox(relocate(config.to_dict()), frozen_box=True)
+
 
 class ConfigurationManager:
     """
@@ -21,13 +154,17 @@ class ConfigurationManager:
     - config (dict): Configuration settings.
     - params (dict): Parameters for the pipeline.
     - schema (dict): Schema information.
+    - snapshot (ConfigSnapshot): The shared, read-only parsed files.
+    - dev_mode (bool): Whether the pipeline runs on a sample of the data, with its artifacts
+      under artifacts_root/dev (see dev_mode_config).
     """
     
     def __init__(self, 
                  config_filepath = CONFIG_FILE_PATH, 
                  params_filepath = PARAMS_FILE_PATH, 
                  schema_filepath = SCHEMA_FILE_PATH,
-                 feature_schema_filepath = FEATURE_SCHEMA_FILE_PATH) -> None:
+                 feature_schema_filepath = FEATURE_SCHEMA_FILE_PATH,
+                 dev_mode: bool = False) -> None:
         """
         Initialize ConfigurationManager with configurations, parameters, and schema.
 
@@ -35,38 +172,43 @@ class ConfigurationManager:
         - config_filepath (Path): Path to the configuration file.
         - params_filepath (Path): Path to the parameters file.
         - schema_filepath (Path): Path to the schema file.
+        - feature_schema_filepath (Path): Path to the feature engineered schema file.
+        - dev_mode (bool): Run the pipeline on a sample of the ingested data. Every artifact
+          is written under artifacts_root/dev, and the models it trains are never promoted.
 
-        Creates:
-        - Directories specified in the configuration.
+        The files are parsed once per change and shared (see load_config_snapshot).
         """
-        self.config = self._read_config_file(config_filepath, "config")
-        self.params = self._read_config_file(params_filepath, "params")
-        self.schema = self._read_config_file(schema_filepath, "initial_schema")
-        self.feature_schema_filepath = self._read_config_file(feature_schema_filepath, "feature_engineered_schema")
-
-        # Create the directory for storing artifacts if it doesn't exist
-        create_directories([self.config.artifacts_root])
-
-    def _read_config_file(self, filepath: str, config_name: str) -> dict:
+        self.snapshot = load_config_snapshot(config_filepath, params_filepath, schema_filepath,
+                                             feature_schema_filepath)
+        self.config = self.snapshot.config
+        if dev_mode:
+            self.config = dev_mode_config(self.config)
+            create_directories([self.config.artifacts_root])
+        self.params = self.snapshot.params
+        self.schema = self.snapshot.schema
+        self.feature_schema_filepath = self.snapshot.feature_schema
+        self.dev_mode = dev_mode
+
+
+    def _production_model(self, legacy_model_path) -> tuple:
         """
-        Read a configuration file and return its content.
+        Resolve the production model of the model registry.
 
         Args:
-        - filepath (str): Path to the configuration file.
-        - config_name (str): Name of the configuration (for logging purposes).
+        - legacy_model_path (Path): Model used when no version is promoted to production
+          (models trained before the registry, or dev mode runs, which never promote).
 
         Returns:
-        - dict: Configuration settings.
-
-        Raises:
-        - Exception: If there's an error reading the file.
+        - tuple: (registry version or None, path of its model.joblib).
         """
-        try:
-            return read_yaml(filepath)
-        except Exception as e:
-            logger.error(f"Error reading {config_name} file: {filepath}. Error: {e}")
-            raise
-    
+        from predicting_publications.utils.model_registry import ModelRegistry, PRODUCTION_ALIAS
+
+        model_dir = ModelRegistry(self.get_model_registry_config().root_dir).resolve(PRODUCTION_ALIAS)
+        if model_dir is None:
+            logger.warning(f"No production model in the model registry, using {legacy_model_path}")
+            return None, Path(legacy_model_path)
+        return model_dir.name, model_dir / "model.joblib"
+
 
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         """
@@ -80,15 +222,29 @@ class ConfigurationManager:
 
         Raises:
         - AttributeError: If the 'data_ingestion' attribute does not exist in the config file.
+        - ValueError: If the deduplication method or its sizes are invalid.
         """
         try:
             config = self.config.data_ingestion
             # Create the root directory for data ingestion if it doesn't already exist
             create_directories([config.root_dir])
+
+            if config.dedup_method not in ("exact", "bloom"):
+                raise ValueError(f"data_ingestion.dedup_method must be 'exact' or 'bloom', got {config.dedup_method!r}")
+            if int(config.partition_hours) < 1 or int(config.chunk_rows) < 1:
+                raise ValueError("data_ingestion.partition_hours and chunk_rows must be at least 1")
             
             return DataIngestionConfig(
                 root_dir=Path(config.root_dir),
                 local_data_file=Path(config.local_data_file),
+                deduplicate=bool(config.deduplicate),
+                dedup_columns=list(config.dedup_columns),
+                dedup_method=config.dedup_method,
+                partition_hours=int(config.partition_hours),
+                bloom_capacity=int(config.bloom_capacity),
+                bloom_error_rate=float(config.bloom_error_rate),
+                chunk_rows=int(config.chunk_rows),
+                report_file=Path(config.report_file),
             )
 
         except AttributeError as e:
@@ -153,11 +309,20 @@ class ConfigurationManager:
             # Ensure the root directory for data transformation exists
             create_directories([config.root_dir])
 
+            # In dev mode, the data is transformed from the sample of the ingested data
+            data_source_file = config.data_source_file
+            if self.dev_mode:
+                data_source_file = self.config.data_sampling.sampled_data_file
+
             # Construct and return the DataTransformationConfig object
             return DataTransformationConfig(
                 root_dir=Path(config.root_dir),
-                data_source_file=Path(config.data_source_file),
+                data_source_file=Path(data_source_file),
                 data_validation=Path(config.data_validation),
+                utc_offset_hours=float(self.params.TemporalFeatures.utc_offset_hours),
+                aggregation_partitions=max(1, int(config.aggregation_partitions)),
+                max_workers=max(1, int(config.max_workers)),
+                executor=self.get_executor_config(),
             )
 
         except AttributeError as e:
@@ -204,7 +369,10 @@ class ConfigurationManager:
                 subsample=params.subsample,
                 max_features=params.max_features,
                 min_samples_split=params.min_samples_split,
-                min_samples_leaf=params.min_samples_leaf
+                min_samples_leaf=params.min_samples_leaf,
+                packed_model_name=config.packed_model_name,
+                onnx_model_name=config.onnx_model_name,
+                onnx_parity_tolerance=float(config.onnx_parity_tolerance),
             )
 
         except AttributeError as e:
@@ -241,12 +409,17 @@ class ConfigurationManager:
             # Ensure the root directory for model evaluation exists
             create_directories([config.root_dir])
 
+            # Evaluate the model served in production
+            model_version, model_path = self._production_model(config.model_path)
+
             # Construct and return the ModelEvaluationConfig object
             return ModelEvaluationConfig(
                 root_dir=Path(config.root_dir),
                 test_data_path=Path(config.test_data_path),
-                model_path=config.model_path,
+                model_path=model_path,
+                model_version=model_version,
                 metric_file_name=config.metric_file_name,
+                explanation_file_name=config.explanation_file_name,
                 all_params=params,
                 target_column=target_col,
                 mlflow_uri=config.mlflow_uri,
@@ -255,3 +428,536 @@ class ConfigurationManager:
             # Log the error and re-raise the exception for handling by the caller
             logger.error("An expected attribute does not exist in the config or params files.")
             raise e 
+
+
+
+    def get_prediction_grid_config(self) -> PredictionGridConfig:
+        """
+        Extract and return prediction grid configurations as a PredictionGridConfig object.
+
+        Returns:
+            PredictionGridConfig: Dataclass object containing configurations for the prediction grid.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+        """
+        try:
+            config = self.config.prediction_grid
+            params = self.params.PredictionGrid
+
+            # Extract the target column from the feature schema
+            target_col = self.feature_schema_filepath.get("target_column", "")
+
+            # Ensure the root directory for the prediction grid exists
+            create_directories([config.root_dir])
+
+            # Fill the grid with the model served in production
+            model_version, model_path = self._production_model(config.model_path)
+
+            return PredictionGridConfig(
+                root_dir=Path(config.root_dir),
+                train_data_path=Path(config.train_data_path),
+                model_path=model_path,
+                model_version=model_version,
+                grid_file=Path(config.grid_file),
+                index_file=Path(config.index_file),
+                target_column=target_col,
+                horizon_days=params.horizon_days,
+                start_date=None if params.start_date == 'None' else params.start_date,
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params files.")
+            raise e
+
+
+
+    def get_async_serving_config(self) -> AsyncServingConfig:
+        """
+        Extract and return the asyncio scoring service configurations as an AsyncServingConfig object.
+
+        Returns:
+            AsyncServingConfig: Dataclass object containing configurations for the async scoring service.
+
+        Raises:
+            AttributeError: If the 'async_serving' attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.async_serving
+
+            return AsyncServingConfig(
+                max_batch_size=config.max_batch_size,
+                batch_window_ms=config.batch_window_ms,
+                worker_threads=config.worker_threads,
+                model_refresh_interval_s=float(config.model_refresh_interval_s),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'async_serving' attribute does not exist in the config file.")
+            raise e
+
+
+
+    def get_serving_metrics_config(self) -> ServingMetricsConfig:
+        """
+        Extract and return serving metrics configurations as a ServingMetricsConfig object.
+
+        Returns:
+            ServingMetricsConfig: Dataclass object containing configurations for serving metrics.
+
+        Raises:
+            AttributeError: If the 'serving_metrics' attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.serving_metrics
+
+            return ServingMetricsConfig(enabled=bool(config.enabled))
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'serving_metrics' attribute does not exist in the config file.")
+            raise e
+
+
+
+    def get_profiling_config(self) -> ProfilingConfig:
+        """
+        Extract and return pipeline profiling configurations as a ProfilingConfig object.
+
+        Returns:
+            ProfilingConfig: Dataclass object containing configurations for pipeline profiling.
+
+        Raises:
+            AttributeError: If the 'profiling' attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.profiling
+
+            # Ensure the root directory for profiling artifacts exists
+            create_directories([config.root_dir])
+
+            return ProfilingConfig(
+                root_dir=Path(config.root_dir),
+                report_file=Path(config.report_file),
+                history_file=Path(config.history_file),
+                cprofile=bool(config.cprofile),
+                rss_sample_interval=float(config.rss_sample_interval),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'profiling' attribute does not exist in the config file.")
+            raise e
+
+
+
+    def get_scheduler_config(self) -> SchedulerConfig:
+        """
+        Extract and return stage scheduler configurations as a SchedulerConfig object.
+
+        Returns:
+            SchedulerConfig: Dataclass object containing configurations for the stage scheduler.
+
+        Raises:
+            AttributeError: If the 'pipeline_scheduler' attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.pipeline_scheduler
+
+            return SchedulerConfig(max_workers=max(1, int(config.max_workers)))
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'pipeline_scheduler' attribute does not exist in the config file.")
+            raise e
+
+
+
+    def get_multi_model_trainer_config(self) -> MultiModelTrainerConfig:
+        """
+        Extract and return multi-model training configurations as a MultiModelTrainerConfig object.
+
+        Returns:
+            MultiModelTrainerConfig: Dataclass object containing configurations for multi-model training.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+        """
+        try:
+            config = self.config.model_training
+            report_config = self.config.multi_model_training
+            params = self.params.MultiModelTraining
+            gbr_params = self.params.GradientBoostingRegressor
+
+            # Extract the target column from the feature schema
+            target_col = self.feature_schema_filepath.get("target_column", "")
+
+            # Ensure the root directory for model training exists
+            create_directories([config.root_dir])
+
+            return MultiModelTrainerConfig(
+                root_dir=Path(config.root_dir),
+                train_data_path=Path(config.train_data_path),
+                model_name=config.model_name,
+                packed_model_name=config.packed_model_name,
+                onnx_model_name=config.onnx_model_name,
+                onnx_parity_tolerance=float(config.onnx_parity_tolerance),
+                report_file=Path(report_config.report_file),
+                target_column=target_col,
+                gbr_params=gbr_params.to_dict(),
+                candidates=params.candidates.to_dict(),
+                max_workers=params.max_workers,
+                validation_size=params.validation_size,
+                selection_metric=params.selection_metric,
+                blend_top_k=params.blend_top_k,
+                refit=bool(params.refit),
+                random_state=gbr_params.random_state,
+                executor=self.get_executor_config(),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params files.")
+            raise e
+
+
+    def get_sharded_model_trainer_config(self) -> ShardedModelTrainerConfig:
+        """
+        Extract and return region-sharded training configurations as a ShardedModelTrainerConfig object.
+
+        Returns:
+            ShardedModelTrainerConfig: Dataclass object containing configurations for sharded training.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+            ValueError: If the sharding method or the number of shards is invalid.
+        """
+        try:
+            config = self.config.model_training
+            report_config = self.config.sharded_model_training
+            params = self.params.ShardedTraining
+            gbr_params = self.params.GradientBoostingRegressor
+
+            if params.method not in ("grid", "kmeans"):
+                raise ValueError(f"Unknown sharding method {params.method!r}, expected 'grid' or 'kmeans'")
+            grid_shape = tuple(int(n) for n in params.grid_shape)
+            if len(grid_shape) != 2 or min(grid_shape) < 1 or int(params.n_clusters) < 1:
+                raise ValueError("ShardedTraining needs a grid_shape of two positive counts and n_clusters >= 1")
+            if self.params.MultiModelTraining.enabled:
+                raise ValueError("ShardedTraining and MultiModelTraining can't both be enabled")
+
+            # Extract the target column from the feature schema
+            target_col = self.feature_schema_filepath.get("target_column", "")
+
+            # Ensure the root directory for model training exists
+            create_directories([config.root_dir])
+
+            return ShardedModelTrainerConfig(
+                root_dir=Path(config.root_dir),
+                train_data_path=Path(config.train_data_path),
+                model_name=config.model_name,
+                packed_model_name=config.packed_model_name,
+                onnx_model_name=config.onnx_model_name,
+                onnx_parity_tolerance=float(config.onnx_parity_tolerance),
+                report_file=Path(report_config.report_file),
+                target_column=target_col,
+                gbr_params=gbr_params.to_dict(),
+                method=params.method,
+                grid_shape=grid_shape,
+                n_clusters=int(params.n_clusters),
+                min_shard_rows=int(params.min_shard_rows),
+                max_workers=params.max_workers,
+                random_state=gbr_params.random_state,
+                executor=self.get_executor_config(),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params files.")
+            raise e
+
+
+    def get_model_optimization_config(self) -> ModelOptimizationConfig:
+        """
+        Extract and return model optimization configurations as a ModelOptimizationConfig object.
+
+        Returns:
+            ModelOptimizationConfig: Dataclass object containing configurations for model optimization.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+        """
+        try:
+            config = self.config.model_optimization
+            params = self.params.ModelOptimization
+
+            # Extract the target column from the feature schema
+            target_col = self.feature_schema_filepath.get("target_column", "")
+
+            # Ensure the root directory for model optimization exists
+            create_directories([config.root_dir])
+
+            # Optimize the model served in production
+            model_version, model_path = self._production_model(config.model_path)
+
+            return ModelOptimizationConfig(
+                root_dir=Path(config.root_dir),
+                model_path=model_path,
+                model_version=model_version,
+                train_data_path=Path(config.train_data_path),
+                test_data_path=Path(config.test_data_path),
+                packed_model_path=Path(config.packed_model_path),
+                report_file=Path(config.report_file),
+                target_column=target_col,
+                threshold_encoding=params.threshold_encoding,
+                leaf_merge_tolerance=float(params.leaf_merge_tolerance),
+                prune_tolerance=float(params.prune_tolerance),
+                max_rmse_increase=float(params.max_rmse_increase),
+                min_latency_reduction=float(params.min_latency_reduction),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params files.")
+            raise e
+
+
+    def get_cross_validation_config(self) -> CrossValidationConfig:
+        """
+        Extract and return cross-validation configurations as a CrossValidationConfig object.
+
+        Returns:
+            CrossValidationConfig: Dataclass object containing configurations for cross-validation.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+        """
+        try:
+            config = self.config.cross_validation
+            params = self.params.CrossValidation
+
+            # Extract the target column from the feature schema
+            target_col = self.feature_schema_filepath.get("target_column", "")
+
+            # Ensure the directories for cross-validation exist
+            create_directories([config.root_dir, config.folds_dir])
+
+            return CrossValidationConfig(
+                root_dir=Path(config.root_dir),
+                train_data_path=Path(config.train_data_path),
+                folds_dir=Path(config.folds_dir),
+                report_file=Path(config.report_file),
+                target_column=target_col,
+                gbr_params=self.params.GradientBoostingRegressor.to_dict(),
+                n_splits=int(params.n_splits),
+                shuffle=bool(params.shuffle),
+                random_state=params.random_state,
+                max_workers=max(1, int(params.max_workers)),
+                executor=self.get_executor_config(),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params files.")
+            raise e
+
+
+    def get_artifact_store_config(self) -> ArtifactStoreConfig:
+        """
+        Extract and return artifact store configurations as an ArtifactStoreConfig object.
+
+        Returns:
+            ArtifactStoreConfig: Dataclass object containing configurations for the artifact store.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.artifact_store
+
+            return ArtifactStoreConfig(
+                in_process=bool(config.in_process),
+                write_workers=max(1, int(config.write_workers)),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config file.")
+            raise e
+
+
+    def get_drift_monitoring_config(self) -> DriftMonitoringConfig:
+        """
+        Extract and return drift monitoring configurations as a DriftMonitoringConfig object.
+
+        Returns:
+            DriftMonitoringConfig: Dataclass object containing configurations for drift monitoring.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.drift_monitoring
+
+            # Ensure the directory of the reference histograms exists
+            create_directories([os.path.dirname(config.reference_file)])
+
+            return DriftMonitoringConfig(
+                enabled=bool(config.enabled),
+                train_data_path=Path(config.train_data_path),
+                reference_file=Path(config.reference_file),
+                n_bins=int(config.n_bins),
+                compute_interval_s=float(config.compute_interval_s),
+                min_observations=int(config.min_observations),
+                half_life_s=float(config.half_life_s),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config file.")
+            raise e
+
+
+
+    def get_data_sampling_config(self) -> DataSamplingConfig:
+        """
+        Extract and return data sampling configurations as a DataSamplingConfig object.
+
+        Returns:
+            DataSamplingConfig: Dataclass object containing configurations for data sampling.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config or params files.
+            ValueError: If the sampling method is unknown.
+        """
+        try:
+            config = self.config.data_sampling
+            params = self.params.DataSampling
+
+            if params.method not in ("stratified", "reservoir"):
+                raise ValueError(f"Unknown sampling method '{params.method}': expected 'stratified' or 'reservoir'")
+
+            # Ensure the root directory for data sampling exists
+            create_directories([config.root_dir])
+
+            return DataSamplingConfig(
+                root_dir=Path(config.root_dir),
+                data_source_file=Path(config.data_source_file),
+                sampled_data_file=Path(config.sampled_data_file),
+                report_file=Path(config.report_file),
+                method=params.method,
+                fraction=float(params.fraction),
+                min_per_stratum=int(params.min_per_stratum),
+                reservoir_size=int(params.reservoir_size),
+                seed=int(params.seed),
+                chunk_rows=int(config.chunk_rows),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("An expected attribute does not exist in the config or params file.")
+            raise e
+
+    def get_model_registry_config(self) -> ModelRegistryConfig:
+        """
+        Extract and return model registry configurations as a ModelRegistryConfig object.
+
+        Returns:
+            ModelRegistryConfig: Dataclass object containing configurations for the model registry.
+
+        Raises:
+            AttributeError: If an expected attribute does not exist in the config file.
+        """
+        try:
+            config = self.config.model_registry
+
+            # Ensure the registry directory exists
+            create_directories([config.root_dir])
+
+            return ModelRegistryConfig(
+                root_dir=Path(config.root_dir),
+                # Models trained on a sample are registered, but never promoted automatically
+                auto_promote=bool(config.auto_promote) and not self.dev_mode,
+                shadow_enabled=bool(config.shadow_enabled),
+                shadow_workers=int(config.shadow_workers),
+                shadow_max_pending=int(config.shadow_max_pending),
+                shadow_refresh_interval_s=float(config.shadow_refresh_interval_s),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'model_registry' attribute does not exist in the config file.")
+            raise e
+
+    def get_serving_backend_config(self) -> ServingBackendConfig:
+        """
+        Extract and return model serving backend configurations as a ServingBackendConfig object.
+
+        Returns:
+            ServingBackendConfig: Dataclass object containing configurations for the serving backend.
+
+        Raises:
+            AttributeError: If the 'serving_backend' attribute does not exist in the config file.
+            ValueError: If the backend is unknown.
+        """
+        try:
+            config = self.config.serving_backend
+
+            if config.backend not in ("native", "onnx"):
+                raise ValueError(f"serving_backend.backend must be 'native' or 'onnx', got {config.backend!r}")
+
+            return ServingBackendConfig(
+                backend=config.backend,
+                onnx_intra_op_threads=int(config.onnx_intra_op_threads),
+                packed_max_rows=max(0, int(config.packed_max_rows)),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'serving_backend' attribute does not exist in the config file.")
+            raise e
+
+    def get_executor_config(self) -> ExecutorConfig:
+        """
+        Extract and return the executor configurations as an ExecutorConfig object.
+
+        Returns:
+            ExecutorConfig: Dataclass object containing the executor backend and its scheduler.
+
+        Raises:
+            AttributeError: If the 'executor' attribute does not exist in the config file.
+            ValueError: If the backend is unknown.
+        """
+        try:
+            config = self.config.executor
+
+            if config.backend not in ("serial", "process", "dask"):
+                raise ValueError(f"executor.backend must be 'serial', 'process' or 'dask', got {config.backend!r}")
+
+            return ExecutorConfig(
+                backend=config.backend,
+                scheduler_address=None if config.scheduler_address in (None, "None") else str(config.scheduler_address),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'executor' attribute does not exist in the config file.")
+            raise e
+
+    def get_rollup_cube_config(self) -> RollupCubeConfig:
+        """
+        Extract and return rollup cube configurations as a RollupCubeConfig object.
+
+        Returns:
+            RollupCubeConfig: Dataclass object containing configurations for the rollup cube.
+
+        Raises:
+            AttributeError: If the 'rollup_cube' attribute does not exist in the config file.
+            ValueError: If the region size is not positive.
+        """
+        try:
+            config = self.config.rollup_cube
+
+            if int(config.region_cells) < 1:
+                raise ValueError(f"rollup_cube.region_cells must be positive, got {config.region_cells}")
+
+            # Ensure the root directory for the rollup cube exists
+            create_directories([config.root_dir])
+
+            return RollupCubeConfig(
+                root_dir=Path(config.root_dir),
+                aggregated_data_path=Path(config.aggregated_data_path),
+                index_file=Path(config.index_file),
+                region_cells=int(config.region_cells),
+            )
+        except AttributeError as e:
+            # Log the error and re-raise the exception for handling by the caller
+            logger.error("The 'rollup_cube' attribute does not exist in the config file.")
+            raise e
@@ -1,6 +1,19 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional
+
+@dataclass(frozen=True)
+class ExecutorConfig:
+    """
+    Configuration of the executor running the parallel work of the stages.
+
+    Attributes:
+    - backend: 'serial', 'process' or 'dask'.
+    - scheduler_address: Address of the Dask scheduler (None starts a local in-process cluster).
+    """
+
+    backend: str                      # Executor backend
+    scheduler_address: Optional[str]  # Dask scheduler, or None for a local cluster
 
 @dataclass(frozen=True)
 class DataIngestionConfig:
@@ -10,9 +23,25 @@ class DataIngestionConfig:
     Attributes:
     - root_dir: Directory where data ingestion artifacts are stored.
     - local_data_file: Path to the local file where the data is already saved.
+    - deduplicate: Whether duplicate rows are dropped while the data is ingested.
+    - dedup_columns: Columns whose values identify a row.
+    - dedup_method: 'exact' (hash sets per time partition) or 'bloom' (Bloom filter).
+    - partition_hours: Length of the time partitions of the exact method.
+    - bloom_capacity: Number of distinct rows the Bloom filter is sized for.
+    - bloom_error_rate: False positive rate of the Bloom filter at capacity.
+    - chunk_rows: Number of rows read at once.
+    - report_file: Path to the JSON report of the deduplication.
     """
     root_dir: Path  # Directory where data ingestion artifacts are stored
     local_data_file: Path  # Path to the local file where the data is already saved
+    deduplicate: bool  # Drop duplicate rows
+    dedup_columns: list  # Columns identifying a row
+    dedup_method: str  # 'exact' or 'bloom'
+    partition_hours: int  # Time partitions of the exact method
+    bloom_capacity: int  # Distinct rows of the Bloom filter
+    bloom_error_rate: float  # False positive rate of the Bloom filter
+    chunk_rows: int  # Rows read at once
+    report_file: Path  # Deduplication report
 
 
 @dataclass(frozen=True)
@@ -48,11 +77,19 @@ class DataTransformationConfig:
     Attributes:
     - root_dir: Directory where data transformation results and artifacts are stored.
     - data_source_file: Path to the file where the ingested data is stored that needs to be transformed.
+    - utc_offset_hours: Offset of local time from UTC of the temporal features.
+    - aggregation_partitions: Number of partitions of the data aggregated in parallel.
+    - max_workers: Number of workers aggregating partitions in parallel.
+    - executor: Executor running the aggregation of the partitions.
     """
     
     root_dir: Path  # Directory for storing transformation results and related artifacts
     data_source_file: Path  # Path to the ingested data file for transformation
     data_validation: Path # Path to the validated output file
+    utc_offset_hours: float  # Local time of the temporal features (hours from UTC)
+    aggregation_partitions: int  # Partitions aggregated in parallel
+    max_workers: int  # Workers aggregating partitions
+    executor: ExecutorConfig  # Executor of the partitions
 
 
 @dataclass(frozen=True)
@@ -77,6 +114,9 @@ class ModelTrainerConfig:
     - max_features: The number of features to consider for best split.
     - min_samples_split: Minimum number of samples required to split an internal node.
     - min_samples_leaf: Minimum number of samples required at a leaf node.
+    - packed_model_name: Name of the packed, memory-mappable copy of the model.
+    - onnx_model_name: Name of the ONNX export of the model.
+    - onnx_parity_tolerance: Largest prediction difference accepted between the ONNX export and the model.
     """
     
     root_dir: Path  # Directory for storing model training results and related artifacts
@@ -92,6 +132,9 @@ class ModelTrainerConfig:
     max_features: str  # Number of features to consider for best split
     min_samples_split: int  # Min samples required to split an internal node
     min_samples_leaf: int  # Min samples required at a leaf node
+    packed_model_name: str  # Name of the packed copy of the model
+    onnx_model_name: str    # Name of the ONNX export of the model
+    onnx_parity_tolerance: float  # Parity tolerance of the ONNX export
 
 
 @dataclass(frozen=True)
@@ -102,8 +145,10 @@ class ModelEvaluationConfig:
     Attributes:
     - root_dir: Root directory for saving model evaluation artifacts.
     - test_data_path: Path to the test data used for evaluation.
-    - model_path: Path to the trained model saved during the training step.
+    - model_path: Path to the production model of the model registry.
+    - model_version: Registry version of the model (None for a model outside the registry).
     - metric_file_name: Name (or path) to save the evaluation metrics.
+    - explanation_file_name: Name (or path) to save the feature contribution report.
     - all_params: Dictionary containing other relevant parameters.
     - target_column: Column name of the target variable in the dataset.
     - mlflow_uri: URI for MLflow tracking server.
@@ -115,8 +160,423 @@ class ModelEvaluationConfig:
     root_dir: Path          # Directory for saving model evaluation artifacts
     test_data_path: Path    # Path to the test dataset
     model_path: Path        # Path to the saved model
+    model_version: Optional[str]  # Registry version of the model
     metric_file_name: str   # Filename to save evaluation metrics
+    explanation_file_name: str  # Filename to save the feature contribution report
     all_params: dict        # Other relevant parameters for evaluation
     target_column: str      # Name of the target column in the dataset
     mlflow_uri: str         # URI for MLflow tracking
 
+
+@dataclass(frozen=True)
+class PredictionGridConfig:
+    """
+    Configuration for precomputing the prediction grid.
+
+    Attributes:
+    - root_dir: Directory where the prediction grid artifacts are stored.
+    - train_data_path: Path to the train data used to discover the known spatial cells.
+    - model_path: Path to the production model used to fill the grid.
+    - model_version: Registry version of the model, stored in the index (None outside the registry).
+    - grid_file: Path to the memory-mapped array of predictions (cells x days x hours).
+    - index_file: Path to the JSON index mapping cells and calendar days onto the grid.
+    - target_column: Column name of the target variable in the dataset.
+    - horizon_days: Number of calendar days to precompute.
+    - start_date: First day of the horizon (YYYY-MM-DD), or None for the current UTC date.
+    """
+
+    root_dir: Path          # Directory for storing the prediction grid artifacts
+    train_data_path: Path   # Path to the train data
+    model_path: Path        # Path to the trained model
+    model_version: Optional[str]  # Registry version of the model
+    grid_file: Path         # Path to the .npy grid of predictions
+    index_file: Path        # Path to the JSON lookup index
+    target_column: str      # Name of the target column in the dataset
+    horizon_days: int       # Number of days to precompute
+    start_date: Optional[str]  # First day of the horizon
+
+
+@dataclass(frozen=True)
+class AsyncServingConfig:
+    """
+    Configuration for the asyncio (ASGI) scoring service.
+
+    Attributes:
+    - max_batch_size: Maximum number of requests scored together in one model call.
+    - batch_window_ms: How long to wait for more requests before scoring a batch.
+    - worker_threads: Number of worker threads running model inference.
+    - model_refresh_interval_s: Seconds between two checks of the production alias.
+    """
+
+    max_batch_size: int     # Maximum rows per model call
+    batch_window_ms: float  # Batching window in milliseconds
+    worker_threads: int     # Threads running model inference
+    model_refresh_interval_s: float  # Production alias check interval
+
+
+@dataclass(frozen=True)
+class ServingMetricsConfig:
+    """
+    Configuration for serving metrics.
+
+    Attributes:
+    - enabled: Whether request/phase timings and counters are recorded and exposed on /metrics.
+    """
+
+    enabled: bool  # Record and expose serving metrics
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """
+    Configuration for profiling the pipeline stages.
+
+    Attributes:
+    - root_dir: Directory where profiling reports and cProfile dumps are stored.
+    - report_file: Path to the JSON report of the latest pipeline run.
+    - history_file: Path to the JSON-lines history of all pipeline runs.
+    - cprofile: Whether to dump a cProfile file for every stage.
+    - rss_sample_interval: How often (in seconds) the RSS is sampled.
+    """
+
+    root_dir: Path               # Directory for profiling artifacts
+    report_file: Path            # Report of the latest run
+    history_file: Path           # History of all runs
+    cprofile: bool               # Dump cProfile stats per stage
+    rss_sample_interval: float   # RSS sampling interval in seconds
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """
+    Configuration for the pipeline stage scheduler.
+
+    Attributes:
+    - max_workers: Number of worker processes running independent stages concurrently
+      (1 runs every stage in the main process).
+    """
+
+    max_workers: int  # Worker processes for independent stages
+
+
+@dataclass(frozen=True)
+class MultiModelTrainerConfig:
+    """
+    Configuration for training, comparing and blending several candidate models.
+
+    Attributes:
+    - root_dir: Directory for storing the trained model and related artifacts.
+    - train_data_path: Path to the training data.
+    - model_name: Name of the single serving artifact written to root_dir.
+    - packed_model_name: Name of the packed copy of the model, written when the selection is a single GBR.
+    - onnx_model_name: Name of the ONNX export of the model, written when the selection can be converted.
+    - onnx_parity_tolerance: Largest prediction difference accepted between the ONNX export and the model.
+    - report_file: Path to the JSON report comparing the candidates.
+    - target_column: The column name of the target variable.
+    - gbr_params: Hyperparameters of the GradientBoostingRegressor candidate.
+    - candidates: Candidate names mapped to their hyperparameters.
+    - max_workers: Number of worker processes fitting candidates in parallel.
+    - validation_size: Fraction of the train data held out to compare candidates.
+    - selection_metric: Validation metric used to rank candidates (lower is better).
+    - blend_top_k: Number of best candidates considered for blending.
+    - refit: Whether to refit the selected candidates on the full train data.
+    - random_state: Seed for reproducibility.
+    - executor: Executor fitting the candidates.
+    """
+
+    root_dir: Path          # Directory for storing the model and related artifacts
+    train_data_path: Path   # Path to train data
+    model_name: str         # Name of the serving artifact
+    packed_model_name: str  # Name of the packed copy of the model
+    onnx_model_name: str    # Name of the ONNX export of the model
+    onnx_parity_tolerance: float  # Parity tolerance of the ONNX export
+    report_file: Path       # Path to the candidates report
+    target_column: str      # The target column in the dataset
+    gbr_params: dict        # GradientBoostingRegressor hyperparameters
+    candidates: dict        # Candidate name -> hyperparameters
+    max_workers: int        # Worker processes for fitting candidates
+    validation_size: float  # Held-out fraction for comparing candidates
+    selection_metric: str   # Metric used to rank candidates
+    blend_top_k: int        # Best candidates considered for blending
+    refit: bool             # Refit selected candidates on all train data
+    random_state: int       # Seed for reproducibility
+    executor: ExecutorConfig  # Executor of the candidate fits
+
+
+@dataclass(frozen=True)
+class ShardedModelTrainerConfig:
+    """
+    Configuration for training one model per spatial shard of the data.
+
+    Attributes:
+    - root_dir: Directory for storing the trained model and related artifacts.
+    - train_data_path: Path to the training data.
+    - model_name: Name of the single serving artifact written to root_dir.
+    - packed_model_name: Name of the packed model copy, removed as a sharded model has none.
+    - onnx_model_name: Name of the ONNX export, removed as a sharded model can't be converted.
+    - onnx_parity_tolerance: Largest prediction difference accepted between the ONNX export and the model.
+    - report_file: Path to the JSON report of the shards.
+    - target_column: The column name of the target variable.
+    - gbr_params: Hyperparameters of the shard and fallback models.
+    - method: How the coordinates are partitioned ('grid' or 'kmeans').
+    - grid_shape: Number of shards along lon and lat (grid method).
+    - n_clusters: Number of shards (kmeans method).
+    - min_shard_rows: Fewest train rows of a shard with its own model.
+    - max_workers: Number of worker processes fitting models in parallel.
+    - random_state: Seed for reproducibility.
+    - executor: Executor fitting the shard models.
+    """
+
+    root_dir: Path          # Directory for storing the model and related artifacts
+    train_data_path: Path   # Path to train data
+    model_name: str         # Name of the serving artifact
+    packed_model_name: str  # Name of the packed copy of the model
+    onnx_model_name: str    # Name of the ONNX export of the model
+    onnx_parity_tolerance: float  # Parity tolerance of the ONNX export
+    report_file: Path       # Path to the shards report
+    target_column: str      # The target column in the dataset
+    gbr_params: dict        # GradientBoostingRegressor hyperparameters
+    method: str             # 'grid' or 'kmeans'
+    grid_shape: tuple       # Shards along (lon, lat)
+    n_clusters: int         # Shards of the kmeans method
+    min_shard_rows: int     # Fewest train rows of a shard model
+    max_workers: int        # Worker processes for fitting models
+    random_state: int       # Seed for reproducibility
+    executor: ExecutorConfig  # Executor of the shard fits
+
+
+@dataclass(frozen=True)
+class ModelOptimizationConfig:
+    """
+    Configuration for the post-training optimization of the packed model.
+
+    Attributes:
+    - root_dir: Directory for the optimization report.
+    - model_path: Path to the production model to optimize.
+    - model_version: Registry version of the model (None outside the registry; never registered).
+    - train_data_path: Path to the train data, used to decide which trees to prune.
+    - test_data_path: Path to the test data of the accuracy-versus-latency report.
+    - packed_model_path: Path of the optimized packed model, registered when accepted.
+    - report_file: Path to the optimization report.
+    - target_column: The column name of the target variable.
+    - threshold_encoding: Storage of split thresholds (float64, float32 or int16).
+    - leaf_merge_tolerance: Largest difference of sibling leaf values that are merged.
+    - prune_tolerance: Contribution below which trailing trees are pruned (0 disables pruning).
+    - max_rmse_increase: Largest relative test RMSE increase accepted for serving the optimized model.
+    - min_latency_reduction: Smallest relative single-row latency reduction, against the production
+      model, accepted for serving the optimized model.
+    """
+
+    root_dir: Path              # Directory for the optimization report
+    model_path: Path            # Trained model to optimize
+    model_version: Optional[str]  # Registry version of the model
+    train_data_path: Path       # Path to train data
+    test_data_path: Path        # Path to test data
+    packed_model_path: Path     # Optimized packed model
+    report_file: Path           # Accuracy-versus-latency report
+    target_column: str          # The target column in the dataset
+    threshold_encoding: str     # float64, float32 or int16
+    leaf_merge_tolerance: float # Tolerance for merging sibling leaves
+    prune_tolerance: float      # Tolerance for pruning trailing trees
+    max_rmse_increase: float    # Accepted relative RMSE increase
+    min_latency_reduction: float  # Required relative latency reduction
+
+
+@dataclass(frozen=True)
+class CrossValidationConfig:
+    """
+    Configuration for k-fold cross-validation of the model training configuration.
+
+    Attributes:
+    - root_dir: Directory for cross-validation artifacts.
+    - train_data_path: Path to the data split into folds.
+    - folds_dir: Directory of the cached fold datasets.
+    - report_file: Path to the cross-validation report.
+    - target_column: The column name of the target variable.
+    - gbr_params: Hyperparameters of the GradientBoostingRegressor evaluated on every fold.
+    - n_splits: Number of folds.
+    - shuffle: Whether rows are shuffled before being split into folds.
+    - random_state: Seed of the fold assignment.
+    - max_workers: Number of worker processes evaluating folds in parallel.
+    - executor: Executor evaluating the folds.
+    """
+
+    root_dir: Path          # Directory for cross-validation artifacts
+    train_data_path: Path   # Path to the data split into folds
+    folds_dir: Path         # Cached fold datasets
+    report_file: Path       # Cross-validation report
+    target_column: str      # The target column in the dataset
+    gbr_params: dict        # GradientBoostingRegressor hyperparameters
+    n_splits: int           # Number of folds
+    shuffle: bool           # Shuffle before splitting
+    random_state: int       # Seed of the fold assignment
+    max_workers: int        # Worker processes evaluating folds
+    executor: ExecutorConfig  # Executor of the folds
+
+
+@dataclass(frozen=True)
+class ArtifactStoreConfig:
+    """
+    Configuration for handing datasets between pipeline stages.
+
+    Attributes:
+    - in_process: Whether stages running in one process hand datasets over in memory.
+    - write_workers: Number of background threads persisting datasets in in-process mode.
+    """
+
+    in_process: bool    # Hand datasets over in memory
+    write_workers: int  # Background persisting threads
+
+
+@dataclass(frozen=True)
+class DriftMonitoringConfig:
+    """
+    Configuration for monitoring the drift of serving traffic.
+
+    Attributes:
+    - enabled: Whether request features are recorded and drift scores exposed.
+    - train_data_path: Path to the train data the traffic is compared with.
+    - reference_file: Path to the cached reference histograms.
+    - n_bins: Number of quantile bins per feature.
+    - compute_interval_s: Seconds between two drift computations (on a background thread).
+    - min_observations: Minimum decayed number of requests before drift is computed.
+    - half_life_s: Age, in seconds, at which a request weighs half as much in the live histograms.
+    """
+
+    enabled: bool               # Record features and expose drift scores
+    train_data_path: Path       # Path to train data
+    reference_file: Path        # Cached reference histograms
+    n_bins: int                 # Quantile bins per feature
+    compute_interval_s: float   # Seconds between drift computations
+    min_observations: int       # Requests needed before computing drift
+    half_life_s: float          # Half-life of the live histograms
+
+
+@dataclass(frozen=True)
+class DataSamplingConfig:
+    """
+    Configuration for sampling the ingested data.
+
+    Attributes:
+    - root_dir: Directory for the sample and its report.
+    - data_source_file: Path to the ingested data.
+    - sampled_data_file: Path to the sample.
+    - report_file: Path to the sampling report.
+    - method: 'stratified' or 'reservoir'.
+    - fraction: Fraction of the publication hours kept per stratum (stratified).
+    - min_per_stratum: Minimum number of publication hours kept per stratum (stratified).
+    - reservoir_size: Number of publication hours kept (reservoir).
+    - seed: Seed of the sample.
+    - chunk_rows: Number of rows read per chunk.
+    """
+
+    root_dir: Path              # Sampling artifacts directory
+    data_source_file: Path      # Ingested data
+    sampled_data_file: Path     # Sample
+    report_file: Path           # Sampling report
+    method: str                 # stratified or reservoir
+    fraction: float             # Fraction kept per stratum
+    min_per_stratum: int        # Minimum kept per stratum
+    reservoir_size: int         # Reservoir capacity
+    seed: int                   # Sample seed
+    chunk_rows: int             # Rows per chunk
+
+
+@dataclass(frozen=True)
+class ModelRegistryConfig:
+    """
+    Configuration for the versioned model registry and shadow scoring.
+
+    Attributes:
+    - root_dir: Directory holding the model versions and aliases.
+    - auto_promote: Whether newly trained models are promoted to production.
+    - shadow_enabled: Whether the shadow model scores copies of the requests.
+    - shadow_workers: Number of background threads scoring shadow requests.
+    - shadow_max_pending: Maximum number of shadow requests waiting to be scored.
+    - shadow_refresh_interval_s: Seconds between two checks of the shadow alias.
+    """
+
+    root_dir: Path                      # Registry directory
+    auto_promote: bool                  # Promote new models to production
+    shadow_enabled: bool                # Score requests with the shadow model
+    shadow_workers: int                 # Shadow scoring threads
+    shadow_max_pending: int             # Bound of the shadow queue
+    shadow_refresh_interval_s: float    # Shadow alias check interval
+
+
+@dataclass(frozen=True)
+class ServingBackendConfig:
+    """
+    Configuration of the backend running the model in PredictionPipeline.
+
+    Attributes:
+    - backend: 'native' (packed model or joblib pickle) or 'onnx' (ONNX Runtime on the CPU).
+    - onnx_intra_op_threads: Threads used within one ONNX Runtime operator (0 for the default).
+    - packed_max_rows: Largest call scored by the packed model; larger batches use the joblib model.
+    """
+
+    backend: str                # Model backend
+    onnx_intra_op_threads: int  # ONNX Runtime intra-op threads
+    packed_max_rows: int        # Rows up to which the packed model is used
+
+
+@dataclass(frozen=True)
+class RollupCubeConfig:
+    """
+    Configuration for precomputing the rollup cube.
+
+    Attributes:
+    - root_dir: Directory where the rollup cube artifacts are stored.
+    - aggregated_data_path: Path to the publication counts per hour and location.
+    - index_file: Path to the JSON index of the cube.
+    - region_cells: Size of a region, in grid cells along each axis.
+    """
+
+    root_dir: Path              # Directory for storing the rollup cube
+    aggregated_data_path: Path  # Path to the aggregated data
+    index_file: Path            # Path to the JSON index
+    region_cells: int           # Region size in cells
+
+
+@dataclass(frozen=True)
+class LoggingConfig:
+    """
+    Configuration for the project logger.
+
+    Attributes:
+    - log_file: Path to the log file.
+    - max_bytes: Size at which the log file is rotated.
+    - backup_count: Number of rotated log files kept.
+    - level: Default log level.
+    - module_levels: Log levels of given modules or logger names.
+    - json_format: Whether records are written as JSON lines.
+    - queue_size: Maximum number of records waiting to be written.
+    """
+
+    log_file: Path              # Path to the log file
+    max_bytes: int              # Rotation size
+    backup_count: int           # Rotated files kept
+    level: str                  # Default log level
+    module_levels: Dict[str, str]  # Per-module log levels
+    json_format: bool           # Write JSON lines
+    queue_size: int             # Bounded queue size
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Parsed content of the configuration, parameters and schema files, shared read-only.
+
+    Attributes:
+    - config: Content of config.yaml.
+    - params: Content of params.yaml.
+    - schema: Content of schema.yaml.
+    - feature_schema: Content of feature_engineered_schema.yaml.
+    - versions: (modification time in ns, size) of every file when it was read.
+    """
+
+    config: Any             # config.yaml (frozen ConfigBox)
+    params: Any             # params.yaml (frozen ConfigBox)
+    schema: Any             # schema.yaml (frozen ConfigBox)
+    feature_schema: Any     # feature_engineered_schema.yaml (frozen ConfigBox)
+    versions: tuple         # File versions the snapshot was read from
@@ -0,0 +1,206 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from predicting_publications import logger
+from predicting_publications.pipeline.prediction import PredictionPipeline, FEATURE_COLUMNS
+from predicting_publications.utils.model_registry import ModelRegistry, PRODUCTION_ALIAS
+
+
+class MicroBatchPredictor:
+    """
+    Collects concurrent prediction requests into micro-batches for the asyncio scoring service.
+
+    Requests are queued as they arrive. A background task takes the first queued request,
+    keeps collecting requests until either `batch_window_ms` has passed or `max_batch_size`
+    requests are waiting, and then scores the whole batch with a single vectorized
+    `model.predict` call on a worker thread. Each caller awaits only its own result.
+
+    With a model registry, the production alias is re-read at most once per
+    `refresh_interval_s`, and a newly promoted version replaces the model between batches.
+
+    Attributes:
+    -----------
+    pipeline : PredictionPipeline
+        Pipeline holding the model, replaced when another version is promoted to production.
+    max_batch_size : int
+        Maximum number of requests scored together.
+    batch_window_ms : float
+        How long to wait for more requests before scoring a batch.
+    shadow : ShadowScorer
+        Optional scorer receiving a copy of every scored batch.
+    registry : ModelRegistry
+        Optional registry whose production version is followed.
+
+    Example:
+    --------
+    >>> predictor = MicroBatchPredictor(max_batch_size=64, batch_window_ms=5)
+    >>> await predictor.start()
+    >>> prediction = await predictor.predict({'lon': 30.31, 'lat': 59.94, ...})
+    """
+
+    def __init__(self, pipeline: PredictionPipeline = None, max_batch_size: int = 64,
+                 batch_window_ms: float = 5.0, worker_threads: int = 1, shadow=None,
+                 registry: ModelRegistry = None, refresh_interval_s: float = 5.0):
+        """
+        Initializes the predictor. The batching task is started by `start()`.
+        """
+        self.pipeline = pipeline if pipeline is not None else PredictionPipeline()
+        self.registry = registry
+        self.refresh_interval_s = refresh_interval_s
+        self._next_refresh = time.monotonic() + refresh_interval_s
+        self._refresh_lock = threading.Lock()
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.executor = ThreadPoolExecutor(max_workers=worker_threads, thread_name_prefix="scoring")
+        self.shadow = shadow
+
+        self.batches_scored = 0
+        self.rows_scored = 0
+        self._queue = None
+        self._task = None
+        # Batches being scored, kept referenced until done and awaited on stop
+        self._tasks = set()
+
+    async def start(self):
+        """
+        Start the background batching task on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._batch_loop())
+        logger.info(f"Micro-batching started (max_batch_size={self.max_batch_size}, "
+                    f"batch_window_ms={self.batch_window * 1000:g})")
+
+    async def stop(self):
+        """
+        Stop the batching task, wait for the batches being scored and shut down the worker threads.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+        if self.shadow is not None:
+            self.shadow.shutdown()
+
+    async def predict(self, row: dict) -> float:
+        """
+        Queue a single row of features and wait for its prediction.
+
+        Parameters:
+        -----------
+        row : dict
+            Mapping of every column in FEATURE_COLUMNS to its value.
+
+        Returns:
+        --------
+        float
+            The predicted value for the row.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        """
+        Wait for a first request, then collect more until the window closes or the batch is full.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.batch_window
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self):
+        """
+        Continuously collect batches and hand them off for scoring.
+        """
+        while True:
+            batch = await self._collect_batch()
+            # Score in a separate task so the next batch can be collected meanwhile; the
+            # event loop only keeps weak references to tasks, so they are held until done
+            task = asyncio.get_running_loop().create_task(self._score(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _refresh_pipeline(self):
+        """
+        Load the production model if another version was promoted, at most once per refresh interval.
+
+        Runs on a worker thread, so loading a model does not block the event loop.
+        """
+        if self.registry is None or time.monotonic() < self._next_refresh:
+            return
+        with self._refresh_lock:
+            if time.monotonic() < self._next_refresh:
+                return
+            self._next_refresh = time.monotonic() + self.refresh_interval_s
+            version = self.registry.version_of(PRODUCTION_ALIAS)
+            if version is None or version == self.pipeline.version:
+                return
+            try:
+                self.pipeline = PredictionPipeline(version)
+                logger.info(f"Micro-batching now serves model version {version}")
+            except Exception as e:
+                logger.error(f"Could not load model version {version}, still serving {self.pipeline.version}: {e}")
+
+    def _predict(self, data: pd.DataFrame):
+        """
+        Score a batch with the current production model (on a worker thread).
+        """
+        self._refresh_pipeline()
+        return self.pipeline.predict(data)
+
+    async def _score(self, batch: list):
+        """
+        Score a batch with one model call on a worker thread and fan the results back out.
+        """
+        rows, futures = zip(*batch)
+        try:
+            data = pd.DataFrame(list(rows), columns=FEATURE_COLUMNS)
+            predictions = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._predict, data)
+        except Exception as e:
+            logger.error(f"Error occurred while scoring a batch of {len(batch)} rows: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_scored += 1
+        self.rows_scored += len(batch)
+        for future, prediction in zip(futures, predictions):
+            if not future.done():
+                future.set_result(float(prediction))
+
+        if self.shadow is not None:
+            self.shadow.submit(data, predictions)
+
+    def stats(self) -> dict:
+        """
+        Return batching statistics: number of batches, rows and the mean batch size.
+        """
+        return {
+            "batches_scored": self.batches_scored,
+            "rows_scored": self.rows_scored,
+            "mean_batch_size": self.rows_scored / self.batches_scored if self.batches_scored else 0.0,
+        }
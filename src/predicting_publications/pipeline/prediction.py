@@ -1,26 +1,126 @@
 import os
+import json
 import numpy as np
 import pandas as pd
 
 import joblib
 from pathlib import Path
 
+from predicting_publications import logger
+from predicting_publications.utils.packed_model import PackedTreeEnsemble, pack_gradient_boosting
+from predicting_publications.utils.onnx_model import OnnxModel, ONNX_RUNTIME_AVAILABLE
+from predicting_publications.utils.temporal import add_temporal_features, hourly_range
+from predicting_publications.config.configuration import ConfigurationManager, load_config_snapshot
+from predicting_publications.utils.model_registry import ModelRegistry, PRODUCTION_ALIAS
+from predicting_publications.utils.input_validation import InputSchema, InvalidInputError
+
+# Model input columns, in the order the model was trained on
+FEATURE_COLUMNS = ['lon', 'lat', 'hour', 'day', 'dayofweek', 'month',
+                   'likescount', 'commentscount', 'symbols_cnt', 'words_cnt',
+                   'hashtags_cnt', 'mentions_cnt', 'links_cnt', 'emoji_cnt']
+
+# Longest time range accepted by `PredictionPipeline.forecast` (31 days of hourly predictions)
+MAX_FORECAST_HOURS = 31 * 24
+
+# Models trained before the model registry existed are served from here
+LEGACY_MODEL_DIR = Path('artifacts/model_trainer')
+
+_input_schema = None
+_model_registry = None
+_serving_backend = None
+_utc_offset_hours = None
+# Packed tree ensembles explaining the models, and models unpickled from model.joblib, by
+# model directory and model.joblib mtime; the oldest of each is dropped beyond
+# MAX_CACHED_MODELS (one is added per promoted version)
+_explainers = {}
+_joblib_models = {}
+MAX_CACHED_MODELS = 4
+
+
+def _cache_model(cache: dict, key: tuple, model):
+    if len(cache) >= MAX_CACHED_MODELS:
+        cache.pop(next(iter(cache)))
+    cache[key] = model
+    return model
+
+
+def get_input_schema() -> InputSchema:
+    """
+    Return the prediction input schema, compiled from the shared configuration snapshot on first use.
+    """
+    global _input_schema
+    if _input_schema is None:
+        _input_schema = InputSchema.from_schema(load_config_snapshot().feature_schema.columns, FEATURE_COLUMNS)
+    return _input_schema
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Return the model registry of the model_registry section of config.yaml, created on first use.
+    """
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(ConfigurationManager().get_model_registry_config().root_dir)
+    return _model_registry
+
+
+def get_serving_backend():
+    """
+    Return the serving backend configuration of the serving_backend section of config.yaml, read on first use.
+
+    Warns once when the onnx backend is configured but onnxruntime is not installed.
+    """
+    global _serving_backend
+    if _serving_backend is None:
+        _serving_backend = ConfigurationManager().get_serving_backend_config()
+        if _serving_backend.backend == 'onnx' and not ONNX_RUNTIME_AVAILABLE:
+            logger.warning("serving_backend.backend is 'onnx' but onnxruntime is not installed, "
+                           "the native model is served (install the packages of requirements.txt)")
+    return _serving_backend
+
+
+def get_utc_offset_hours() -> float:
+    """
+    Return the UTC offset of the temporal features the model was trained on, read from params.yaml on first use.
+    """
+    global _utc_offset_hours
+    if _utc_offset_hours is None:
+        _utc_offset_hours = float(load_config_snapshot().params.TemporalFeatures.utc_offset_hours)
+    return _utc_offset_hours
+
+
 class PredictionPipeline:
     """
     Prediction Pipeline for using the trained model to make predictions.
 
     This class provides a straightforward interface to load the trained Gradient Boosting model 
-    and use it to predict on new data.
+    and use it to predict on new data. The model is resolved through the model registry (the
+    `production` alias by default). The packed copy of the model (model.ptree) is memory-mapped
+    and used when it is at least as recent as model.joblib, for calls of up to
+    `packed_max_rows` rows (see serving_backend in config.yaml): its numpy traversal is
+    fastest on single rows, while the compiled traversal of the pickle is faster on batches.
+    Larger batches, and models without a packed copy, are scored by the pickle, which is
+    unpickled once per process and model.
+    With the `onnx` backend, the ONNX export of the model (model.onnx) is run by ONNX Runtime
+    instead, when both the export and onnxruntime are available.
 
     Attributes:
     -----------
     model : object
         The trained model loaded from disk.
+    version : str
+        The registry version of the model (None for a model trained before the registry).
+    backend : str
+        The backend running the model ('native' or 'onnx').
 
     Methods:
     --------
     predict(data: pd.DataFrame) -> np.array:
         Predict the target values based on input data.
+    explain(data: pd.DataFrame) -> pd.DataFrame:
+        Predict the target values and split them into per-feature contributions.
+    forecast(lon, lat, start, end, content) -> pd.DataFrame:
+        Predict every hour of a time range for one location.
 
     Example:
     --------
@@ -29,20 +129,103 @@ class PredictionPipeline:
     >>> predictions = pipeline.predict(new_data)
     """
 
-    def __init__(self):
+    def __init__(self, model: str = PRODUCTION_ALIAS, backend: str = None):
         """
         Initializes the PredictionPipeline by loading the trained model from disk.
+
+        Parameters:
+        -----------
+        model : str
+            Registry alias (e.g. 'production', 'shadow') or version (e.g. 'v0003') of the model.
+        backend : str, optional
+            'native' or 'onnx'; the serving_backend of config.yaml when not given.
         """
-        model_path = Path('artifacts/model_trainer/model.joblib')
-        if not model_path.exists():
-            raise FileNotFoundError(f"Trained model not found at {model_path}")
+        model_dir = get_model_registry().resolve(model)
+        self.version = model_dir.name if model_dir is not None else None
+        if model_dir is None:
+            if model != PRODUCTION_ALIAS:
+                raise FileNotFoundError(f"Model {model} not found in the model registry")
+            model_dir = LEGACY_MODEL_DIR
 
-        self.model = joblib.load(model_path)
+        self.model_dir = model_dir
+        if not (model_dir / 'model.joblib').exists():
+            raise FileNotFoundError(f"Trained model not found at {model_dir / 'model.joblib'}")
+
+        serving_backend = get_serving_backend()
+        self.backend = backend or serving_backend.backend
+        self.packed_max_rows = serving_backend.packed_max_rows
+        self.model = None
+        if self.backend == 'onnx':
+            self.model = self._load_onnx(serving_backend.onnx_intra_op_threads)
+        if self.model is None:
+            self.backend = 'native'
+            self.model = self._load_native()
+        self._explainer = self.model if isinstance(self.model, PackedTreeEnsemble) else None
+
+    def _load_native(self):
+        """
+        Load the packed model when it is at least as recent as the pickle, else the pickle.
+        """
+        packed_model_path = self.model_dir / 'model.ptree'
+        if (packed_model_path.exists()
+                and packed_model_path.stat().st_mtime >= (self.model_dir / 'model.joblib').stat().st_mtime):
+            return PackedTreeEnsemble.load(packed_model_path)
+        return self._load_joblib()
+
+    def _load_joblib(self):
+        """
+        Return the model unpickled from model.joblib, loaded once per model and shared.
+        """
+        model_path = self.model_dir / 'model.joblib'
+        key = (str(self.model_dir), model_path.stat().st_mtime)
+        model = _joblib_models.get(key)
+        if model is None:
+            model = _cache_model(_joblib_models, key, joblib.load(model_path))
+        return model
+
+    def _model_for(self, rows: int):
+        """
+        Return the model scoring a call of `rows` rows: batches bypass the packed model.
+        """
+        if isinstance(self.model, PackedTreeEnsemble) and rows > self.packed_max_rows:
+            return self._load_joblib()
+        return self.model
+
+    def _packed_explainer(self) -> PackedTreeEnsemble:
+        """
+        Return the packed tree ensemble explaining the model, packed once per model and shared.
+
+        The key includes the mtime of model.joblib, so a replaced legacy model is packed again.
+        """
+        key = (str(self.model_dir), (self.model_dir / 'model.joblib').stat().st_mtime)
+        explainer = _explainers.get(key)
+        if explainer is None:
+            model = self.model if self.backend == 'native' else self._load_native()
+            explainer = _cache_model(_explainers, key, model if isinstance(model, PackedTreeEnsemble)
+                                     else PackedTreeEnsemble.from_packed(pack_gradient_boosting(model)))
+        return explainer
+
+    def _load_onnx(self, intra_op_threads: int):
+        """
+        Load the ONNX export of the model, or return None when it (or onnxruntime) is not available.
+        """
+        onnx_model_path = self.model_dir / 'model.onnx'
+        if not onnx_model_path.exists() or onnx_model_path.stat().st_mtime < (self.model_dir / 'model.joblib').stat().st_mtime:
+            logger.warning(f"No ONNX export of the model in {self.model_dir}, serving the native model")
+            return None
+        try:
+            return OnnxModel.load(onnx_model_path, intra_op_threads)
+        except ImportError as e:
+            logger.warning(f"{e}, serving the native model")
+            return None
 
     def predict(self, data: pd.DataFrame) -> np.array:
         """
         Use the loaded model to make predictions on the input data.
 
+        The input is checked against the feature schema (types and bounds) and reordered
+        to the model's column order first.
+
         Parameters:
         -----------
         data : pd.DataFrame
@@ -52,10 +235,242 @@ class PredictionPipeline:
         --------
         np.array
             The predicted values.
+
+        Raises:
+        -------
+        InvalidInputError
+            If a row is missing a feature or has an out-of-range value.
         """
         if not isinstance(data, pd.DataFrame):
             raise ValueError("Input data should be a pandas DataFrame.")
 
-        prediction = self.model.predict(data)
+        data = get_input_schema().validate(data)
+        prediction = self._model_for(len(data)).predict(data)
         return prediction
 
+    @property
+    def explainable(self) -> bool:
+        """
+        Whether `explain` supports the model (a gradient boosting tree ensemble).
+        """
+        if self.backend != 'native':
+            return (self.model_dir / 'model.ptree').exists()
+        return isinstance(self.model, PackedTreeEnsemble) or type(self.model).__name__ == 'GradientBoostingRegressor'
+
+    def explain(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict the input data and explain every prediction by per-feature contributions.
+
+        The contributions of the whole batch are computed in one vectorized traversal of
+        the trees (see `PackedTreeEnsemble.contributions`): the prediction of a row is
+        the bias plus the sum of its contributions.
+
+        Parameters:
+        -----------
+        data : pd.DataFrame
+            The input data for which explanations are required.
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per input row with the contribution of every feature (FEATURE_COLUMNS),
+            the 'bias' and the 'prediction'.
+
+        Raises:
+        -------
+        InvalidInputError
+            If a row is missing a feature or has an out-of-range value.
+        TypeError
+            If the model is not a gradient boosting tree ensemble.
+        """
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError("Input data should be a pandas DataFrame.")
+        if self._explainer is None:
+            self._explainer = self._packed_explainer()
+
+        data = get_input_schema().validate(data)
+        bias, contributions = self._explainer.contributions(data)
+        explanation = pd.DataFrame(contributions, columns=self._explainer.feature_names, index=data.index)
+        explanation['bias'] = bias
+        explanation['prediction'] = bias + contributions.sum(axis=1)
+        return explanation
+
+    def forecast(self, lon: float, lat: float, start, end, content: dict) -> pd.DataFrame:
+        """
+        Predict every hour from `start` to `end` for one location, in a single model call.
+
+        The temporal features are derived from the hourly timestamps exactly as in the data
+        transformation stage, and the content features are repeated for every hour.
+
+        Parameters:
+        -----------
+        lon, lat : float
+            Coordinates of the location.
+        start, end : str, datetime or int
+            First and last hour of the range (ISO datetimes or Unix epoch seconds).
+        content : dict
+            Content features (likescount, commentscount, ...) of the location.
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per hour with the 'timestamp' and its 'prediction'.
+
+        Raises:
+        -------
+        ValueError
+            If the range is empty, reversed or longer than MAX_FORECAST_HOURS.
+        """
+        timestamps = hourly_range(start, end)
+        if len(timestamps) == 0 or len(timestamps) > MAX_FORECAST_HOURS:
+            raise ValueError(f"Forecast range must cover 1 to {MAX_FORECAST_HOURS} hours, got {len(timestamps)}")
+
+        data = add_temporal_features(pd.DataFrame({'timestamp': timestamps}), 'timestamp', get_utc_offset_hours())
+        data['lon'] = float(lon)
+        data['lat'] = float(lat)
+        for column in FEATURE_COLUMNS:
+            if column not in data:
+                data[column] = float(content[column])
+
+        return pd.DataFrame({'timestamp': timestamps, 'prediction': self.predict(data)})
+
+
+class PredictionGridLookup:
+    """
+    O(1) lookup of precomputed predictions for known cells.
+
+    Serves predictions from the grid written by the Prediction Grid stage. The grid array
+    is memory-mapped, so only the pages that are actually read are loaded, and a lookup
+    is two dictionary probes plus a single array read. Callers fall back to the model
+    (`PredictionPipeline`) whenever `lookup` returns None, which includes every lookup
+    while the model version the grid was filled with is not the production version.
+
+    Example:
+    --------
+    >>> config = ConfigurationManager().get_prediction_grid_config()
+    >>> grid = PredictionGridLookup(config.grid_file, config.index_file, registry=get_model_registry())
+    >>> grid.lookup(lon=30.31, lat=59.94, hour=10, day=3, dayofweek=2, month=6)
+    """
+
+    def __init__(self, grid_path: Path, index_path: Path, registry: ModelRegistry = None):
+        """
+        Initializes the lookup by memory-mapping the grid and loading its index.
+
+        Parameters:
+        -----------
+        grid_path, index_path : Path
+            The grid and its index, written by the Prediction Grid stage (the grid_file and
+            index_file of the prediction_grid section of config.yaml).
+        registry : ModelRegistry, optional
+            Registry whose production version must match the grid's; not checked when not given.
+        """
+        if not grid_path.exists() or not index_path.exists():
+            raise FileNotFoundError(f"Prediction grid not found at {grid_path}")
+
+        self.index_path = index_path
+        self._index_mtime = index_path.stat().st_mtime
+        self.grid = np.load(grid_path, mmap_mode='r')
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        self.version = index.get('model_version')
+        self.registry = registry
+        self.content_columns = index['content_columns']
+        self.cells = {self._cell_key(lon, lat): i for i, (lon, lat) in enumerate(index['cells'])}
+        self.profiles = index['profiles']
+        self.dates = {tuple(date): i for i, date in enumerate(index['dates'])}
+        self._profile_table = None
+
+        if not self.current:
+            logger.warning(f"Prediction grid of model version {self.version} is not the production model, "
+                           "serving all requests from the model until it is rebuilt")
+
+    @property
+    def current(self) -> bool:
+        """
+        Whether the grid was filled with the production model.
+
+        The registry reads the production alias again only when its file changed.
+        """
+        return self.registry is None or self.registry.version_of(PRODUCTION_ALIAS) == self.version
+
+    @property
+    def rebuilt(self) -> bool:
+        """
+        Whether the grid was rebuilt (or removed) since it was loaded.
+        """
+        try:
+            return self.index_path.stat().st_mtime != self._index_mtime
+        except FileNotFoundError:
+            return True
+
+    @staticmethod
+    def _cell_key(lon: float, lat: float) -> tuple:
+        # Coordinates are stored with 6 decimals in the datasets
+        return (round(float(lon), 6), round(float(lat), 6))
+
+    def lookup(self, lon: float, lat: float, hour: int, day: int, dayofweek: int, month: int,
+               content: dict = None):
+        """
+        Look up the precomputed prediction for a cell and hour.
+
+        Parameters:
+        -----------
+        lon, lat : float
+            Coordinates of the cell.
+        hour, day, dayofweek, month : int
+            Temporal features of the requested hour.
+        content : dict, optional
+            Content features of the request. The grid was scored with each cell's content
+            profile, so a request only hits the grid when it omits the content features or
+            supplies exactly that profile.
+
+        Returns:
+        --------
+        float or None
+            The precomputed prediction, or None when the request is not covered by the grid
+            or the grid is not of the production model.
+        """
+        cell = self.cells.get(self._cell_key(lon, lat))
+        date = self.dates.get((int(day), int(dayofweek), int(month)))
+        if cell is None or date is None or not 0 <= int(hour) < 24 or not self.current:
+            return None
+
+        if content is not None:
+            profile = self.profiles[cell]
+            if any(float(content[c]) != p for c, p in zip(self.content_columns, profile)):
+                return None
+
+        return float(self.grid[cell, date, int(hour)])
+
+    def profiles_of(self, lon, lat) -> pd.DataFrame:
+        """
+        Return the content profiles of many locations at once, with NaN rows for unknown cells.
+
+        Parameters:
+        -----------
+        lon, lat : array-like
+            Coordinates of the locations.
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per location (in order, with a default index) and one column per content feature.
+        """
+        if self._profile_table is None:
+            cells = np.array(list(self.cells), dtype=np.float64).reshape(-1, 2)
+            profiles = np.asarray(self.profiles, dtype=np.float64).reshape(-1, len(self.content_columns))
+            self._profile_table = pd.DataFrame(profiles[list(self.cells.values())], columns=self.content_columns,
+                                               index=pd.MultiIndex.from_arrays([cells[:, 0], cells[:, 1]]))
+        keys = pd.MultiIndex.from_arrays([np.round(np.asarray(lon, dtype=np.float64), 6),
+                                          np.round(np.asarray(lat, dtype=np.float64), 6)])
+        return self._profile_table.reindex(keys).reset_index(drop=True)
+
+    def profile(self, lon: float, lat: float):
+        """
+        Return the content profile of a known cell as a dict, or None for unknown cells.
+        """
+        cell = self.cells.get(self._cell_key(lon, lat))
+        if cell is None:
+            return None
+        return dict(zip(self.content_columns, self.profiles[cell]))
@@ -0,0 +1,173 @@
+import json
+import numpy as np
+from pathlib import Path
+
+from predicting_publications.utils.temporal import to_datetime
+from predicting_publications.components.rollup_cube import (ROLLUPS, KEYS_FILE, PUBLICATIONS_FILE, CUMULATIVE_FILE,
+                                                            PERIOD_BITS)
+
+# Mask of the period bits of a rollup key
+PERIOD_MASK = (1 << PERIOD_BITS) - 1
+
+
+class RollupCubeLookup:
+    """
+    Answers publication analytics queries from the rollup cube.
+
+    Serves the rollups written by the Rollup Cube stage. Their columns are memory-mapped,
+    so only the pages that are actually read are loaded. The time series of one cell (or
+    region) is a slice located by two binary searches, and the totals of every cell (or
+    region) over a time range are two vectorized binary searches and a difference of
+    running totals, so no query scans the data.
+
+    Example:
+    --------
+    >>> cube = RollupCubeLookup()
+    >>> cube.series('cell_day', lon=30.31, lat=59.94, start='2019-06-01', end='2019-06-30')
+    >>> cube.totals('region_month', start='2019-01-01', end='2019-12-31')
+    """
+
+    def __init__(self, root_dir: Path = Path('artifacts/rollup_cube'),
+                 index_path: Path = Path('artifacts/rollup_cube/index.json')):
+        """
+        Initializes the lookup by memory-mapping the rollups and loading the cube index.
+        """
+        if not index_path.exists():
+            raise FileNotFoundError(f"Rollup cube not found at {root_dir}")
+
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        self.cells = index['cells']
+        self.cell_regions = index['cell_regions']
+        self.regions = index['regions']
+        self.cell_index = {self._cell_key(lon, lat): i for i, (lon, lat) in enumerate(self.cells)}
+
+        self.rollups = {}
+        for name, rollup in index['rollups'].items():
+            self.rollups[name] = {
+                **rollup,
+                'keys': np.load(root_dir / name / KEYS_FILE, mmap_mode='r'),
+                'publications': np.load(root_dir / name / PUBLICATIONS_FILE, mmap_mode='r'),
+                'cumulative': np.load(root_dir / name / CUMULATIVE_FILE, mmap_mode='r'),
+            }
+
+    @staticmethod
+    def _cell_key(lon: float, lat: float) -> tuple:
+        # Coordinates are stored with 6 decimals in the datasets
+        return (round(float(lon), 6), round(float(lat), 6))
+
+    def _rollup(self, resolution: str) -> dict:
+        rollup = self.rollups.get(resolution)
+        if rollup is None:
+            raise ValueError(f"Unknown resolution {resolution!r}, expected one of {', '.join(ROLLUPS)}")
+        return rollup
+
+    @staticmethod
+    def _period_range(rollup: dict, start=None, end=None) -> tuple:
+        """
+        Return the first and last period of a time range, relative to the first period of the rollup.
+
+        Raises:
+        - ValueError: If a bound is not a valid datetime, or `end` is before `start`.
+        """
+        def period(value):
+            timestamp = to_datetime([value]).to_numpy()[0]
+            return int(timestamp.astype(f"datetime64[{rollup['unit']}]").astype(np.int64)) - rollup['base']
+
+        first = 0 if start in (None, '') else period(start)
+        last = PERIOD_MASK if end in (None, '') else period(end)
+        if start not in (None, '') and end not in (None, '') and last < first:
+            raise ValueError(f"Query end {end} is before its start {start}")
+        # A range outside the rollup gives first > last, i.e. no periods
+        return max(first, 0), min(last, PERIOD_MASK)
+
+    def _entity(self, rollup: dict, lon: float, lat: float) -> int:
+        cell = self.cell_index.get(self._cell_key(lon, lat))
+        if cell is None:
+            raise ValueError(f"No publications are known at lon={lon}, lat={lat}")
+        return cell if rollup['level'] == 'cell' else self.cell_regions[cell]
+
+    def series(self, resolution: str, lon: float, lat: float, start=None, end=None) -> tuple:
+        """
+        Return the publications per period of the cell (or region) containing a location.
+
+        Args:
+        - resolution (str): Rollup to query ('cell_hour', 'cell_day' or 'region_month').
+        - lon, lat (float): Coordinates of a known cell.
+        - start, end (optional): Time range (ISO datetimes or Unix epoch seconds, both included).
+
+        Returns:
+        - tuple: The periods (datetime64) with publications, and their publication counts.
+
+        Raises:
+        - ValueError: If the resolution, the location or the time range is invalid.
+        """
+        rollup = self._rollup(resolution)
+        entity = self._entity(rollup, lon, lat)
+        first, last = self._period_range(rollup, start, end)
+
+        keys = rollup['keys']
+        lo = np.searchsorted(keys, (entity << PERIOD_BITS) | first, side='left')
+        hi = np.searchsorted(keys, (entity << PERIOD_BITS) | last, side='right') if last >= first else lo
+        periods = (np.asarray(keys[lo:hi]) & PERIOD_MASK) + rollup['base']
+        return periods.astype(f"datetime64[{rollup['unit']}]"), np.asarray(rollup['publications'][lo:hi])
+
+    def totals(self, resolution: str, start=None, end=None) -> np.ndarray:
+        """
+        Return the publications of every cell (or region) over a time range.
+
+        Args:
+        - resolution (str): Rollup to query ('cell_hour', 'cell_day' or 'region_month').
+        - start, end (optional): Time range (ISO datetimes or Unix epoch seconds, both included).
+
+        Returns:
+        - np.ndarray: Publications per cell (in the order of `cells`) or per region (order of `regions`).
+
+        Raises:
+        - ValueError: If the resolution or the time range is invalid.
+        """
+        rollup = self._rollup(resolution)
+        first, last = self._period_range(rollup, start, end)
+        entities = np.arange(len(self.cells) if rollup['level'] == 'cell' else len(self.regions), dtype=np.int64)
+        if last < first:
+            return np.zeros(len(entities), dtype=np.int64)
+
+        keys, cumulative = rollup['keys'], rollup['cumulative']
+        lo = np.searchsorted(keys, (entities << PERIOD_BITS) | first, side='left')
+        hi = np.searchsorted(keys, (entities << PERIOD_BITS) | last, side='right')
+        return np.asarray(cumulative[hi]) - np.asarray(cumulative[lo])
+
+    def query(self, resolution: str, lon: float = None, lat: float = None, start=None, end=None) -> dict:
+        """
+        Answer a rollup query as a JSON-serializable dict.
+
+        With a location, returns the series of its cell (or region); without, the totals
+        of every cell (or region) with publications in the time range, largest first.
+        """
+        if (lon is None) != (lat is None):
+            raise ValueError("Both lon and lat must be given, or neither")
+
+        result = {"resolution": resolution, "start": start, "end": end}
+        if lon is not None:
+            periods, publications = self.series(resolution, lon, lat, start, end)
+            result.update({
+                "lon": lon,
+                "lat": lat,
+                "total": int(publications.sum()),
+                "series": [{"period": period, "publications": int(count)}
+                           for period, count in zip(np.datetime_as_string(periods.astype('datetime64[s]')),
+                                                    publications)],
+            })
+            return result
+
+        totals = self.totals(resolution, start, end)
+        order = np.flatnonzero(totals)
+        order = order[np.argsort(-totals[order], kind='stable')]
+        if self._rollup(resolution)['level'] == 'cell':
+            entities = [{"lon": self.cells[i][0], "lat": self.cells[i][1], "publications": int(totals[i])}
+                        for i in order]
+        else:
+            entities = [{"bounds": self.regions[i], "publications": int(totals[i])} for i in order]
+        result.update({"total": int(totals.sum()), "entities": entities})
+        return result
@@ -0,0 +1,180 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.utils.artifact_store import STORE
+from predicting_publications.utils.profiling import PipelineProfiler, StageProfile
+
+# A stage of the pipeline DAG: a unique name, the pipeline class to run, and the
+# names of the stages that must complete before it can start.
+Stage = namedtuple("Stage", ["name", "pipeline_cls", "depends_on"])
+
+
+def run_stage(pipeline_cls, config_manager: ConfigurationManager) -> tuple:
+    """
+    Run one pipeline stage and profile it.
+
+    This is a module-level function so it can be sent to worker processes.
+
+    Returns:
+    - tuple: (profile record, error message or None).
+    """
+    pipeline = pipeline_cls(config_manager=config_manager)
+    profile = StageProfile(pipeline.STAGE_NAME, config_manager.get_profiling_config())
+    try:
+        with profile:
+            pipeline.run_pipeline()
+            profile.set_rows(getattr(pipeline, "rows_in", None), getattr(pipeline, "rows_out", None))
+    except Exception as e:
+        logger.exception(f"Error encountered during the {pipeline.STAGE_NAME}: {e}")
+        return profile.record, str(e)
+    return profile.record, None
+
+
+class PipelineScheduler:
+    """
+    Runs pipeline stages as a DAG, executing independent stages concurrently.
+
+    Stages are started as soon as all of their dependencies have completed. With more
+    than one worker, stages run on a process pool; with a single worker they run one
+    after another in the current process, where datasets are handed between stages in
+    memory when the artifact store allows it. The configuration is parsed once, by the
+    shared ConfigurationManager, and handed to every stage. When a stage fails, only
+    the stages that depend on it (directly or transitively) are cancelled; independent
+    branches keep running.
+
+    Attributes:
+    - stages (dict): Stages by name.
+    - config_manager (ConfigurationManager): Configuration shared by all stages.
+    - max_workers (int): Number of worker processes.
+    - profiler (PipelineProfiler): Collects the profile record of every stage.
+    - status (dict): Final status of every stage: "completed", "failed" or "cancelled".
+    """
+
+    def __init__(self, stages: list, config_manager: ConfigurationManager, max_workers: int = 1,
+                 profiler: PipelineProfiler = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.config_manager = config_manager
+        self.max_workers = max_workers
+        self.profiler = profiler
+        self.status = {}
+        self._validate()
+
+    def _validate(self):
+        """
+        Check that every dependency exists and that the stages form a DAG.
+
+        Raises:
+        - ValueError: On an unknown dependency or a dependency cycle.
+        """
+        for stage in self.stages.values():
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(sorted(unknown))}")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _dependents(self, name: str) -> set:
+        """
+        Return the names of all stages that depend on `name`, directly or transitively.
+        """
+        dependents, frontier = set(), [name]
+        while frontier:
+            current = frontier.pop()
+            for stage in self.stages.values():
+                if current in stage.depends_on and stage.name not in dependents:
+                    dependents.add(stage.name)
+                    frontier.append(stage.name)
+        return dependents
+
+    def _ready(self, pending: dict) -> list:
+        return [stage for stage in pending.values()
+                if all(self.status.get(dependency) == "completed" for dependency in stage.depends_on)]
+
+    def _finish(self, stage: Stage, record: dict, error, pending: dict):
+        """
+        Record the outcome of a stage and cancel its dependents if it failed.
+        """
+        if self.profiler is not None:
+            self.profiler.add_record(record)
+
+        if error is None:
+            self.status[stage.name] = "completed"
+            return
+
+        self.status[stage.name] = "failed"
+        for dependent in self._dependents(stage.name):
+            if dependent in pending:
+                del pending[dependent]
+                self.status[dependent] = "cancelled"
+                logger.warning(f"Stage {dependent} cancelled because {stage.name} failed")
+
+    def run(self) -> dict:
+        """
+        Run all stages, respecting their dependencies.
+
+        Returns:
+        - dict: Final status of every stage.
+        """
+        pending = dict(self.stages)
+        store_config = self.config_manager.get_artifact_store_config()
+
+        if self.max_workers <= 1:
+            if store_config.in_process:
+                STORE.configure(in_process=True, write_workers=store_config.write_workers)
+            try:
+                while pending:
+                    ready = self._ready(pending)
+                    if not ready:
+                        break
+                    stage = ready[0]
+                    del pending[stage.name]
+                    record, error = run_stage(stage.pipeline_cls, self.config_manager)
+                    self._finish(stage, record, error, pending)
+            finally:
+                # Make sure every dataset handed over in memory is on disk
+                STORE.configure(in_process=False)
+            return self.status
+
+        if store_config.in_process:
+            logger.warning(f"artifact_store.in_process is ignored with {self.max_workers} scheduler workers: "
+                           "stages in separate processes hand datasets over through files. "
+                           "Set pipeline_scheduler.max_workers to 1 to hand them over in memory.")
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                for stage in self._ready(pending):
+                    del pending[stage.name]
+                    running[executor.submit(run_stage, stage.pipeline_cls, self.config_manager)] = stage
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        record, error = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. out of memory)
+                        record, error = {"stage": stage.name, "status": "failed"}, str(e)
+                        logger.error(f"Worker running stage {stage.name} failed: {e}")
+                    self._finish(stage, record, error, pending)
+
+        return self.status
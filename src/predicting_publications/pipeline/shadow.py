@@ -0,0 +1,155 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from predicting_publications import logger
+from predicting_publications.pipeline.prediction import PredictionPipeline
+from predicting_publications.utils.model_registry import ModelRegistry, SHADOW_ALIAS
+from predicting_publications.utils.metrics import MetricsRegistry, REGISTRY
+
+# Buckets of the absolute difference between shadow and production predictions
+DELTA_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0)
+
+
+class ShadowScorer:
+    """
+    Scores copies of served requests with a candidate model, off the response path.
+
+    The candidate is the version the `shadow` alias of the model registry points at. The
+    request path only checks the alias (at most once per `refresh_interval_s`) and hands a
+    copy of the features and of the served predictions to a background thread pool, which
+    loads the candidate, scores the copy and records its latency and its difference with
+    the served predictions. When `max_pending` requests are already waiting, new ones are
+    dropped, so a slow candidate never builds up memory or delays serving.
+
+    Attributes:
+    -----------
+    registry : ModelRegistry
+        Registry resolving the shadow alias.
+    max_pending : int
+        Maximum number of requests waiting to be scored.
+
+    Example:
+    --------
+    >>> shadow = ShadowScorer(get_model_registry())
+    >>> prediction = pipeline.predict(data)
+    >>> shadow.submit(data, prediction)
+    """
+
+    def __init__(self, registry: ModelRegistry, workers: int = 1, max_pending: int = 64,
+                 refresh_interval_s: float = 5.0, metrics: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self.max_pending = max_pending
+        self.refresh_interval_s = refresh_interval_s
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="shadow")
+
+        self._version = None
+        self._next_refresh = 0.0
+        self._pipeline = None
+        self._pending = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+
+        self.requests = metrics.counter("shadow_requests_total", "Requests scored by the shadow model, by outcome.",
+                                        ("version", "outcome"))
+        self.latency = metrics.histogram("shadow_predict_duration_seconds", "Latency of the shadow model.",
+                                         ("version",))
+        self.delta = metrics.histogram("shadow_prediction_abs_delta",
+                                       "Absolute difference between shadow and served predictions.",
+                                       ("version",), buckets=DELTA_BUCKETS)
+
+    def _shadow_version(self) -> str:
+        """
+        Return the version of the shadow alias, re-reading it at most once per refresh interval.
+        """
+        now = time.monotonic()
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.refresh_interval_s
+            self._version = self.registry.version_of(SHADOW_ALIAS)
+        return self._version
+
+    def submit(self, data: pd.DataFrame, predictions) -> bool:
+        """
+        Queue a copy of a served request for shadow scoring.
+
+        Args:
+        - data (pd.DataFrame): Features of the request.
+        - predictions: Predictions served for `data`.
+
+        Returns:
+        - bool: Whether the request was queued (False without a shadow model, or when the queue is full).
+        """
+        version = self._shadow_version()
+        if version is None:
+            return False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._record(version, "dropped")
+                return False
+            self._pending += 1
+        self.executor.submit(self._score, version, data.copy(), np.array(predictions, dtype=float))
+        return True
+
+    def _load(self, version: str) -> PredictionPipeline:
+        if self._pipeline is None or self._pipeline.version != version:
+            logger.info(f"Loading shadow model {version}")
+            self._pipeline = PredictionPipeline(version)
+        return self._pipeline
+
+    def _record(self, version: str, outcome: str, latency: float = 0.0, deltas: np.ndarray = None):
+        """
+        Update the metrics and the running statistics of a version. Called with the lock held.
+        """
+        self.requests.inc(version, outcome)
+        stats = self._stats.setdefault(version, {"scored": 0, "error": 0, "dropped": 0, "rows": 0,
+                                                 "latency_sum": 0.0, "abs_delta_sum": 0.0, "abs_delta_max": 0.0})
+        stats[outcome] += 1
+        if deltas is not None:
+            self.latency.observe(latency, version)
+            for delta in deltas:
+                self.delta.observe(float(delta), version)
+            stats["rows"] += len(deltas)
+            stats["latency_sum"] += latency
+            stats["abs_delta_sum"] += float(deltas.sum())
+            stats["abs_delta_max"] = max(stats["abs_delta_max"], float(deltas.max(initial=0.0)))
+
+    def _score(self, version: str, data: pd.DataFrame, served: np.ndarray):
+        try:
+            pipeline = self._load(version)
+            start = time.perf_counter()
+            predictions = pipeline.predict(data)
+            latency = time.perf_counter() - start
+            deltas = np.abs(np.asarray(predictions, dtype=float) - served)
+            with self._lock:
+                self._record(version, "scored", latency, deltas)
+        except Exception as e:
+            logger.warning(f"Shadow model {version} failed to score a request: {e}")
+            with self._lock:
+                self._record(version, "error")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        """
+        Return, per shadow version, the request counts, mean latency and mean/max absolute delta.
+        """
+        with self._lock:
+            return {
+                version: {
+                    "scored": stats["scored"], "error": stats["error"], "dropped": stats["dropped"],
+                    "mean_latency_s": stats["latency_sum"] / stats["scored"] if stats["scored"] else 0.0,
+                    "mean_abs_delta": stats["abs_delta_sum"] / stats["rows"] if stats["rows"] else 0.0,
+                    "max_abs_delta": stats["abs_delta_max"],
+                }
+                for version, stats in self._stats.items()
+            }
+
+    def shutdown(self):
+        """
+        Wait for the queued requests and stop the worker threads.
+        """
+        self.executor.shutdown(wait=True)
@@ -6,8 +6,8 @@ class DataIngestionPipeline:
 
     STAGE_NAME = "Data Ingestion Stage"
 
-    def __init__(self):
-        self.config_manager = ConfigurationManager()
+    def __init__(self, config_manager: ConfigurationManager = None):
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
 
     def run_data_ingestion(self):
         """
@@ -22,6 +22,8 @@ class DataIngestionPipeline:
             
             logger.info(f"Copying training data from {data_ingestion_config.local_data_file} to {data_ingestion_config.root_dir}...")
             data_ingestion.transfer_data()
+            if data_ingestion_config.deduplicate:
+                self.rows_in, self.rows_out = data_ingestion.rows_in, data_ingestion.rows_out
         except Exception as e:
             logger.exception("An error occurred during the data ingestion process.")
             raise e
@@ -16,11 +16,15 @@ class InitialDataValidationPipeline:
 
     STAGE_NAME = "Initial Data Validation Pipeline"
 
-    def __init__(self):
+    def __init__(self, config_manager: ConfigurationManager = None):
         """
         Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
         """
-        self.config_manager = ConfigurationManager()
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
 
     def run_data_validation(self):
         """
@@ -38,11 +42,13 @@ class InitialDataValidationPipeline:
 
             logger.info("Executing Data Validations...")
             data_validation.run_all_validations()
+            self.rows_in = self.rows_out = len(data_validation.df)
 
             logger.info("Initial Data Validation Pipeline completed successfully.")
 
         except Exception as e:
             logger.error(f"Error encountered during the data validation: {e}")
+            raise e
     
     def run_pipeline(self):
         """
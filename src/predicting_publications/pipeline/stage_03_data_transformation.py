@@ -17,11 +17,15 @@ class DataTransformationPipeline:
     
     STAGE_NAME = "Data Transformation Pipeline"
 
-    def __init__(self):
+    def __init__(self, config_manager: ConfigurationManager = None):
         """
         Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
         """
-        self.config_manager = ConfigurationManager()
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
 
     def run_data_transformation(self):
         """
@@ -38,11 +42,13 @@ class DataTransformationPipeline:
 
             logger.info("Executing data transformation...")
             data_transformation.orchestrate_transformation()
+            self.rows_in, self.rows_out = len(data_transformation.df), len(data_transformation.grouped_data)
 
             logger.info("Data Transformation Pipeline completed successfully.")
 
         except Exception as e:
             logger.error(f"Error encountered during the data transformation: {e}")
+            raise e
     
     def run_pipeline(self):
         """
@@ -62,6 +68,7 @@ class DataTransformationPipeline:
                 logger.info(f">>>>>> Stage {DataTransformationPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
             else:
                 logger.error("Data Transformation Pipeline aborted due to validation errors.")
+                raise ValueError("Data Transformation Pipeline aborted due to validation errors.")
         except Exception as e:
             logger.error(f"Error encountered during the {DataTransformationPipeline.STAGE_NAME}: {e}")
             raise e
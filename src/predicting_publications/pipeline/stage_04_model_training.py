@@ -1,6 +1,10 @@
+import os
 from predicting_publications import logger
 from predicting_publications.config.configuration import ConfigurationManager
 from predicting_publications.components.model_trainer import ModelTrainer
+from predicting_publications.components.multi_model_trainer import MultiModelTrainer
+from predicting_publications.components.sharded_model_trainer import ShardedModelTrainer
+from predicting_publications.utils.model_registry import ModelRegistry
 
 
 class ModelTrainerPipeline:
@@ -9,6 +13,10 @@ class ModelTrainerPipeline:
 
     After the data transformation stage, this class orchestrates the training of the model
     using the GradientBoostingRegressor and saves the trained model for future use.
+    When MultiModelTraining is enabled in params.yaml, several candidate models are trained
+    in parallel instead, and the best one (or a blend of the best ones) is saved. When
+    ShardedTraining is enabled, one model per spatial shard of the data is trained instead.
+    The saved model is then registered as a new version of the model registry.
 
     Attributes:
         STAGE_NAME (str): The name of this pipeline stage.
@@ -16,11 +24,15 @@ class ModelTrainerPipeline:
     
     STAGE_NAME = "Model Training Pipeline"
 
-    def __init__(self):
+    def __init__(self, config_manager: ConfigurationManager = None):
         """
         Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
         """
-        self.config_manager = ConfigurationManager()
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
 
     def run_model_training(self):
         """
@@ -31,18 +43,43 @@ class ModelTrainerPipeline:
         """
         try:
             logger.info("Fetching model training configuration...")
-            model_training_configuration = self.config_manager.get_model_trainer_config()
-
-            logger.info("Initializing model training process...")
-            model_training = ModelTrainer(config=model_training_configuration)
+            if self.config_manager.params.ShardedTraining.enabled:
+                model_training_configuration = self.config_manager.get_sharded_model_trainer_config()
+                logger.info("Initializing sharded model training process...")
+                model_training = ShardedModelTrainer(config=model_training_configuration)
+            elif self.config_manager.params.MultiModelTraining.enabled:
+                model_training_configuration = self.config_manager.get_multi_model_trainer_config()
+                logger.info("Initializing multi-model training process...")
+                model_training = MultiModelTrainer(config=model_training_configuration)
+            else:
+                model_training_configuration = self.config_manager.get_model_trainer_config()
+                logger.info("Initializing model training process...")
+                model_training = ModelTrainer(config=model_training_configuration)
 
             logger.info("Executing model training...")
             model_training.train()
+            self.rows_in = model_training.rows_trained
+
+            logger.info("Registering the trained model...")
+            registry_config = self.config_manager.get_model_registry_config()
+            root_dir = model_training_configuration.root_dir
+            ModelRegistry(registry_config.root_dir).register(
+                files={
+                    "model.joblib": os.path.join(root_dir, model_training_configuration.model_name),
+                    "model.ptree": os.path.join(root_dir, model_training_configuration.packed_model_name),
+                    "model.onnx": os.path.join(root_dir, model_training_configuration.onnx_model_name),
+                },
+                metadata={"stage": "model_training", "trainer": type(model_training).__name__,
+                          "rows_trained": model_training.rows_trained, "dev_mode": self.config_manager.dev_mode,
+                          "onnx_parity": model_training.onnx_parity},
+                promote=registry_config.auto_promote,
+            )
 
             logger.info("Model Training Pipeline completed successfully.")
 
         except Exception as e:
             logger.error(f"Error encountered during the model training: {e}")
+            raise e
 
     
     def run_pipeline(self):
@@ -6,11 +6,14 @@ class ModelEvaluationPipeline:
 
     STAGE_NAME = "Model Evaluation Pipeline"
 
-    def __init__(self):
-        self.config_manager = ConfigurationManager()
+    def __init__(self, config_manager: ConfigurationManager = None):
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
 
     
-    def run_pipeline(self):
+    def run_model_evaluation(self):
+        """
+        Fetches configurations, then evaluates the production model and logs it into MLflow.
+        """
         try:
             logger.info("Fetching model evaluation configuration...")
             model_evaluation_configuration = self.config_manager.get_model_evaluation_config()
@@ -20,11 +23,25 @@ class ModelEvaluationPipeline:
             
             logger.info("Logging model evaluation into MLFlow...")
             model_evaluation.log_into_mlflow()
+            self.rows_in = len(model_evaluation.test_data)
             
             logger.info("Model Evaluation Pipeline completed successfully.")
        
         except Exception as e:
             logger.error(f"Error encountered during the model evaluation: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Model Evaluation Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {ModelEvaluationPipeline.STAGE_NAME} started <<<<<<")
+            self.run_model_evaluation()
+            logger.info(f">>>>>> Stage {ModelEvaluationPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {ModelEvaluationPipeline.STAGE_NAME}: {e}")
+            raise e
 
 
 if __name__ == '__main__':
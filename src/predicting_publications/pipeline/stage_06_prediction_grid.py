@@ -0,0 +1,66 @@
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.components.prediction_grid import PredictionGrid
+
+
+class PredictionGridPipeline:
+    """
+    This pipeline precomputes the prediction grid.
+
+    Right after the model training stage, this class scores every known spatial cell
+    over every hour of the configured horizon, so that the web app can serve those
+    forecasts from a lookup table instead of running the model.
+
+    Attributes:
+        STAGE_NAME (str): The name of this pipeline stage.
+    """
+
+    STAGE_NAME = "Prediction Grid Pipeline"
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        """
+        Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
+        """
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
+
+    def run_prediction_grid(self):
+        """
+        Fetches configurations, then builds and saves the prediction grid.
+        """
+        try:
+            logger.info("Fetching prediction grid configuration...")
+            prediction_grid_config = self.config_manager.get_prediction_grid_config()
+
+            logger.info("Initializing prediction grid process...")
+            prediction_grid = PredictionGrid(config=prediction_grid_config)
+
+            logger.info("Building prediction grid...")
+            prediction_grid.orchestrate_grid()
+            self.rows_in, self.rows_out = len(prediction_grid.profiles), prediction_grid.rows_scored
+
+            logger.info("Prediction Grid Pipeline completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error encountered during the prediction grid build: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Prediction Grid Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {PredictionGridPipeline.STAGE_NAME} started <<<<<<")
+            self.run_prediction_grid()
+            logger.info(f">>>>>> Stage {PredictionGridPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {PredictionGridPipeline.STAGE_NAME}: {e}")
+            raise e
+
+
+if __name__ == '__main__':
+    pipeline = PredictionGridPipeline()
+    pipeline.run_pipeline()
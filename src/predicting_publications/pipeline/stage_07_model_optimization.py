@@ -0,0 +1,100 @@
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.components.model_optimization import ModelOptimization
+from predicting_publications.utils.model_registry import ModelRegistry
+
+
+class ModelOptimizationPipeline:
+    """
+    This pipeline optimizes the trained model for low-latency serving.
+
+    Right after the model training stage, this class quantizes, merges and prunes the
+    packed tree ensemble of the production model, reports accuracy versus latency on the
+    test data, and hands the optimized model to serving (as a new version of the model
+    registry) when its accuracy is within the accepted budget and it serves single rows
+    faster than the production model. The prediction grid and model evaluation stages
+    run after it, so they use the version it may promote.
+
+    Attributes:
+        STAGE_NAME (str): The name of this pipeline stage.
+    """
+
+    STAGE_NAME = "Model Optimization Pipeline"
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        """
+        Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
+        """
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
+
+    def run_model_optimization(self):
+        """
+        Fetches configurations, then optimizes the model and saves the report.
+        """
+        try:
+            logger.info("Fetching model optimization configuration...")
+            model_optimization_config = self.config_manager.get_model_optimization_config()
+
+            logger.info("Initializing model optimization process...")
+            model_optimization = ModelOptimization(config=model_optimization_config)
+
+            logger.info("Optimizing model...")
+            report = model_optimization.optimize()
+            self.rows_in = len(model_optimization.X_test)
+
+            if report.get("accepted") and model_optimization_config.model_version is None:
+                # Only a production model is optimized into a new version
+                logger.warning("The optimized model is not based on a production model version, not registering it")
+            elif report.get("accepted"):
+                logger.info("Registering the optimized model...")
+                registry_config = self.config_manager.get_model_registry_config()
+                registry = ModelRegistry(registry_config.root_dir)
+
+                # The optimized model only replaces the packed copy: the ONNX export of the base
+                # version still matches its model.joblib, so the onnx backend keeps serving it
+                onnx_model_path = model_optimization_config.model_path.with_name("model.onnx")
+                onnx_parity = None
+                if onnx_model_path.exists():
+                    onnx_parity = registry.metadata(model_optimization_config.model_version).get("onnx_parity")
+                else:
+                    logger.warning(f"Model version {model_optimization_config.model_version} has no ONNX export, "
+                                   "the optimized version will only be served by the native backend")
+
+                registry.register(
+                    files={"model.joblib": model_optimization_config.model_path,
+                           "model.ptree": model_optimization_config.packed_model_path,
+                           "model.onnx": onnx_model_path},
+                    metadata={"stage": "model_optimization", "base_version": model_optimization_config.model_version,
+                              "rmse_increase": report["rmse_increase"],
+                              "latency_reduction": report["latency_reduction"],
+                              "dev_mode": self.config_manager.dev_mode,
+                              "onnx_parity": onnx_parity},
+                    promote=registry_config.auto_promote,
+                )
+
+            logger.info("Model Optimization Pipeline completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error encountered during the model optimization: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Model Optimization Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {ModelOptimizationPipeline.STAGE_NAME} started <<<<<<")
+            self.run_model_optimization()
+            logger.info(f">>>>>> Stage {ModelOptimizationPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {ModelOptimizationPipeline.STAGE_NAME}: {e}")
+            raise e
+
+
+if __name__ == '__main__':
+    pipeline = ModelOptimizationPipeline()
+    pipeline.run_pipeline()
@@ -0,0 +1,66 @@
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.components.cross_validation import CrossValidation
+
+
+class CrossValidationPipeline:
+    """
+    This pipeline cross-validates the model training configuration.
+
+    After the data transformation stage, this class splits the train data into k folds
+    (reusing the cached folds when the data is unchanged), trains and evaluates the
+    GradientBoostingRegressor on every fold in parallel, and reports per-fold metrics.
+
+    Attributes:
+        STAGE_NAME (str): The name of this pipeline stage.
+    """
+
+    STAGE_NAME = "Cross Validation Pipeline"
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        """
+        Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
+        """
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
+
+    def run_cross_validation(self):
+        """
+        Fetches configurations, then evaluates every fold and saves the report.
+        """
+        try:
+            logger.info("Fetching cross-validation configuration...")
+            cross_validation_config = self.config_manager.get_cross_validation_config()
+
+            logger.info("Initializing cross-validation process...")
+            cross_validation = CrossValidation(config=cross_validation_config)
+
+            logger.info("Running cross-validation...")
+            cross_validation.orchestrate_cross_validation()
+            self.rows_in = cross_validation.n_rows
+
+            logger.info("Cross Validation Pipeline completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error encountered during the cross-validation: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Cross Validation Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {CrossValidationPipeline.STAGE_NAME} started <<<<<<")
+            self.run_cross_validation()
+            logger.info(f">>>>>> Stage {CrossValidationPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {CrossValidationPipeline.STAGE_NAME}: {e}")
+            raise e
+
+
+if __name__ == '__main__':
+    pipeline = CrossValidationPipeline()
+    pipeline.run_pipeline()
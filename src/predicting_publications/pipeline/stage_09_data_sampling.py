@@ -0,0 +1,67 @@
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.components.data_sampling import DataSampling
+
+
+class DataSamplingPipeline:
+    """
+    This pipeline samples the ingested data for fast experiment iterations.
+
+    In dev mode (`python main.py --dev`), this class runs between the data validation and
+    data transformation stages: it streams the ingested data once and writes a stratified
+    (or reservoir) sample, which the transformation and all later stages then work on.
+
+    Attributes:
+        STAGE_NAME (str): The name of this pipeline stage.
+    """
+
+    STAGE_NAME = "Data Sampling Pipeline"
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        """
+        Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
+        """
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
+
+    def run_data_sampling(self):
+        """
+        Fetches configurations, then samples the ingested data and saves the report.
+        """
+        try:
+            logger.info("Fetching data sampling configuration...")
+            data_sampling_config = self.config_manager.get_data_sampling_config()
+
+            logger.info("Initializing data sampling process...")
+            data_sampling = DataSampling(config=data_sampling_config)
+
+            logger.info("Sampling data...")
+            report = data_sampling.sample()
+            self.rows_in = report["rows_in"]
+            self.rows_out = report["rows_out"]
+
+            logger.info("Data Sampling Pipeline completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error encountered during the data sampling: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Data Sampling Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {DataSamplingPipeline.STAGE_NAME} started <<<<<<")
+            self.run_data_sampling()
+            logger.info(f">>>>>> Stage {DataSamplingPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {DataSamplingPipeline.STAGE_NAME}: {e}")
+            raise e
+
+
+if __name__ == '__main__':
+    pipeline = DataSamplingPipeline()
+    pipeline.run_pipeline()
@@ -0,0 +1,66 @@
+from predicting_publications import logger
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.components.rollup_cube import RollupCube
+
+
+class RollupCubePipeline:
+    """
+    This pipeline precomputes the rollup cube of publication counts.
+
+    Right after the data transformation stage, this class rolls the publications per
+    hour and location up to cell x hour, cell x day and region x month, so that the web
+    app answers analytics queries (`/rollup`) from the precomputed cube.
+
+    Attributes:
+        STAGE_NAME (str): The name of this pipeline stage.
+    """
+
+    STAGE_NAME = "Rollup Cube Pipeline"
+
+    def __init__(self, config_manager: ConfigurationManager = None):
+        """
+        Initializes the pipeline with a configuration manager.
+
+        Args:
+            config_manager (ConfigurationManager, optional): Shared configuration manager. A new one
+                is created (re-reading the configuration files) when not given.
+        """
+        self.config_manager = config_manager if config_manager is not None else ConfigurationManager()
+
+    def run_rollup_cube(self):
+        """
+        Fetches configurations, then builds and saves the rollup cube.
+        """
+        try:
+            logger.info("Fetching rollup cube configuration...")
+            rollup_cube_config = self.config_manager.get_rollup_cube_config()
+
+            logger.info("Initializing rollup cube process...")
+            rollup_cube = RollupCube(config=rollup_cube_config)
+
+            logger.info("Building rollup cube...")
+            entries = rollup_cube.orchestrate_cube()
+            self.rows_in, self.rows_out = rollup_cube.rows, sum(entries.values())
+
+            logger.info("Rollup Cube Pipeline completed successfully.")
+
+        except Exception as e:
+            logger.error(f"Error encountered during the rollup cube build: {e}")
+            raise e
+
+    def run_pipeline(self):
+        """
+        Run the entire Rollup Cube Pipeline.
+        """
+        try:
+            logger.info(f">>>>>> Stage: {RollupCubePipeline.STAGE_NAME} started <<<<<<")
+            self.run_rollup_cube()
+            logger.info(f">>>>>> Stage {RollupCubePipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+        except Exception as e:
+            logger.error(f"Error encountered during the {RollupCubePipeline.STAGE_NAME}: {e}")
+            raise e
+
+
+if __name__ == '__main__':
+    pipeline = RollupCubePipeline()
+    pipeline.run_pipeline()
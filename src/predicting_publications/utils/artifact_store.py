@@ -0,0 +1,147 @@
+"""
+artifact_store.py
+
+Purpose:
+    Hand datasets between pipeline stages.
+
+    By default every dataset is written to and read from disk, as each stage may run
+    in its own process. In in-process mode (all stages running in one process), a
+    dataset put by one stage is kept in memory and handed by reference to the stages
+    that read it, while a background thread still persists it to the same path for
+    reproducibility. Readers that need the file itself (e.g. to checksum it) call
+    `wait` first.
+
+    Datasets handed by reference are shared: consumers must not modify them in place.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predicting_publications import logger
+
+
+def _write_csv(df: pd.DataFrame, path: str):
+    tmp_path = f"{path}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _write_npy(array: np.ndarray, path: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    """
+    Stores datasets by path, on disk or (in in-process mode) in memory with asynchronous persistence.
+
+    Attributes:
+    - in_process (bool): Whether datasets are kept in memory and persisted in the background.
+    """
+
+    def __init__(self, in_process: bool = False, write_workers: int = 1):
+        self.in_process = False
+        self._cache = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._writer = None
+        self.configure(in_process, write_workers)
+
+    def configure(self, in_process: bool, write_workers: int = 1):
+        """
+        Switch between on-disk and in-process mode. Pending writes are flushed first.
+        """
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        self._cache.clear()
+        self.in_process = in_process
+        if in_process:
+            self._writer = ThreadPoolExecutor(max_workers=max(1, write_workers), thread_name_prefix="artifact-writer")
+            logger.info("Artifact store in in-process mode: datasets are handed over in memory")
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(str(path))
+
+    def _put(self, path, obj, write):
+        key = self._key(path)
+        if not self.in_process:
+            write(obj, key)
+            return
+        with self._lock:
+            previous = self._pending.get(key)
+            self._cache[key] = obj
+        if previous is not None:
+            # Keep writes to the same path in order
+            previous.result()
+        with self._lock:
+            self._pending[key] = self._writer.submit(write, obj, key)
+
+    def _get(self, path, read):
+        key = self._key(path)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        return read(key)
+
+    def put_dataframe(self, path: Path, df: pd.DataFrame):
+        """
+        Store a DataFrame as CSV at `path` (without its index, which is reset).
+        """
+        self._put(path, df.reset_index(drop=True), _write_csv)
+
+    def get_dataframe(self, path: Path) -> pd.DataFrame:
+        """
+        Return the DataFrame stored at `path`, from memory when available, else read from CSV.
+        """
+        return self._get(path, pd.read_csv)
+
+    def put_array(self, path: Path, array: np.ndarray):
+        """
+        Store a NumPy array as .npy at `path`.
+        """
+        self._put(path, np.asarray(array), _write_npy)
+
+    def get_array(self, path: Path) -> np.ndarray:
+        """
+        Return the array stored at `path`, from memory when available, else read from .npy.
+        """
+        return self._get(path, np.load)
+
+    def wait(self, path: Path):
+        """
+        Block until the dataset at `path` has been persisted.
+        """
+        with self._lock:
+            future = self._pending.get(self._key(path))
+        if future is not None:
+            future.result()
+
+    def flush(self):
+        """
+        Block until every pending write has been persisted.
+
+        Raises:
+        - Exception: The error of the first failed write, if any.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for path, future in pending.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Failed to persist {path}: {e}")
+                raise
+
+
+# Store shared by all stages running in this process (see main.py)
+STORE = ArtifactStore()
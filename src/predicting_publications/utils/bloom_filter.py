@@ -0,0 +1,76 @@
+"""
+bloom_filter.py
+
+Purpose:
+    A Bloom filter of 64-bit hashes, with vectorized batch insertion.
+
+    The filter answers "possibly seen" or "definitely not seen" in a fixed amount of
+    memory, sized from the expected number of items and the accepted false positive
+    rate (about 1.2 bytes per item at a 1% rate, 1.8 bytes at 0.1%). The k bit positions
+    of an item are derived from its hash by double hashing.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class BloomFilter:
+    """
+    Bloom filter of uint64 hashes (e.g. from `pd.util.hash_pandas_object`).
+
+    Example:
+    --------
+    >>> bloom = BloomFilter(capacity=10_000_000, error_rate=0.001)
+    >>> new = bloom.add(hashes)   # True where a hash was definitely not seen before
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+        - capacity (int): Number of items the filter is sized for.
+        - error_rate (float): False positive rate once `capacity` items were added.
+
+        Raises:
+        - ValueError: If the capacity or the error rate is out of range.
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError(f"Bloom filter needs capacity >= 1 and 0 < error_rate < 1, got {capacity}, {error_rate}")
+        self.n_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Return the (items, n_hashes) bit positions of the hashes.
+        """
+        h1 = np.asarray(hashes, dtype=np.uint64)
+        # A second, independent hash; odd, so the k positions of an item are distinct
+        h2 = pd.util.hash_array(h1) | np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        # uint64 arithmetic wraps around, which keeps the positions uniform
+        return (h1[:, None] + steps * h2[:, None]) % np.uint64(self.n_bits)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add distinct hashes and return which ones were definitely not in the filter before.
+        """
+        positions = self._positions(hashes)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        present = ((self.bits[positions >> np.uint64(3)] & masks) != 0).all(axis=1)
+        np.bitwise_or.at(self.bits, (positions >> np.uint64(3)).ravel(), masks.ravel())
+        self.count += int((~present).sum())
+        return ~present
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Expected false positive rate of the next lookup, given the items added so far.
+        """
+        return (1 - math.exp(-self.n_hashes * self.count / self.n_bits)) ** self.n_hashes
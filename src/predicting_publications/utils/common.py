@@ -3,6 +3,10 @@ common.py
 
 Purpose:
     Contains common functionalities used across the project.
+
+    read_yaml, create_directories, save_json and load_json run in stage and request
+    paths, so they rely on their type hints only; the other helpers keep the runtime
+    checks of @ensure_annotations.
 """
 
 from pathlib import Path
@@ -21,7 +25,6 @@ from predicting_publications import logger
 
 
 
-@ensure_annotations
 def read_yaml(path_to_yaml: Path) -> ConfigBox:
     """
     Reads a yaml file, and returns a ConfigBox object.
@@ -49,7 +52,6 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         raise e
 
 
-@ensure_annotations
 def create_directories(path_to_directories: list, verbose=True):
     """
     Create a list of directories.
@@ -71,7 +73,6 @@ def create_directories(path_to_directories: list, verbose=True):
             raise
 
 
-@ensure_annotations
 def save_json(path: Path, data: dict):
     """
     Save json data
@@ -92,7 +93,6 @@ def save_json(path: Path, data: dict):
         raise
 
 
-@ensure_annotations
 def load_json(path: Path) -> ConfigBox:
     """
     Load json files data
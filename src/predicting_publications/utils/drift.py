@@ -0,0 +1,230 @@
+"""
+drift.py
+
+Purpose:
+    Monitor the distribution of the features received by serving against the
+    distribution of the train data.
+
+    Every feature is summarized by a fixed-bin histogram whose bin edges are the train
+    data quantiles. Serving only increments one bin per feature and request (a bisect
+    over a handful of edges). The live histograms are exponentially decayed: a request
+    weighs half as much after `half_life_s`, so drift that started recently is not
+    diluted by hours of older traffic. A background thread computes the drift scores
+    from the bin weights every `compute_interval_s`, off the request path:
+    - PSI (population stability index): sum of (live% - train%) * ln(live% / train%);
+      below 0.1 is usually read as stable, above 0.25 as significant drift.
+    - KS: the largest difference of the two cumulative distributions, over the bin edges.
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json, load_json
+from predicting_publications.utils.metrics import MetricsRegistry, REGISTRY
+
+# Proportion used in place of empty bins, so that PSI stays finite
+PSI_EPSILON = 1e-4
+
+# The live weights are rescaled once the weight of a new request reaches this
+MAX_REQUEST_WEIGHT = 1e12
+
+
+def build_reference(data: pd.DataFrame, features: list, n_bins: int) -> dict:
+    """
+    Build the reference histograms of `features` from the train data.
+
+    Args:
+    - data (pd.DataFrame): The train data.
+    - features (list): Features to monitor.
+    - n_bins (int): Number of quantile bins per feature (fewer for features with few distinct values).
+
+    Returns:
+    - dict: Per feature, the interior bin edges and the train data count of every bin.
+    """
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    reference = {"rows": len(data), "features": {}}
+    for feature in features:
+        values = data[feature].to_numpy(dtype=float)
+        edges = np.unique(np.quantile(values, quantiles))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        reference["features"][feature] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return reference
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Population stability index of two histograms over the same bins.
+    """
+    expected = np.maximum(expected / max(expected.sum(), 1), PSI_EPSILON)
+    actual = np.maximum(actual / max(actual.sum(), 1), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Kolmogorov-Smirnov statistic of two histograms over the same bins.
+    """
+    expected_cdf = np.cumsum(expected) / max(expected.sum(), 1)
+    actual_cdf = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(expected_cdf - actual_cdf)))
+
+
+class DriftMonitor:
+    """
+    Exponentially decayed feature histograms of serving traffic, scored against the train data.
+
+    Rather than decaying every bin on every request, a request observed at time t adds the
+    weight 2 ** ((t - t0) / half_life_s) to its bins: older requests weigh relatively less,
+    and the scores only depend on the bin proportions. The weights are divided by the
+    current request weight whenever it gets large (and when the scores are computed).
+
+    Attributes:
+    - features (list): Monitored features.
+    - observations (int): Number of observed requests since the monitor was created.
+    - scores (dict): Latest PSI and KS score of every feature.
+
+    Example:
+    --------
+    >>> monitor = DriftMonitor.from_train_data("artifacts/data_transformation/train_data.csv", features)
+    >>> monitor.start()
+    >>> monitor.observe({"lon": 30.31, "lat": 59.94, "hour": 10})
+    """
+
+    def __init__(self, reference: dict, compute_interval_s: float = 60.0, min_observations: int = 100,
+                 half_life_s: float = 3600.0, registry: MetricsRegistry = REGISTRY):
+        self.reference = reference
+        self.features = list(reference["features"])
+        self._edges = {f: reference["features"][f]["edges"] for f in self.features}
+        self._reference_counts = {f: np.asarray(reference["features"][f]["counts"], dtype=float)
+                                  for f in self.features}
+        self._live_weights = {f: [0.0] * (len(self._edges[f]) + 1) for f in self.features}
+        self.compute_interval_s = compute_interval_s
+        self.min_observations = min_observations
+        self.half_life_s = half_life_s
+        self.observations = 0
+        self.scores = {}
+        self._weights_start = time.monotonic()
+        self._total_weight = 0.0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self.psi_gauge = registry.gauge("feature_drift_psi", "PSI of serving traffic against the train data.",
+                                        ("feature",))
+        self.ks_gauge = registry.gauge("feature_drift_ks", "KS statistic of serving traffic against the train data.",
+                                       ("feature",))
+        self.observations_gauge = registry.gauge("feature_drift_observations",
+                                                 "Decayed number of requests included in the drift scores.")
+
+    @classmethod
+    def from_train_data(cls, train_data_path: Path, features: list, n_bins: int = 10,
+                        reference_file: Path = None, **kwargs) -> "DriftMonitor":
+        """
+        Create a monitor, loading the reference histograms from `reference_file` when it is
+        newer than the train data, else building them from the train data (and saving them).
+        """
+        if (reference_file is not None and os.path.exists(reference_file)
+                and os.path.getmtime(reference_file) >= os.path.getmtime(train_data_path)):
+            reference = load_json(Path(reference_file)).to_dict()
+            if reference.get("n_bins") == n_bins and list(reference["features"]) == list(features):
+                return cls(reference, **kwargs)
+
+        logger.info(f"Building drift reference histograms from {train_data_path}")
+        reference = {"n_bins": n_bins, **build_reference(pd.read_csv(train_data_path), features, n_bins)}
+        if reference_file is not None:
+            save_json(path=Path(reference_file), data=reference)
+        return cls(reference, **kwargs)
+
+    def _request_weight(self, now: float) -> float:
+        return 2.0 ** ((now - self._weights_start) / self.half_life_s) if self.half_life_s > 0 else 1.0
+
+    def _rescale(self, now: float):
+        """
+        Divide the live weights by the weight of a request observed `now`. Requires the lock.
+        """
+        scale = 1.0 / self._request_weight(now)
+        for weights in self._live_weights.values():
+            for index in range(len(weights)):
+                weights[index] *= scale
+        self._total_weight *= scale
+        self._weights_start = now
+
+    def observe(self, values: dict):
+        """
+        Add one request to the live histograms. Features missing from `values` are skipped.
+        """
+        bins = [(feature, bisect_right(self._edges[feature], float(values[feature])))
+                for feature in self.features if values.get(feature) is not None]
+        now = time.monotonic()
+        with self._lock:
+            weight = self._request_weight(now)
+            if weight >= MAX_REQUEST_WEIGHT:
+                self._rescale(now)
+                weight = 1.0
+            for feature, index in bins:
+                self._live_weights[feature][index] += weight
+            self._total_weight += weight
+            self.observations += 1
+
+    def decayed_observations(self) -> float:
+        """
+        Return the decayed number of observed requests: each counts 1, halved every `half_life_s`.
+        """
+        with self._lock:
+            return self._total_weight / self._request_weight(time.monotonic())
+
+    def compute(self) -> dict:
+        """
+        Compute the PSI and KS scores of every feature and publish them as gauges.
+
+        Returns:
+        - dict: Per feature, its PSI and KS scores.
+        """
+        with self._lock:
+            self._rescale(time.monotonic())
+            live_weights = {f: np.asarray(w, dtype=float) for f, w in self._live_weights.items()}
+            observations = self._total_weight
+
+        scores = {}
+        for feature in self.features:
+            if live_weights[feature].sum() == 0:
+                continue
+            scores[feature] = {"psi": psi(self._reference_counts[feature], live_weights[feature]),
+                               "ks": ks_statistic(self._reference_counts[feature], live_weights[feature])}
+            self.psi_gauge.set(round(scores[feature]["psi"], 6), feature)
+            self.ks_gauge.set(round(scores[feature]["ks"], 6), feature)
+        self.observations_gauge.set(round(observations, 3))
+        self.scores = scores
+        return scores
+
+    def maybe_compute(self):
+        """
+        Compute the scores if the decayed number of requests reaches `min_observations`.
+        """
+        if self.decayed_observations() >= self.min_observations:
+            self.compute()
+
+    def start(self):
+        """
+        Compute the scores every `compute_interval_s` on a daemon thread, until `stop` is called.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.compute_interval_s):
+            try:
+                self.maybe_compute()
+            except Exception as e:
+                logger.error(f"Error computing the drift scores: {e}")
@@ -0,0 +1,106 @@
+"""
+executor.py
+
+Purpose:
+    Pluggable executors for the parallel work of the pipeline stages: the data
+    partitions aggregated by the transformation, and the candidate models, shards and
+    cross-validation folds fitted by training.
+
+    Every backend is a `concurrent.futures.Executor`, so the stages submit their tasks
+    and collect the futures the same way whichever backend the `executor` section of
+    config.yaml selects:
+
+    - serial: tasks run in the calling process when submitted, one after another.
+    - process: a local pool of worker processes.
+    - dask: a Dask cluster, from a laptop (a local in-process cluster) to many nodes.
+      dask.distributed (in requirements.txt) is optional and only needed by this backend.
+
+    Tasks must be module-level functions with picklable arguments and results.
+"""
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+from predicting_publications import logger
+from predicting_publications.entity.config_entity import ExecutorConfig
+
+EXECUTOR_BACKENDS = ("serial", "process", "dask")
+
+
+class SerialExecutor(Executor):
+    """
+    Executor running every task in the calling process as soon as it is submitted.
+
+    Useful for debugging (breakpoints and tracebacks stay in one process) and for data
+    too small to be worth the overhead of shipping it to workers.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class DaskExecutor(Executor):
+    """
+    Executor running tasks on a Dask cluster.
+
+    Connects to the scheduler at `scheduler_address`, or starts a local in-process
+    cluster of `max_workers` threads when no address is given (e.g. for tests). The
+    workers of a remote cluster need the package installed and access to the artifacts
+    the tasks read, e.g. through a shared filesystem.
+
+    Raises:
+    - ImportError: If dask.distributed is not installed.
+    """
+
+    def __init__(self, scheduler_address: str = None, max_workers: int = 1):
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as e:
+            raise ImportError("dask[distributed] is required by the dask executor backend") from e
+
+        self._cluster = None
+        if scheduler_address is None:
+            self._cluster = LocalCluster(n_workers=1, threads_per_worker=max_workers, processes=False,
+                                         dashboard_address=None)
+            self._client = Client(self._cluster)
+        else:
+            self._client = Client(scheduler_address)
+        # Tasks are not pure: fitting a model twice must not be answered from a cache
+        self._executor = self._client.get_executor(pure=False)
+        logger.info(f"Connected to the Dask scheduler at {self._client.scheduler.address}")
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._executor.shutdown(wait=wait)
+        self._client.close()
+        if self._cluster is not None:
+            self._cluster.close()
+
+
+def create_executor(config: ExecutorConfig, max_workers: int) -> Executor:
+    """
+    Create the executor of the configured backend, to be used as a context manager.
+
+    Args:
+    - config (ExecutorConfig): The executor section of config.yaml.
+    - max_workers (int): Largest number of tasks run at once by the local backends.
+
+    Returns:
+    - Executor: A SerialExecutor, ProcessPoolExecutor or DaskExecutor.
+
+    Raises:
+    - ValueError: If the backend is unknown.
+    """
+    if config.backend == "serial" or (config.backend == "process" and max_workers <= 1):
+        return SerialExecutor()
+    if config.backend == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if config.backend == "dask":
+        return DaskExecutor(config.scheduler_address, max_workers)
+    raise ValueError(f"Unknown executor backend {config.backend!r}, expected one of {', '.join(EXECUTOR_BACKENDS)}")
@@ -0,0 +1,148 @@
+"""
+input_validation.py
+
+Purpose:
+    Validate prediction inputs against feature_engineered_schema.yaml.
+
+    The schema is compiled once into NumPy arrays (column order, integer mask, lower and
+    upper bounds), so a whole batch is converted, reordered and checked with a few
+    vectorized operations, whatever its number of rows. The single-row paths (web forms,
+    JSON requests) and the batch paths (PredictionPipeline.predict, micro-batching)
+    share the same checks.
+"""
+
+from collections import namedtuple
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+# Rows described in the message of an InvalidInputError
+MAX_REPORTED_ROWS = 10
+
+# Result of InputSchema.check: the valid rows (model column order and dtypes), the
+# validity of every input row, and an error message per invalid row index
+CheckedInput = namedtuple("CheckedInput", ["data", "valid", "errors"])
+
+
+class InvalidInputError(ValueError):
+    """
+    Raised when prediction inputs do not match the feature schema.
+    """
+
+
+class InputSchema:
+    """
+    Compiled feature schema checking and reordering prediction inputs.
+
+    Attributes:
+    - columns (list): Model input columns, in model order.
+    - dtypes (dict): NumPy dtype of every column.
+    - lower, upper (np.ndarray): Inclusive bounds of every column (-inf/inf when unbounded).
+    - integer (np.ndarray): Whether each column must hold whole numbers.
+
+    Example:
+    --------
+    >>> schema = InputSchema.from_schema(load_config_snapshot().feature_schema.columns, FEATURE_COLUMNS)
+    >>> data = schema.validate(request.form)
+    """
+
+    def __init__(self, columns: list, dtypes: dict, lower, upper):
+        self.columns = list(columns)
+        self.dtypes = {column: np.dtype(dtypes[column]) for column in self.columns}
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.integer = np.array([np.issubdtype(self.dtypes[c], np.integer) for c in self.columns])
+
+    @classmethod
+    def from_schema(cls, schema: Mapping, columns: list) -> "InputSchema":
+        """
+        Compile the `columns` mapping of a schema file for the given model columns.
+
+        Args:
+        - schema (Mapping): Column name -> {type, min, max} as in feature_engineered_schema.yaml.
+        - columns (list): Model input columns, in model order.
+        """
+        lower = [schema[c].get("min", -np.inf) for c in columns]
+        upper = [schema[c].get("max", np.inf) for c in columns]
+        return cls(columns, {c: schema[c]["type"] for c in columns}, lower, upper)
+
+    def _as_matrix(self, data, allow_missing) -> np.ndarray:
+        """
+        Convert inputs to a float64 matrix in model column order; unparseable values become NaN.
+        """
+        if isinstance(data, pd.DataFrame):
+            missing = [c for c in self.columns if c not in data.columns and c not in allow_missing]
+            frame = data.reindex(columns=self.columns)
+        else:
+            # A mapping of scalars (one row, e.g. a form) or of sequences (one value per row)
+            missing = [c for c in self.columns if c not in data and c not in allow_missing]
+            values = [np.atleast_1d(data[c]) if c in data else [np.nan] for c in self.columns]
+            frame = pd.DataFrame(np.array(values, dtype=object).T, columns=self.columns)
+        if missing:
+            raise InvalidInputError(f"Missing features: {', '.join(missing)}")
+
+        try:
+            return frame.to_numpy(dtype=np.float64, na_value=np.nan)
+        except (ValueError, TypeError):
+            return frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def check(self, data, allow_missing=()) -> CheckedInput:
+        """
+        Check a batch of inputs and keep the valid rows.
+
+        Args:
+        - data: A DataFrame, or a mapping of column to value (one row) or to values.
+        - allow_missing: Columns that may be absent or empty (their values stay NaN).
+
+        Returns:
+        - CheckedInput: The valid rows as a DataFrame in model column order and dtypes,
+          the validity of every row, and an error message per invalid row index.
+
+        Raises:
+        - InvalidInputError: If a required column is absent.
+        """
+        matrix = self._as_matrix(data, set(allow_missing))
+
+        is_nan = np.isnan(matrix)
+        optional = np.isin(self.columns, list(allow_missing))
+        # Infinities pass the bounds of unbounded columns, so they are rejected explicitly
+        bad = ((is_nan & ~optional) | np.isinf(matrix)
+               | (matrix < self.lower) | (matrix > self.upper)
+               | (self.integer & ~is_nan & (matrix != np.floor(matrix))))
+        valid = ~bad.any(axis=1)
+
+        errors = {}
+        if not valid.all():
+            for row in np.flatnonzero(~valid)[:MAX_REPORTED_ROWS]:
+                errors[int(row)] = "; ".join(self._describe(column, matrix[row, column])
+                                             for column in np.flatnonzero(bad[row]))
+
+        frame = pd.DataFrame(matrix[valid], columns=self.columns)
+        required = [c for c, allowed in zip(self.columns, optional) if not allowed]
+        frame = frame.astype({c: self.dtypes[c] for c in required})
+        return CheckedInput(frame, valid, errors)
+
+    def _describe(self, column: int, value: float) -> str:
+        name = self.columns[column]
+        if np.isnan(value):
+            return f"{name} is missing or not a number"
+        if np.isinf(value):
+            return f"{name} must be a finite number, got {value:g}"
+        if self.integer[column] and value != np.floor(value):
+            return f"{name} must be a whole number, got {value:g}"
+        return f"{name} must be between {self.lower[column]:g} and {self.upper[column]:g}, got {value:g}"
+
+    def validate(self, data, allow_missing=()) -> pd.DataFrame:
+        """
+        Check inputs and return them in model column order and dtypes.
+
+        Raises:
+        - InvalidInputError: If any row is invalid, describing the first invalid rows.
+        """
+        checked = self.check(data, allow_missing)
+        if not checked.valid.all():
+            n_invalid = int((~checked.valid).sum())
+            details = " | ".join(f"row {row}: {error}" for row, error in checked.errors.items())
+            raise InvalidInputError(f"{n_invalid} invalid input row(s): {details}")
+        return checked.data
@@ -0,0 +1,184 @@
+"""
+logging_setup.py
+
+Purpose:
+    Asynchronous logging for the project logger.
+
+    Callers only put records on a bounded in-memory queue (QueueHandler); a background
+    thread (QueueListener) writes them to a size-rotated log file and stdout. Writing to
+    disk therefore never happens on request or stage paths, and when the writer falls
+    behind records are dropped and counted instead of blocking the caller.
+
+    Levels can be set per module (e.g. `common`) or logger name, and records can be
+    written as JSON lines for log collectors.
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import multiprocessing.util
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+import yaml
+
+from predicting_publications.entity.config_entity import LoggingConfig
+
+# Plain text format of log records
+LOG_FORMAT = "[%(asctime)s: %(lineno)d: %(name)s: %(levelname)s: %(module)s:  %(message)s]"
+
+# Settings used when the configuration file or its logging section is absent
+DEFAULT_LOGGING = {
+    "log_file": "logs/running_logs.log",
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "level": "INFO",
+    "module_levels": {},
+    "json_format": False,
+    "queue_size": 10000,
+}
+
+
+def load_logging_config(config_file: Path) -> LoggingConfig:
+    """
+    Read the `logging` section of the configuration file, falling back to DEFAULT_LOGGING.
+
+    The configuration is read with PyYAML directly, as the common helpers themselves log.
+    """
+    settings = dict(DEFAULT_LOGGING)
+    if os.path.exists(config_file):
+        with open(config_file) as f:
+            settings.update((yaml.safe_load(f) or {}).get("logging") or {})
+    return LoggingConfig(
+        log_file=Path(settings["log_file"]),
+        max_bytes=int(settings["max_bytes"]),
+        backup_count=int(settings["backup_count"]),
+        level=str(settings["level"]).upper(),
+        module_levels={name: str(level).upper() for name, level in (settings["module_levels"] or {}).items()},
+        json_format=bool(settings["json_format"]),
+        queue_size=int(settings["queue_size"]),
+    )
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "lineno": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Drop records below the level of their module or logger (or below the default level).
+
+    Module levels match the module a record was logged from (`common` for
+    utils/common.py); other keys match a logger name and its children.
+    """
+
+    def __init__(self, default_level: int, module_levels: dict):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = {name: logging.getLevelName(level) for name, level in module_levels.items()}
+        self._levels = {}
+
+    def _level(self, name: str, module: str) -> int:
+        if module in self.module_levels:
+            return self.module_levels[module]
+        while name:
+            if name in self.module_levels:
+                return self.module_levels[name]
+            name = name.rpartition(".")[0]
+        return self.default_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.module)
+        level = self._levels.get(key)
+        if level is None:
+            level = self._levels[key] = self._level(*key)
+        return record.levelno >= level
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records when its bounded queue is full, instead of blocking.
+
+    Attributes:
+    - dropped (int): Number of records dropped so far.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(config: LoggingConfig) -> QueueListener:
+    """
+    Route the records of the root logger through a bounded queue to a background writer.
+
+    Configuring twice is a no-op (the package may be imported under two names, e.g.
+    `src.predicting_publications` and `predicting_publications`): the listener is kept
+    on the root logger.
+
+    Args:
+    - config (LoggingConfig): Logging settings.
+
+    Returns:
+    - QueueListener: The running listener writing the queued records.
+    """
+    root = logging.getLogger()
+    listener = getattr(root, "queue_listener", None)
+    if listener is not None:
+        return listener
+
+    os.makedirs(os.path.dirname(config.log_file) or ".", exist_ok=True)
+    formatter = JsonFormatter() if config.json_format else logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(config.log_file, maxBytes=config.max_bytes, backupCount=config.backup_count)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    default_level = logging.getLevelName(config.level)
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=config.queue_size))
+    queue_handler.addFilter(ModuleLevelFilter(default_level, config.module_levels))
+
+    # The root level lets through the most verbose configured level; the filter applies the rest
+    root.setLevel(min([default_level, *(logging.getLevelName(level) for level in config.module_levels.values())]))
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(queue_handler.queue, file_handler, stream_handler)
+    listener.start()
+    root.queue_listener = listener
+    # Write the records still queued when the interpreter exits
+    atexit.register(listener.stop)
+
+    def restart_in_child():
+        # Forked worker processes (stages, folds) inherit the handler but not the writer
+        # thread: give them their own queue and writer, stopped when the worker exits
+        queue_handler.queue = listener.queue = queue.Queue(maxsize=config.queue_size)
+        listener._thread = None
+        listener.start()
+        multiprocessing.util.Finalize(None, listener.stop, exitpriority=0)
+
+    os.register_at_fork(after_in_child=restart_in_child)
+    return listener
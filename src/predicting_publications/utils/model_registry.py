@@ -0,0 +1,206 @@
+"""
+model_registry.py
+
+Purpose:
+    A local, versioned registry of trained models.
+
+    Every registered model is copied into its own immutable version directory
+    (versions/v0001, versions/v0002, ...), next to a metadata.json describing it.
+    Aliases (`production`, `shadow`) are small files naming a version. A version
+    directory is staged under a temporary name and renamed into place, and an alias is
+    written to a temporary file and moved over the previous one with os.replace, so a
+    reader resolving an alias always sees a complete model, before or after the change.
+
+Usage:
+    python -m predicting_publications.utils.model_registry list
+    python -m predicting_publications.utils.model_registry promote v0003
+    python -m predicting_publications.utils.model_registry promote v0004 --alias shadow
+    python -m predicting_publications.utils.model_registry clear shadow
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import argparse
+from pathlib import Path
+
+from predicting_publications import logger
+
+# Alias of the model answering requests, and of the candidate scored in shadow mode
+PRODUCTION_ALIAS = "production"
+SHADOW_ALIAS = "shadow"
+
+VERSIONS_DIR = "versions"
+ALIASES_DIR = "aliases"
+METADATA_FILE = "metadata.json"
+
+
+class ModelRegistry:
+    """
+    Versioned model storage with atomically promoted aliases.
+
+    Attributes:
+    - root_dir (Path): Directory holding the versions and aliases.
+
+    Example:
+    --------
+    >>> registry = ModelRegistry("artifacts/model_registry")
+    >>> version = registry.register({"model.joblib": "artifacts/model_trainer/model.joblib"})
+    >>> registry.promote(version)
+    >>> registry.resolve("production")
+    PosixPath('artifacts/model_registry/versions/v0001')
+    """
+
+    def __init__(self, root_dir: Path):
+        self.root_dir = Path(root_dir)
+        self.versions_dir = self.root_dir / VERSIONS_DIR
+        self.aliases_dir = self.root_dir / ALIASES_DIR
+        # Versions read from the alias files, by alias, with the (inode, mtime, size) they were read at
+        self._aliases = {}
+        os.makedirs(self.versions_dir, exist_ok=True)
+        os.makedirs(self.aliases_dir, exist_ok=True)
+
+    def versions(self) -> list:
+        """
+        Return the registered versions, oldest first.
+        """
+        return sorted(name for name in os.listdir(self.versions_dir) if name.startswith("v"))
+
+    def register(self, files: dict, metadata: dict = None, promote: bool = False) -> str:
+        """
+        Copy model files into a new version.
+
+        Args:
+        - files (dict): File name in the version -> path of the file to copy. Missing files are skipped.
+        - metadata (dict, optional): Description of the model (trainer, metrics, ...).
+        - promote (bool): Whether to promote the new version to production.
+
+        Returns:
+        - str: The new version, e.g. "v0003".
+        """
+        staging_dir = self.root_dir / f".staging-{uuid.uuid4().hex}"
+        os.makedirs(staging_dir)
+        try:
+            copied = []
+            for name, path in files.items():
+                if path is not None and os.path.exists(path):
+                    shutil.copy2(path, staging_dir / name)
+                    copied.append(name)
+            with open(staging_dir / METADATA_FILE, "w") as f:
+                json.dump({"files": copied, "registered_at": time.time(), **(metadata or {})}, f, indent=4)
+
+            # Claim the next version number; a concurrent registration may take it first
+            while True:
+                versions = self.versions()
+                number = int(versions[-1][1:]) + 1 if versions else 1
+                version = f"v{number:04d}"
+                try:
+                    os.rename(staging_dir, self.versions_dir / version)
+                    break
+                except OSError:
+                    if not (self.versions_dir / version).exists():
+                        raise
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"Registered model version {version} ({', '.join(copied)})")
+        if promote:
+            self.promote(version)
+        return version
+
+    def promote(self, version: str, alias: str = PRODUCTION_ALIAS):
+        """
+        Point `alias` at `version`, atomically.
+
+        Raises:
+        - ValueError: If the version does not exist.
+        """
+        if not (self.versions_dir / version / METADATA_FILE).exists():
+            raise ValueError(f"Model version {version} does not exist in {self.root_dir}")
+        alias_path = self.aliases_dir / alias
+        tmp_path = self.aliases_dir / f".{alias}.{uuid.uuid4().hex}"
+        tmp_path.write_text(version)
+        os.replace(tmp_path, alias_path)
+        logger.info(f"Promoted model version {version} to {alias}")
+
+    def clear(self, alias: str):
+        """
+        Remove `alias` (e.g. to stop shadow scoring).
+        """
+        try:
+            os.remove(self.aliases_dir / alias)
+            logger.info(f"Cleared model alias {alias}")
+        except FileNotFoundError:
+            pass
+
+    def version_of(self, alias: str) -> str:
+        """
+        Return the version `alias` points at, or None.
+
+        Serving checks the production alias on every request, so the alias file is only
+        read again when it changed: promote replaces it by a new file (new inode and mtime).
+        """
+        path = self.aliases_dir / alias
+        try:
+            stat = os.stat(path)
+            file_version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            cached = self._aliases.get(alias)
+            if cached is not None and cached[0] == file_version:
+                return cached[1]
+            version = path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+        self._aliases[alias] = (file_version, version)
+        return version
+
+    def resolve(self, alias_or_version: str = PRODUCTION_ALIAS) -> Path:
+        """
+        Return the directory of a version, given the version or an alias; None if unknown.
+        """
+        version = alias_or_version if alias_or_version.startswith("v") else self.version_of(alias_or_version)
+        if version is None or not (self.versions_dir / version).is_dir():
+            return None
+        return self.versions_dir / version
+
+    def metadata(self, version: str) -> dict:
+        """
+        Return the metadata of a version.
+        """
+        with open(self.versions_dir / version / METADATA_FILE) as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model registry.")
+    parser.add_argument("--root-dir", default=None, help="Registry directory (default: model_registry.root_dir)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List versions and aliases.")
+    promote = commands.add_parser("promote", help="Point an alias at a version.")
+    promote.add_argument("version")
+    promote.add_argument("--alias", default=PRODUCTION_ALIAS)
+    clear = commands.add_parser("clear", help="Remove an alias.")
+    clear.add_argument("alias")
+    args = parser.parse_args()
+
+    if args.root_dir is None:
+        from predicting_publications.config.configuration import ConfigurationManager
+        args.root_dir = ConfigurationManager().get_model_registry_config().root_dir
+    registry = ModelRegistry(args.root_dir)
+
+    if args.command == "list":
+        aliases = {alias: registry.version_of(alias) for alias in sorted(os.listdir(registry.aliases_dir))
+                   if not alias.startswith(".")}
+        for version in registry.versions():
+            names = [alias for alias, target in aliases.items() if target == version]
+            print(f"{version}  {registry.metadata(version).get('stage', '')}  {' '.join(names)}")
+    elif args.command == "promote":
+        registry.promote(args.version, args.alias)
+    elif args.command == "clear":
+        registry.clear(args.alias)
+
+
+if __name__ == "__main__":
+    main()
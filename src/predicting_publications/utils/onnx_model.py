@@ -0,0 +1,166 @@
+"""
+onnx_model.py
+
+Purpose:
+    ONNX export of trained models and an ONNX Runtime (CPU) serving backend.
+
+    Serving a model exported to ONNX only needs onnxruntime: workers neither import
+    sklearn nor unpickle the model. The export is checked against the native model
+    (prediction parity on the train data) and discarded when they disagree, so the
+    ONNX backend can only ever serve a model that predicts like the native one.
+
+    Both skl2onnx (export) and onnxruntime (serving) are listed in requirements.txt but
+    optional: without them, the export is skipped and serving falls back to the native
+    model, with a warning.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from predicting_publications import logger
+
+try:
+    import onnxruntime
+except ImportError:  # onnxruntime is optional, the native model is served instead
+    onnxruntime = None
+ONNX_RUNTIME_AVAILABLE = onnxruntime is not None
+
+# Name of the input tensor (float32 features in training column order)
+INPUT_NAME = "input"
+
+# Opsets of the exported graphs (ai.onnx.ml 3 holds the tree ensemble operators)
+TARGET_OPSET = {"": 17, "ai.onnx.ml": 3}
+
+# Rows of the reference data compared by the parity check
+PARITY_ROWS = 10000
+
+# Sessions created by `OnnxModel.load`, by (path, modification time, threads)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def export_onnx(model, X, path: Path, tolerance: float) -> dict:
+    """
+    Export a fitted sklearn regressor to ONNX and check its predictions against the model.
+
+    A previous export at `path` is removed first, so a model that cannot be exported
+    never leaves a stale ONNX file behind.
+
+    Args:
+    - model: A fitted sklearn regressor.
+    - X (pd.DataFrame): Reference data (e.g. the train data), in training column order.
+    - path (Path): Destination of the ONNX model.
+    - tolerance (float): Largest absolute prediction difference accepted by the parity check.
+
+    Returns:
+    - dict: The parity check (rows, max_abs_diff, passed), or None if the model was not exported.
+    """
+    path = Path(path)
+    if path.exists():
+        os.remove(path)
+
+    try:
+        from skl2onnx import to_onnx
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        logger.warning("skl2onnx is not installed, skipping the ONNX export")
+        return None
+
+    try:
+        onnx_model = to_onnx(model, initial_types=[(INPUT_NAME, FloatTensorType([None, X.shape[1]]))],
+                             target_opset=TARGET_OPSET)
+    except Exception as e:
+        # e.g. blended models, for which skl2onnx has no converter
+        logger.warning(f"Skipping the ONNX export of {type(model).__name__}: {e}")
+        return None
+
+    feature_names = [str(name) for name in getattr(X, "columns", range(X.shape[1]))]
+    entry = onnx_model.metadata_props.add()
+    entry.key, entry.value = "feature_names", json.dumps(feature_names)
+
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    os.replace(tmp_path, path)
+
+    if onnxruntime is None:
+        logger.warning("onnxruntime is not installed, the ONNX export was not checked")
+        return {"rows": 0, "max_abs_diff": None, "passed": None}
+
+    sample = X[:PARITY_ROWS]
+    max_abs_diff = float(np.max(np.abs(OnnxModel.load(path).predict(sample) - model.predict(sample)), initial=0.0))
+    parity = {"rows": len(sample), "max_abs_diff": max_abs_diff, "passed": max_abs_diff <= tolerance}
+    if not parity["passed"]:
+        os.remove(path)
+        logger.warning(f"ONNX export discarded: predictions differ by up to {max_abs_diff:.3g} (tolerance {tolerance})")
+        return parity
+
+    logger.info(f"ONNX model saved at: {path} (max abs difference {max_abs_diff:.3g} on {len(sample)} rows)")
+    return parity
+
+
+class OnnxModel:
+    """
+    Regressor served by ONNX Runtime on the CPU.
+
+    Sessions are created once per model file and thread count and shared by every
+    OnnxModel loading them, so creating a PredictionPipeline per request stays cheap.
+
+    Example:
+    --------
+    >>> model = OnnxModel.load("artifacts/model_trainer/model.onnx", intra_op_threads=1)
+    >>> predictions = model.predict(data)
+    """
+
+    def __init__(self, session, feature_names: list):
+        self.session = session
+        self.feature_names = feature_names
+
+    @classmethod
+    def load(cls, path: Path, intra_op_threads: int = 1) -> "OnnxModel":
+        """
+        Load an exported model.
+
+        Args:
+        - path (Path): The ONNX model file.
+        - intra_op_threads (int): Threads used within an operator (0 lets ONNX Runtime decide).
+
+        Raises:
+        - ImportError: If onnxruntime is not installed.
+        """
+        if onnxruntime is None:
+            raise ImportError("onnxruntime is required to serve ONNX models")
+
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns, intra_op_threads)
+        with _sessions_lock:
+            cached = _sessions.get(key)
+        if cached is not None:
+            return cls(*cached)
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        # Requests run one model call at a time: no parallelism between operators
+        options.inter_op_num_threads = 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        feature_names = json.loads(session.get_modelmeta().custom_metadata_map.get("feature_names", "null"))
+
+        with _sessions_lock:
+            # Sessions of previous versions of the file are no longer used
+            for stale in [k for k in _sessions if k[0] == key[0] and k[1] != key[1]]:
+                del _sessions[stale]
+            _sessions[key] = (session, feature_names)
+        return cls(session, feature_names)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict the target for every row of X.
+        """
+        if hasattr(X, "columns") and self.feature_names is not None:
+            X = X[self.feature_names]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return self.session.run(None, {INPUT_NAME: X})[0].ravel().astype(np.float64)
@@ -0,0 +1,479 @@
+"""
+packed_model.py
+
+Purpose:
+    Compact, versioned binary format for trained tree ensembles
+    (GradientBoostingRegressor), loaded through np.memmap.
+
+    Instead of pickling the full sklearn object graph, the trees are flattened into a
+    handful of dtype-packed node arrays. Loading maps the file read-only and creates
+    zero-copy views over it, so it takes milliseconds and the pages are shared between
+    every process that serves the same file.
+
+File layout (all little-endian, arrays 8-byte aligned):
+    header          struct HEADER_FORMAT (magic, version, sizes, offsets, init value, learning rate)
+    feature names   UTF-8 JSON list
+    tree_offsets    int64[n_trees + 1]   first node of each tree
+    feature         int16[n_nodes]       split feature (0 for leaves)
+    threshold       float64[n_nodes]     split threshold (go left if x <= threshold)
+    left, right     int32[n_nodes]       global index of the children (a leaf points to itself)
+    value           float64[n_nodes]     node value (mean target of the node's samples)
+
+Models with int16 bin thresholds (see `quantize_thresholds`) also store:
+    bin_offsets     int64[n_features + 1]  first bin edge of each feature
+    bin_edges       float64[n_edges]       sorted split thresholds of each feature
+"""
+
+import os
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from predicting_publications import logger
+
+MAGIC = b"PTREE\x00\x00\x00"
+FORMAT_VERSION = 1
+
+# magic, version, n_trees, n_features, max_depth, n_nodes, names_offset, names_length,
+# arrays_offset, init_value, learning_rate, threshold dtype code
+HEADER_FORMAT = "<8sIIIIQQQQddI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Threshold dtypes by code, so optimized models can store smaller thresholds.
+# Code 2 stores int16 bin indices into per-feature tables of split thresholds.
+THRESHOLD_DTYPES = {0: np.float64, 1: np.float32, 2: np.int16}
+BINNED_THRESHOLDS = 2
+
+# Rows scored per vectorized traversal, bounding the temporary (rows x trees) arrays
+PREDICT_CHUNK_ROWS = 4096
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def pack_gradient_boosting(model) -> dict:
+    """
+    Flatten a fitted GradientBoostingRegressor into packed node arrays.
+
+    Args:
+    - model: A fitted sklearn GradientBoostingRegressor.
+
+    Returns:
+    - dict: The arrays and scalars of the packed format.
+
+    Raises:
+    - TypeError: If the model is not a fitted GradientBoostingRegressor.
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    if not isinstance(model, GradientBoostingRegressor) or not hasattr(model, "estimators_"):
+        raise TypeError(f"Only fitted GradientBoostingRegressor models can be packed, got {type(model).__name__}")
+
+    trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+    sizes = np.array([tree.node_count for tree in trees], dtype=np.int64)
+    tree_offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    n_nodes = int(tree_offsets[-1])
+    feature = np.zeros(n_nodes, dtype=np.int16)
+    threshold = np.zeros(n_nodes, dtype=np.float64)
+    left = np.empty(n_nodes, dtype=np.int32)
+    right = np.empty(n_nodes, dtype=np.int32)
+    value = np.empty(n_nodes, dtype=np.float64)
+
+    for tree, start in zip(trees, tree_offsets[:-1]):
+        end = start + tree.node_count
+        local = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        feature[start:end] = np.where(is_leaf, 0, tree.feature)
+        threshold[start:end] = np.where(is_leaf, 0.0, tree.threshold)
+        left[start:end] = start + np.where(is_leaf, local, tree.children_left)
+        right[start:end] = start + np.where(is_leaf, local, tree.children_right)
+        value[start:end] = tree.value[:, 0, 0]
+
+    n_features = model.n_features_in_
+    init_value = float(np.ravel(model.init_.predict(np.zeros((1, n_features))))[0]) if model.init_ != "zero" else 0.0
+    feature_names = [str(name) for name in getattr(model, "feature_names_in_", range(n_features))]
+
+    return {
+        "tree_offsets": tree_offsets,
+        "feature": feature,
+        "threshold": threshold,
+        "left": left,
+        "right": right,
+        "value": value,
+        "max_depth": max(tree.max_depth for tree in trees),
+        "init_value": init_value,
+        "learning_rate": float(model.learning_rate),
+        "feature_names": feature_names,
+    }
+
+
+def write_packed_arrays(packed: dict, path: Path):
+    """
+    Write packed node arrays to `path` atomically (via a temporary file and rename).
+
+    Args:
+    - packed (dict): Arrays and scalars as returned by `pack_gradient_boosting`.
+    - path (Path): Destination file.
+    """
+    threshold = np.ascontiguousarray(packed["threshold"])
+    threshold_code = {np.dtype(dtype): code for code, dtype in THRESHOLD_DTYPES.items()}[threshold.dtype]
+    arrays = [packed["tree_offsets"].astype(np.int64), packed["feature"].astype(np.int16), threshold,
+              packed["left"].astype(np.int32), packed["right"].astype(np.int32), packed["value"].astype(np.float64)]
+    if threshold_code == BINNED_THRESHOLDS:
+        arrays += [packed["bin_offsets"].astype(np.int64), packed["bin_edges"].astype(np.float64)]
+
+    names = json.dumps(packed["feature_names"]).encode("utf-8")
+    names_offset = HEADER_SIZE
+    arrays_offset = _align(names_offset + len(names))
+
+    tree_offsets = packed["tree_offsets"]
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, len(tree_offsets) - 1,
+                         len(packed["feature_names"]), int(packed["max_depth"]), len(packed["feature"]),
+                         names_offset, len(names), arrays_offset,
+                         packed["init_value"], packed["learning_rate"], threshold_code)
+
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(names)
+        for array in arrays:
+            f.write(b"\x00" * (_align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+def save_packed_model(model, path: Path):
+    """
+    Pack a fitted GradientBoostingRegressor and write it to `path`.
+    """
+    write_packed_arrays(pack_gradient_boosting(model), Path(path))
+    logger.info(f"Packed model saved at: {path}")
+
+
+def packed_nbytes(packed: dict) -> int:
+    """
+    Return the size of the node arrays of a packed model, in bytes.
+    """
+    return sum(np.asarray(array).nbytes for key, array in packed.items()
+               if key in ("tree_offsets", "feature", "threshold", "left", "right", "value",
+                          "bin_offsets", "bin_edges"))
+
+
+def _compact(packed: dict) -> dict:
+    """
+    Drop the nodes no longer reachable from a root, renumber the rest and recompute max_depth.
+    """
+    left, right = packed["left"], packed["right"]
+    roots = packed["tree_offsets"][:-1]
+
+    reachable = np.zeros(len(left), dtype=bool)
+    depth, frontier, max_depth = 0, roots, 0
+    while len(frontier):
+        reachable[frontier] = True
+        internal = frontier[left[frontier] != frontier]
+        if len(internal):
+            depth += 1
+            max_depth = depth
+        frontier = np.concatenate([left[internal], right[internal]]).astype(np.int64)
+
+    new_index = np.cumsum(reachable) - 1
+    tree_of_node = np.repeat(np.arange(len(roots)), np.diff(packed["tree_offsets"]))
+    counts = np.bincount(tree_of_node[reachable], minlength=len(roots))
+
+    compacted = dict(packed)
+    compacted["tree_offsets"] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    for key in ("feature", "threshold", "value"):
+        compacted[key] = packed[key][reachable]
+    compacted["left"] = new_index[left[reachable]].astype(np.int32)
+    compacted["right"] = new_index[right[reachable]].astype(np.int32)
+    compacted["max_depth"] = max_depth
+    return compacted
+
+
+def merge_duplicate_leaves(packed: dict, tolerance: float = 0.0) -> dict:
+    """
+    Collapse splits whose two children are leaves with (nearly) the same value.
+
+    The split becomes a leaf holding its own value (the sample-weighted mean of both
+    children), which repeats bottom-up until no such split is left, so whole subtrees
+    that predict the same value shrink to a single leaf.
+
+    Args:
+    - packed (dict): Packed model arrays.
+    - tolerance (float): Maximum difference of the two leaf values, in target units after
+      scaling by the learning rate.
+
+    Returns:
+    - dict: The packed model with merged leaves and unreachable nodes removed.
+    """
+    left, right = packed["left"].copy(), packed["right"].copy()
+    value, learning_rate = packed["value"], packed["learning_rate"]
+    nodes = np.arange(len(left), dtype=np.int32)
+
+    while True:
+        is_leaf = left == nodes
+        mergeable = (~is_leaf & is_leaf[left] & is_leaf[right]
+                     & (learning_rate * np.abs(value[left] - value[right]) <= tolerance))
+        if not mergeable.any():
+            break
+        left[mergeable] = nodes[mergeable]
+        right[mergeable] = nodes[mergeable]
+
+    merged = dict(packed, left=left, right=right)
+    merged["feature"] = np.where(left == nodes, 0, packed["feature"]).astype(packed["feature"].dtype)
+    return _compact(merged)
+
+
+def quantize_thresholds(packed: dict, encoding: str) -> dict:
+    """
+    Store split thresholds in a smaller dtype without changing any split decision.
+
+    Inputs are compared as float32 (as sklearn does), so:
+    - "float32" rounds each threshold down to the largest float32 not above it;
+    - "int16" replaces each threshold by its index in the sorted table of the feature's
+      thresholds, and inputs are binned against that table once per predict call.
+
+    Raises:
+    - ValueError: If the encoding is unknown, or a feature has too many thresholds for int16.
+    """
+    threshold = packed["threshold"].astype(np.float64)
+    quantized = dict(packed)
+
+    if encoding == "float32":
+        rounded = threshold.astype(np.float32)
+        too_high = rounded.astype(np.float64) > threshold
+        rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+        quantized["threshold"] = rounded
+        return quantized
+
+    if encoding != "int16":
+        raise ValueError(f"Unknown threshold encoding: {encoding}")
+
+    is_split = packed["left"] != np.arange(len(threshold))
+    n_features = len(packed["feature_names"])
+    edges, offsets = [], [0]
+    bins = np.zeros(len(threshold), dtype=np.int16)
+    for feature in range(n_features):
+        nodes = np.flatnonzero(is_split & (packed["feature"] == feature))
+        feature_edges = np.unique(threshold[nodes])
+        if len(feature_edges) > np.iinfo(np.int16).max:
+            raise ValueError(f"Feature {packed['feature_names'][feature]} has too many thresholds for int16 bins")
+        bins[nodes] = np.searchsorted(feature_edges, threshold[nodes])
+        edges.append(feature_edges)
+        offsets.append(offsets[-1] + len(feature_edges))
+
+    quantized["threshold"] = bins
+    quantized["bin_offsets"] = np.array(offsets, dtype=np.int64)
+    quantized["bin_edges"] = np.concatenate(edges)
+    return quantized
+
+
+def prune_trailing_trees(packed: dict, X, tolerance: float) -> dict:
+    """
+    Drop the last trees whose contribution varies by less than `tolerance` over X.
+
+    A tree's contribution is learning_rate * leaf value. Trailing trees are removed while
+    the mean absolute deviation of their contribution (over the rows of X) is below the
+    tolerance; their mean contribution is folded into the initial value, so the
+    predictions stay unbiased on X.
+
+    Args:
+    - packed (dict): Packed model arrays.
+    - X: Reference data, e.g. the train data.
+    - tolerance (float): Contribution below which a trailing tree is pruned (0 disables pruning).
+
+    Returns:
+    - dict: The packed model without the pruned trees (at least one tree is kept).
+    """
+    if tolerance <= 0:
+        return packed
+
+    contributions = packed["learning_rate"] * packed["value"][PackedTreeEnsemble.from_packed(packed).apply(X)]
+    means = contributions.mean(axis=0)
+    spread = np.abs(contributions - means).mean(axis=0)
+
+    n_keep = len(spread)
+    while n_keep > 1 and spread[n_keep - 1] < tolerance:
+        n_keep -= 1
+    if n_keep == len(spread):
+        return packed
+
+    end = int(packed["tree_offsets"][n_keep])
+    pruned = dict(packed)
+    pruned["tree_offsets"] = packed["tree_offsets"][:n_keep + 1]
+    for key in ("feature", "threshold", "left", "right", "value"):
+        pruned[key] = packed[key][:end]
+    pruned["init_value"] = float(packed["init_value"] + means[n_keep:].sum())
+    return _compact(pruned)
+
+
+class PackedTreeEnsemble:
+    """
+    Tree ensemble served from the packed format.
+
+    `load` memory-maps the file and builds zero-copy array views over it. `predict`
+    traverses all trees for a chunk of rows at once with vectorized gathers, one step
+    per tree level, and returns the same predictions as the original model.
+    `contributions` explains the predictions of a batch in the same single traversal.
+
+    Example:
+    --------
+    >>> model = PackedTreeEnsemble.load("artifacts/model_trainer/model.ptree")
+    >>> predictions = model.predict(data)
+    """
+
+    def __init__(self, tree_offsets, feature, threshold, left, right, value, max_depth: int,
+                 init_value: float, learning_rate: float, feature_names: list, bin_offsets=None, bin_edges=None):
+        self.tree_offsets = tree_offsets
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.max_depth = max_depth
+        self.init_value = init_value
+        self.learning_rate = learning_rate
+        self.feature_names = feature_names
+        self.bin_offsets = bin_offsets
+        self.bin_edges = bin_edges
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_offsets) - 1
+
+    @classmethod
+    def from_packed(cls, packed: dict) -> "PackedTreeEnsemble":
+        """
+        Build an ensemble from in-memory packed arrays (as returned by `pack_gradient_boosting`).
+        """
+        return cls(packed["tree_offsets"], packed["feature"], packed["threshold"], packed["left"],
+                   packed["right"], packed["value"], max_depth=packed["max_depth"],
+                   init_value=packed["init_value"], learning_rate=packed["learning_rate"],
+                   feature_names=packed["feature_names"], bin_offsets=packed.get("bin_offsets"),
+                   bin_edges=packed.get("bin_edges"))
+
+    @classmethod
+    def load(cls, path: Path) -> "PackedTreeEnsemble":
+        """
+        Memory-map a packed model file.
+
+        Raises:
+        - ValueError: If the file is not a packed model or has an unsupported version.
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        (magic, version, n_trees, n_features, max_depth, n_nodes, names_offset, names_length,
+         arrays_offset, init_value, learning_rate, threshold_code) = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed model file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed model version {version} in {path}")
+        if threshold_code not in THRESHOLD_DTYPES:
+            raise ValueError(f"Unsupported threshold encoding {threshold_code} in {path}")
+
+        feature_names = json.loads(bytes(buffer[names_offset:names_offset + names_length]).decode("utf-8"))
+
+        arrays, offset = [], arrays_offset
+
+        def read(dtype, count):
+            nonlocal offset
+            offset = _align(offset)
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            offset += np.dtype(dtype).itemsize * count
+            return array
+
+        for dtype, count in ((np.int64, n_trees + 1), (np.int16, n_nodes), (THRESHOLD_DTYPES[threshold_code], n_nodes),
+                             (np.int32, n_nodes), (np.int32, n_nodes), (np.float64, n_nodes)):
+            arrays.append(read(dtype, count))
+
+        bin_offsets = bin_edges = None
+        if threshold_code == BINNED_THRESHOLDS:
+            bin_offsets = read(np.int64, n_features + 1)
+            bin_edges = read(np.float64, int(bin_offsets[-1]))
+
+        return cls(*arrays, max_depth=max_depth, init_value=init_value, learning_rate=learning_rate,
+                   feature_names=feature_names, bin_offsets=bin_offsets, bin_edges=bin_edges)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        """
+        Return X as a float32 matrix with columns in training order, or as an int16
+        matrix of bin indices when the thresholds are binned.
+        """
+        if hasattr(X, "columns"):
+            X = X[self.feature_names]
+        # sklearn trees compare float32 inputs against their thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if self.bin_edges is None:
+            return X
+
+        binned = np.empty(X.shape, dtype=np.int16)
+        for feature in range(X.shape[1]):
+            edges = self.bin_edges[self.bin_offsets[feature]:self.bin_offsets[feature + 1]]
+            # x <= edges[k] exactly when fewer than k + 1 edges are below x
+            binned[:, feature] = np.searchsorted(edges, X[:, feature], side="left")
+        return binned
+
+    def apply(self, X) -> np.ndarray:
+        """
+        Return the global index of the leaf reached in every tree, shape (rows, trees).
+        """
+        X = self._as_matrix(X)
+        n_features = X.shape[1]
+        roots = np.asarray(self.tree_offsets[:-1], dtype=np.int32)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int32)
+
+        for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+            chunk = X[start:start + PREDICT_CHUNK_ROWS].ravel()
+            # Flat offset of each row in the chunk, so a feature read is a single 1-D gather
+            row_offsets = (np.arange(len(chunk) // n_features, dtype=np.int32) * n_features)[:, None]
+            nodes = np.broadcast_to(roots, (len(row_offsets), self.n_trees)).copy()
+            for _ in range(self.max_depth):
+                go_left = chunk[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+                nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            leaves[start:start + len(row_offsets)] = nodes
+        return leaves
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict the target for every row of X.
+        """
+        return self.init_value + self.learning_rate * self.value[self.apply(X)].sum(axis=1)
+
+    def contributions(self, X) -> tuple:
+        """
+        Split the prediction of every row of X into a bias and one contribution per feature.
+
+        Contributions are path-dependent: every split on the path from a root to the leaf
+        reached by a row credits its feature with the change of the node value (the mean
+        target of the node's samples), scaled by the learning rate. The bias is the
+        prediction at the roots, so bias + contributions.sum(axis=1) equals `predict(X)`.
+
+        Returns:
+        - tuple: The bias (float) and the contributions, shape (rows, features).
+        """
+        X = self._as_matrix(X)
+        n_features = X.shape[1]
+        roots = np.asarray(self.tree_offsets[:-1], dtype=np.int32)
+        bias = self.init_value + self.learning_rate * float(np.sum(self.value[roots]))
+        contributions = np.zeros((len(X), n_features), dtype=np.float64)
+
+        for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+            chunk = X[start:start + PREDICT_CHUNK_ROWS].ravel()
+            row_offsets = (np.arange(len(chunk) // n_features, dtype=np.int32) * n_features)[:, None]
+            nodes = np.broadcast_to(roots, (len(row_offsets), self.n_trees)).copy()
+            totals = np.zeros(len(row_offsets) * n_features, dtype=np.float64)
+            for _ in range(self.max_depth):
+                features = self.feature[nodes]
+                go_left = chunk[row_offsets + features] <= self.threshold[nodes]
+                children = np.where(go_left, self.left[nodes], self.right[nodes])
+                # Leaves point to themselves, so rows that reached a leaf add nothing
+                totals += np.bincount((row_offsets + features).ravel(),
+                                      weights=(self.value[children] - self.value[nodes]).ravel(),
+                                      minlength=len(totals))
+                nodes = children
+            contributions[start:start + len(row_offsets)] = totals.reshape(-1, n_features)
+        return bias, self.learning_rate * contributions
@@ -0,0 +1,202 @@
+"""
+profiling.py
+
+Purpose:
+    Records wall time, CPU time, peak RSS, rows in/out and bytes read/written for each
+    stage of the training pipeline, with an optional cProfile dump per stage, and writes
+    the results as a JSON report.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import datetime
+import threading
+from pathlib import Path
+
+from predicting_publications import logger
+from predicting_publications.utils.common import save_json
+from predicting_publications.entity.config_entity import ProfilingConfig
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, /proc and resource are used instead
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def current_rss_bytes() -> int:
+    """
+    Return the current resident set size of this process in bytes (0 if unavailable).
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # ru_maxrss is the lifetime peak, in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+def io_counters() -> tuple:
+    """
+    Return (bytes read, bytes written) by this process so far, including page-cache hits.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    if psutil is not None:
+        try:
+            counters = psutil.Process().io_counters()
+            return (getattr(counters, "read_chars", counters.read_bytes),
+                    getattr(counters, "write_chars", counters.write_bytes))
+        except (AttributeError, psutil.Error):
+            pass
+    return 0, 0
+
+
+class _RSSSampler(threading.Thread):
+    """
+    Background thread tracking the peak RSS while a stage runs.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, current_rss_bytes())
+        return self.peak
+
+
+class StageProfile:
+    """
+    Context manager measuring a single pipeline stage.
+
+    Example:
+    --------
+    >>> with profiler.stage(pipeline.STAGE_NAME) as stage:
+    ...     pipeline.run_pipeline()
+    ...     stage.set_rows(pipeline.rows_in, pipeline.rows_out)
+    """
+
+    def __init__(self, name: str, config: ProfilingConfig):
+        self.name = name
+        self.config = config
+        self.record = {"stage": name, "status": "running", "rows_in": None, "rows_out": None}
+
+    def set_rows(self, rows_in=None, rows_out=None):
+        """
+        Record the number of rows the stage consumed and produced.
+        """
+        self.record["rows_in"] = rows_in
+        self.record["rows_out"] = rows_out
+
+    def __enter__(self):
+        self._sampler = _RSSSampler(self.config.rss_sample_interval)
+        self._sampler.start()
+        self._read_start, self._write_start = io_counters()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+
+        self._profiler = None
+        if self.config.cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        read_end, write_end = io_counters()
+        peak_rss = self._sampler.stop()
+
+        self.record.update({
+            "status": "failed" if exc_type is not None else "completed",
+            "wall_time_s": round(wall, 4),
+            "cpu_time_s": round(cpu, 4),
+            "peak_rss_mb": round(peak_rss / 1024 ** 2, 2),
+            "bytes_read": read_end - self._read_start,
+            "bytes_written": write_end - self._write_start,
+        })
+
+        if self._profiler is not None:
+            profile_path = Path(self.config.root_dir) / f"{self.name.lower().replace(' ', '_')}.prof"
+            self._profiler.dump_stats(profile_path)
+            self.record["cprofile_file"] = str(profile_path)
+
+        logger.info(f"Profile of {self.name}: wall {self.record['wall_time_s']}s, "
+                    f"cpu {self.record['cpu_time_s']}s, peak RSS {self.record['peak_rss_mb']} MB")
+        return False
+
+
+class PipelineProfiler:
+    """
+    Collects a StageProfile for every stage of a pipeline run and writes the JSON report.
+
+    The report of the latest run is written to `report_file`, and every run is appended as
+    one JSON line to `history_file`, so regressions can be tracked over time.
+
+    Attributes:
+    - config (ProfilingConfig): Configuration settings for pipeline profiling.
+    - stages (list): Records of the stages profiled so far.
+    """
+
+    def __init__(self, config: ProfilingConfig):
+        self.config = config
+        self.started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._wall_start = time.perf_counter()
+        self.stages = []
+
+    def stage(self, name: str) -> StageProfile:
+        """
+        Return a context manager profiling the stage called `name`.
+        """
+        profile = StageProfile(name, self.config)
+        self.stages.append(profile.record)
+        return profile
+
+    def add_record(self, record: dict):
+        """
+        Add the record of a stage profiled elsewhere, e.g. in a worker process.
+        """
+        self.stages.append(record)
+
+    def save_report(self):
+        """
+        Write the report of this run and append it to the run history.
+        """
+        report = {
+            "started_at": self.started_at,
+            # Stages may run concurrently, so this is the elapsed time, not the sum over stages
+            "total_wall_time_s": round(time.perf_counter() - self._wall_start, 4),
+            "stages": self.stages,
+        }
+        save_json(path=Path(self.config.report_file), data=report)
+        with open(self.config.history_file, "a") as f:
+            f.write(json.dumps(report) + "\n")
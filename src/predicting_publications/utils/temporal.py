@@ -0,0 +1,143 @@
+"""
+temporal.py
+
+Purpose:
+    Temporal features shared by training and serving.
+
+    The model is trained on hour, day, dayofweek and month derived from the publication
+    timestamps. Deriving them through the same function at serving time guarantees the
+    features of a forecast match those the model was trained on.
+
+    The features are computed from Unix epoch seconds with vectorized integer
+    arithmetic (the proleptic Gregorian calendar of H. Hinnant's `civil_from_days`),
+    instead of converting to datetimes and decomposing them once per `.dt` accessor.
+    Timestamps are UTC; the features can be derived in local time with a fixed offset.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Temporal model features, derived from a timestamp
+TEMPORAL_COLUMNS = ['hour', 'day', 'dayofweek', 'month']
+
+SECONDS_PER_DAY = 86400
+
+
+def _civil_date(days: np.ndarray) -> tuple:
+    """
+    Return the (year, month, day) of days since 1970-01-01, in the proleptic Gregorian calendar.
+    """
+    z = days + 719468                   # Days since 0000-03-01: years start in March, so leap days come last
+    era = z // 146097                   # 400-year eras
+    doe = z - era * 146097              # Day of the era [0, 146096]
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153           # Month of the March-based year [0, 11]
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+# Calendar features by name: function of (seconds since midnight, days since 1970-01-01, civil date)
+CALENDAR_FEATURES = {
+    'hour': lambda seconds, days, date: seconds // 3600,
+    'minute': lambda seconds, days, date: seconds // 60 % 60,
+    'day': lambda seconds, days, date: date()[2],
+    'dayofweek': lambda seconds, days, date: (days + 3) % 7,   # 1970-01-01 was a Thursday; Monday is 0
+    'month': lambda seconds, days, date: date()[1],
+    'year': lambda seconds, days, date: date()[0],
+}
+
+
+def epoch_seconds(values) -> np.ndarray:
+    """
+    Return timestamps as int64 Unix epoch seconds. Numbers are read as epoch seconds, as in
+    the raw data; datetimes (timezone-aware ones are converted to UTC) and strings are converted.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.int64)
+    values = to_datetime(values)
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    return values.to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+def calendar_features(timestamps, columns=TEMPORAL_COLUMNS, utc_offset_hours: float = 0) -> dict:
+    """
+    Derive calendar features from timestamps with integer arithmetic, in a single pass.
+
+    Args:
+    - timestamps: Unix epoch seconds (or datetimes, see `epoch_seconds`).
+    - columns (list): Features to derive, among CALENDAR_FEATURES.
+    - utc_offset_hours (float): Offset of the local time of the features from UTC (e.g. 3 for UTC+3).
+
+    Returns:
+    - dict: Feature name -> int64 array.
+
+    Raises:
+    - ValueError: If a feature is unknown.
+    """
+    unknown = [column for column in columns if column not in CALENDAR_FEATURES]
+    if unknown:
+        raise ValueError(f"Unknown calendar features: {', '.join(unknown)}")
+
+    local = epoch_seconds(timestamps) + int(round(utc_offset_hours * 3600))
+    days = local // SECONDS_PER_DAY
+    seconds = local - days * SECONDS_PER_DAY
+
+    civil = []
+
+    def date():
+        # The civil date is only computed for the features that need it, and only once
+        if not civil:
+            civil.append(_civil_date(days))
+        return civil[0]
+
+    return {column: CALENDAR_FEATURES[column](seconds, days, date) for column in columns}
+
+
+def to_datetime(values) -> pd.Series:
+    """
+    Convert timestamps to datetimes. Numbers are read as Unix epoch seconds, as in the raw data.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit='s')
+    return pd.to_datetime(values)
+
+
+def add_temporal_features(df: pd.DataFrame, timestamp_column: str = 'timestamp',
+                          utc_offset_hours: float = 0) -> pd.DataFrame:
+    """
+    Add the temporal model features to `df`, in place.
+
+    Args:
+    - df (pd.DataFrame): Data with a timestamp column (datetimes or Unix epoch seconds).
+    - timestamp_column (str): Name of the timestamp column, converted to (UTC) datetimes in place.
+    - utc_offset_hours (float): Offset of the local time of the features from UTC.
+
+    Returns:
+    - pd.DataFrame: The same DataFrame, with TEMPORAL_COLUMNS added.
+    """
+    seconds = epoch_seconds(df[timestamp_column])
+    for column, values in calendar_features(seconds, TEMPORAL_COLUMNS, utc_offset_hours).items():
+        df[column] = values.astype(np.int32)
+    df[timestamp_column] = seconds.astype('datetime64[s]').astype('datetime64[ns]')
+    return df
+
+
+def hourly_range(start, end) -> pd.DatetimeIndex:
+    """
+    Return every whole hour from `start` to `end` (both included, start rounded down to the hour).
+
+    Raises:
+    - ValueError: If `end` is before `start`.
+    """
+    start, end = to_datetime([start, end])
+    if end < start:
+        raise ValueError(f"Forecast end {end} is before its start {start}")
+    return pd.date_range(start.floor('h'), end, freq='h')
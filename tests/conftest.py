@@ -0,0 +1,50 @@
+"""
+conftest.py
+
+Purpose:
+    Shared fixtures of the test suite. The package lives under src/ and is imported
+    from there, so the tests run from a plain checkout: python -m pytest -q
+    The repository root is importable too, for the pipeline declared in main.py.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+FEATURE_NAMES = ["lon", "lat", "hour", "likescount", "constant"]
+
+
+@pytest.fixture(scope="session")
+def train_data() -> tuple:
+    """
+    A small regression problem: (X, y), with a constant column no split can use.
+    """
+    rng = np.random.default_rng(0)
+    n_rows = 400
+    X = pd.DataFrame({
+        "lon": rng.uniform(30.0, 30.6, n_rows).round(6),
+        "lat": rng.uniform(59.8, 60.1, n_rows).round(6),
+        "hour": rng.integers(0, 24, n_rows),
+        "likescount": rng.poisson(3.0, n_rows).astype(float),
+        "constant": np.ones(n_rows),
+    }, columns=FEATURE_NAMES)
+    y = (np.sin(X["hour"] / 24 * 2 * np.pi) + 10 * (X["lon"] - 30.3) ** 2
+         + 0.2 * X["likescount"] + rng.normal(0, 0.1, n_rows))
+    return X, y.to_numpy()
+
+
+@pytest.fixture(scope="session")
+def gbr_model(train_data):
+    """
+    A GradientBoostingRegressor fitted on `train_data`.
+    """
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    X, y = train_data
+    return GradientBoostingRegressor(n_estimators=40, max_depth=3, learning_rate=0.1, random_state=0).fit(X, y)
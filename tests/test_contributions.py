@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from predicting_publications.utils.packed_model import (PackedTreeEnsemble, merge_duplicate_leaves,
+                                                        pack_gradient_boosting, quantize_thresholds)
+from predicting_publications.pipeline.prediction import PredictionGridLookup
+
+
+@pytest.fixture
+def packed(gbr_model) -> dict:
+    return pack_gradient_boosting(gbr_model)
+
+
+@pytest.mark.parametrize("optimize", [
+    lambda packed: packed,
+    lambda packed: quantize_thresholds(packed, "int16"),
+    lambda packed: merge_duplicate_leaves(quantize_thresholds(packed, "float32"), tolerance=1e-3),
+], ids=["packed", "int16", "float32_merged"])
+def test_contributions_telescope_to_the_prediction(packed, train_data, optimize):
+    X, _ = train_data
+    model = PackedTreeEnsemble.from_packed(optimize(packed))
+
+    bias, contributions = model.contributions(X)
+
+    assert contributions.shape == X.shape
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), model.predict(X), rtol=0, atol=1e-9)
+
+
+def test_bias_is_the_prediction_at_the_roots(packed, train_data):
+    X, y = train_data
+    bias, _ = PackedTreeEnsemble.from_packed(packed).contributions(X)
+
+    # Every root holds the mean residual of the train rows, so the bias is the train mean
+    np.testing.assert_allclose(bias, y.mean(), rtol=1e-9)
+
+
+def test_unused_features_contribute_nothing(packed, train_data):
+    X, _ = train_data
+    _, contributions = PackedTreeEnsemble.from_packed(packed).contributions(X)
+
+    assert np.all(contributions[:, list(X.columns).index("constant")] == 0)
+    assert np.any(contributions[:, list(X.columns).index("hour")] != 0)
+
+
+def test_contributions_do_not_depend_on_the_batch(packed, train_data):
+    X, _ = train_data
+    model = PackedTreeEnsemble.from_packed(packed)
+
+    bias, batch = model.contributions(X)
+    single_bias, single = model.contributions(X.iloc[[7]])
+
+    assert single_bias == bias
+    np.testing.assert_allclose(single[0], batch[7], rtol=0, atol=1e-12)
+
+
+def test_profiles_of_many_locations(tmp_path):
+    # /explain fills the omitted content features of a batch from the grid's profiles
+    np.save(tmp_path / "grid.npy", np.zeros((2, 1, 24), dtype=np.float32))
+    (tmp_path / "index.json").write_text(json.dumps({
+        "model_version": None, "feature_columns": [], "content_columns": ["likescount", "words_cnt"],
+        "cells": [[30.1, 59.9], [30.2, 60.0]], "profiles": [[1.0, 10.0], [2.0, 20.0]], "dates": [[1, 0, 1]],
+    }))
+    grid = PredictionGridLookup(tmp_path / "grid.npy", tmp_path / "index.json")
+
+    profiles = grid.profiles_of([30.2, 30.5, 30.1000001], [60.0, 60.0, 59.9])
+
+    assert list(profiles.columns) == ["likescount", "words_cnt"]
+    np.testing.assert_array_equal(profiles.iloc[[0, 2]].to_numpy(), [[2.0, 20.0], [1.0, 10.0]])
+    assert profiles.iloc[1].isna().all()
@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from predicting_publications.utils.bloom_filter import BloomFilter
+from predicting_publications.components.data_ingestion import DataIngestion, PartitionedHashSet
+from predicting_publications.entity.config_entity import DataIngestionConfig
+
+
+def add_in_chunks(seen: PartitionedHashSet, partitions, hashes, chunk_rows: int) -> np.ndarray:
+    """
+    Stream hashes into the set like `deduplicate_data` does, and return which rows are first occurrences.
+    """
+    new = np.zeros(len(hashes), dtype=bool)
+    for start in range(0, len(hashes), chunk_rows):
+        chunk = slice(start, start + chunk_rows)
+        _, first = np.unique(hashes[chunk], return_index=True)
+        first.sort()
+        new[start + first[seen.add(partitions[chunk][first], hashes[chunk][first])]] = True
+    return new
+
+
+def test_bloom_filter_has_no_false_negatives():
+    hashes = np.random.default_rng(0).integers(0, 2 ** 63, size=10_000, dtype=np.int64).astype(np.uint64)
+    bloom = BloomFilter(capacity=20_000, error_rate=0.01)
+
+    first = bloom.add(hashes)
+    again = bloom.add(hashes)
+
+    assert not again.any()
+    # A few distinct hashes may already look seen (false positives), never the other way round
+    assert first.sum() >= len(hashes) * 0.99
+    assert bloom.count == first.sum()
+
+
+def test_bloom_filter_false_positive_rate():
+    rng = np.random.default_rng(1)
+    bloom = BloomFilter(capacity=50_000, error_rate=0.01)
+    bloom.add(rng.integers(0, 2 ** 63, size=50_000, dtype=np.int64).astype(np.uint64))
+    expected = bloom.false_positive_rate
+
+    unseen = rng.integers(0, 2 ** 63, size=50_000, dtype=np.int64).astype(np.uint64)
+    observed = 1 - bloom.add(unseen).mean()
+
+    # At capacity the filter matches the requested error rate
+    assert expected == pytest.approx(0.01, rel=0.2)
+    assert observed == pytest.approx(expected, rel=0.3)
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (100, 0.0), (100, 1.0)])
+def test_bloom_filter_rejects_invalid_sizes(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
+
+
+@pytest.mark.parametrize("chunk_rows", [1_000, 7_919, 100_000])
+def test_partitioned_hash_set_keeps_first_occurrences(chunk_rows):
+    rng = np.random.default_rng(2)
+    hashes = rng.integers(0, 30_000, size=100_000).astype(np.uint64)
+    partitions = (hashes % 5).astype(np.int64)
+    seen = PartitionedHashSet()
+
+    new = add_in_chunks(seen, partitions, hashes, chunk_rows)
+
+    np.testing.assert_array_equal(new, ~pd.Series(hashes).duplicated().to_numpy())
+    assert seen.nbytes == 8 * new.sum()
+
+
+def test_partitioned_hash_set_merges_runs_logarithmically():
+    hashes = np.random.default_rng(3).permutation(200_000).astype(np.uint64)
+    seen = PartitionedHashSet()
+
+    add_in_chunks(seen, np.zeros(len(hashes), dtype=np.int64), hashes, chunk_rows=1_000)
+
+    runs = seen.partitions[0]
+    assert len(runs) <= np.log2(200) + 1
+    for run in runs:
+        assert np.all(np.diff(run.astype(np.int64)) > 0)
+    # Every run is at least twice as long as the next one
+    assert all(len(older) > 2 * len(newer) for older, newer in zip(runs, runs[1:]))
+
+
+@pytest.mark.parametrize("method", ["exact", "bloom"])
+def test_deduplicate_data_drops_repeated_rows(tmp_path, method):
+    rng = np.random.default_rng(4)
+    rows = pd.DataFrame({
+        "timestamp": rng.integers(1_546_300_800, 1_548_979_200, size=3_000),
+        "lon": rng.uniform(30.0, 30.6, size=3_000).round(6),
+        "lat": rng.uniform(59.8, 60.1, size=3_000).round(6),
+        "likescount": rng.poisson(3, size=3_000),
+    })
+    data = pd.concat([rows, rows.sample(1_000, random_state=0)], ignore_index=True)
+    # Integers read back as floats (e.g. next to missing values) are still duplicates
+    data["likescount"] = data["likescount"].astype(object)
+    data.loc[len(rows):, "likescount"] = data.loc[len(rows):, "likescount"].astype(float)
+    source, destination = tmp_path / "source.csv", tmp_path / "data.csv"
+    data.to_csv(source, index=False)
+
+    config = DataIngestionConfig(
+        root_dir=tmp_path, local_data_file=source, deduplicate=True,
+        dedup_columns=["timestamp", "lon", "lat", "likescount"], dedup_method=method, partition_hours=24,
+        bloom_capacity=10_000, bloom_error_rate=0.0001, chunk_rows=700, report_file=tmp_path / "report.json",
+    )
+    report = DataIngestion(config).deduplicate_data(source, destination)
+
+    written = pd.read_csv(destination)
+    pd.testing.assert_frame_equal(written, pd.read_csv(source).drop_duplicates(ignore_index=True),
+                                  check_dtype=False)
+    assert report["rows_in"] == 4_000
+    assert report["duplicates_dropped"] == 1_000
+    assert json.loads((tmp_path / "report.json").read_text())["method"] == method
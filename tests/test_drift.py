@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from predicting_publications.utils import drift
+from predicting_publications.utils.drift import DriftMonitor, build_reference
+from predicting_publications.utils.metrics import MetricsRegistry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(drift, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def reference() -> dict:
+    values = np.random.default_rng(0).uniform(0, 1, 10_000)
+    return build_reference(pd.DataFrame({"x": values}), ["x"], n_bins=10)
+
+
+def observe_many(monitor: DriftMonitor, values):
+    for value in values:
+        monitor.observe({"x": value})
+
+
+def test_recent_drift_is_not_diluted_by_old_traffic(reference, clock):
+    monitor = DriftMonitor(reference, half_life_s=60, registry=MetricsRegistry())
+    rng = np.random.default_rng(1)
+
+    observe_many(monitor, rng.uniform(0, 1, 5_000))
+    assert monitor.compute()["x"]["psi"] < 0.05
+
+    # Ten half-lives later, a small batch of drifted traffic dominates the histogram
+    clock.now += 600
+    observe_many(monitor, rng.uniform(0.8, 1, 200))
+    assert monitor.compute()["x"]["psi"] > 1
+    assert monitor.observations == 5_200
+
+
+def test_histograms_without_decay_keep_all_traffic(reference, clock):
+    monitor = DriftMonitor(reference, half_life_s=0, registry=MetricsRegistry())
+    rng = np.random.default_rng(1)
+
+    observe_many(monitor, rng.uniform(0, 1, 5_000))
+    clock.now += 600
+    observe_many(monitor, rng.uniform(0.8, 1, 200))
+
+    assert monitor.compute()["x"]["psi"] < 0.1
+    assert monitor.decayed_observations() == 5_200
+
+
+def test_decayed_observations_halve_every_half_life(reference, clock):
+    monitor = DriftMonitor(reference, half_life_s=60, min_observations=100, registry=MetricsRegistry())
+    observe_many(monitor, np.full(150, 0.5))
+
+    clock.now += 60
+    assert monitor.decayed_observations() == pytest.approx(75)
+    monitor.maybe_compute()
+    assert monitor.scores == {}
+
+    # Rescaling the weights (when they grow large) keeps the proportions and the count
+    monitor._rescale(clock.now)
+    observe_many(monitor, np.full(25, 0.5))
+    assert monitor.decayed_observations() == pytest.approx(100)
+    monitor.maybe_compute()
+    assert "x" in monitor.scores
+
+
+def test_scores_are_computed_in_the_background(reference):
+    import time
+
+    monitor = DriftMonitor(reference, compute_interval_s=0.01, min_observations=5, registry=MetricsRegistry())
+    observe_many(monitor, np.full(10, 0.5))
+    monitor.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not monitor.scores and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.stop()
+    assert "x" in monitor.scores
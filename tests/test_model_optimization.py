@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from predicting_publications.utils.packed_model import (PackedTreeEnsemble, merge_duplicate_leaves,
+                                                        pack_gradient_boosting, prune_trailing_trees,
+                                                        quantize_thresholds, write_packed_arrays)
+
+
+@pytest.fixture
+def packed(gbr_model) -> dict:
+    return pack_gradient_boosting(gbr_model)
+
+
+def threshold_rows(packed: dict, columns) -> pd.DataFrame:
+    """
+    Rows whose every feature sits exactly on a split threshold, or just next to it.
+    """
+    is_split = packed["left"] != np.arange(len(packed["left"]))
+    rows = {}
+    for feature, name in enumerate(columns):
+        thresholds = packed["threshold"][is_split & (packed["feature"] == feature)]
+        values = np.concatenate([thresholds, np.nextafter(thresholds.astype(np.float32), np.float32(np.inf))])
+        rows[name] = np.resize(values, 500) if len(values) else np.zeros(500)
+    return pd.DataFrame(rows, columns=columns)
+
+
+@pytest.mark.parametrize("encoding", ["float32", "int16"])
+def test_quantized_thresholds_keep_every_split_decision(packed, train_data, encoding):
+    X, _ = train_data
+    ties = threshold_rows(packed, X.columns)
+    original = PackedTreeEnsemble.from_packed(packed)
+    quantized = PackedTreeEnsemble.from_packed(quantize_thresholds(packed, encoding))
+
+    for data in (X, ties):
+        np.testing.assert_array_equal(quantized.apply(data), original.apply(data))
+
+
+def test_int16_thresholds_are_bin_indices(packed):
+    quantized = quantize_thresholds(packed, "int16")
+
+    assert quantized["threshold"].dtype == np.int16
+    offsets, edges = quantized["bin_offsets"], quantized["bin_edges"]
+    assert len(offsets) == len(packed["feature_names"]) + 1
+    for feature in range(len(offsets) - 1):
+        assert np.all(np.diff(edges[offsets[feature]:offsets[feature + 1]]) > 0)
+
+
+def test_int16_model_file_round_trip(packed, train_data, tmp_path):
+    X, _ = train_data
+    path = tmp_path / "model.ptree"
+    write_packed_arrays(quantize_thresholds(packed, "int16"), path)
+
+    np.testing.assert_array_equal(PackedTreeEnsemble.load(path).predict(X),
+                                  PackedTreeEnsemble.from_packed(packed).predict(X))
+
+
+def test_unknown_threshold_encoding(packed):
+    with pytest.raises(ValueError, match="Unknown threshold encoding"):
+        quantize_thresholds(packed, "int8")
+
+
+def test_merging_identical_leaves_keeps_predictions(packed, train_data):
+    X, _ = train_data
+    merged = merge_duplicate_leaves(packed, tolerance=0.0)
+
+    assert len(merged["value"]) <= len(packed["value"])
+    np.testing.assert_allclose(PackedTreeEnsemble.from_packed(merged).predict(X),
+                               PackedTreeEnsemble.from_packed(packed).predict(X), rtol=0, atol=1e-12)
+
+
+def test_merging_collapses_sibling_leaves_bottom_up(packed, train_data):
+    X, _ = train_data
+    merged = merge_duplicate_leaves(packed, tolerance=np.inf)
+    model = PackedTreeEnsemble.from_packed(merged)
+
+    # Every tree shrinks to its root, which holds the mean of the whole tree
+    assert len(merged["value"]) == model.n_trees
+    assert merged["max_depth"] == 0
+    roots = packed["tree_offsets"][:-1]
+    expected = packed["init_value"] + packed["learning_rate"] * packed["value"][roots].sum()
+    np.testing.assert_allclose(model.predict(X), expected)
+
+
+def test_pruning_is_disabled_by_a_zero_tolerance(packed, train_data):
+    X, _ = train_data
+    assert prune_trailing_trees(packed, X, tolerance=0.0) is packed
+
+
+def test_pruning_keeps_predictions_unbiased(packed, train_data):
+    X, _ = train_data
+    original = PackedTreeEnsemble.from_packed(packed)
+    pruned = PackedTreeEnsemble.from_packed(prune_trailing_trees(packed, X, tolerance=1.0))
+
+    assert pruned.n_trees == 1
+    np.testing.assert_allclose(pruned.predict(X).mean(), original.predict(X).mean(), rtol=1e-9)
+
+
+@pytest.fixture
+def optimization_config(gbr_model, train_data, tmp_path):
+    """
+    A production model directory (model.joblib and its packed copy) and its train/test data.
+    """
+    import joblib
+    from predicting_publications.entity.config_entity import ModelOptimizationConfig
+
+    X, y = train_data
+    model_dir = tmp_path / "v0001"
+    model_dir.mkdir()
+    joblib.dump(gbr_model, model_dir / "model.joblib")
+    write_packed_arrays(pack_gradient_boosting(gbr_model), model_dir / "model.ptree")
+    X.assign(target=y).iloc[:300].to_csv(tmp_path / "train.csv", index=False)
+    X.assign(target=y).iloc[300:].to_csv(tmp_path / "test.csv", index=False)
+
+    def config(**params):
+        return ModelOptimizationConfig(
+            root_dir=tmp_path, model_path=model_dir / "model.joblib", model_version="v0001",
+            train_data_path=tmp_path / "train.csv", test_data_path=tmp_path / "test.csv",
+            packed_model_path=tmp_path / "optimized" / "model.ptree", report_file=tmp_path / "report.json",
+            target_column="target", **{"threshold_encoding": "int16", "leaf_merge_tolerance": 0.0,
+                                       "prune_tolerance": 0.0, "max_rmse_increase": 0.01,
+                                       "min_latency_reduction": 0.1, **params})
+    return config
+
+
+def test_optimization_is_compared_with_the_served_packed_model(optimization_config):
+    from predicting_publications.components.model_optimization import ModelOptimization
+
+    config = optimization_config(min_latency_reduction=0.99)
+    production = config.model_path.with_name("model.ptree").read_bytes()
+
+    report = ModelOptimization(config).optimize()
+
+    assert report["served_step"] == "production_packed"
+    assert report["rmse_increase"] <= config.max_rmse_increase
+    assert report["latency_reduction"] < 0.99
+    assert not report["accepted"]
+    assert not config.packed_model_path.exists()
+    assert config.model_path.with_name("model.ptree").read_bytes() == production
+
+
+def test_accepted_optimization_is_written_to_its_own_path(optimization_config):
+    from predicting_publications.components.model_optimization import ModelOptimization
+
+    config = optimization_config(min_latency_reduction=-np.inf)
+    production = config.model_path.with_name("model.ptree").read_bytes()
+
+    report = ModelOptimization(config).optimize()
+
+    assert report["accepted"]
+    assert PackedTreeEnsemble.load(config.packed_model_path).threshold.dtype == np.int16
+    assert config.model_path.with_name("model.ptree").read_bytes() == production
+
+
+def test_inaccurate_optimization_is_rejected(optimization_config):
+    from predicting_publications.components.model_optimization import ModelOptimization
+
+    config = optimization_config(leaf_merge_tolerance=np.inf, min_latency_reduction=-np.inf)
+
+    report = ModelOptimization(config).optimize()
+
+    assert report["rmse_increase"] > config.max_rmse_increase
+    assert not report["accepted"]
+    assert not config.packed_model_path.exists()
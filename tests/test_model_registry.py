@@ -0,0 +1,130 @@
+import json
+
+import numpy as np
+import pytest
+
+from predicting_publications.utils.model_registry import ModelRegistry, PRODUCTION_ALIAS, SHADOW_ALIAS
+from predicting_publications.pipeline.prediction import PredictionGridLookup
+
+
+@pytest.fixture
+def registry(tmp_path) -> ModelRegistry:
+    return ModelRegistry(tmp_path / "registry")
+
+
+def model_file(tmp_path, content: str):
+    path = tmp_path / f"{content}.joblib"
+    path.write_text(content)
+    return path
+
+
+def test_register_copies_files_into_numbered_versions(registry, tmp_path):
+    first = registry.register({"model.joblib": model_file(tmp_path, "a"), "model.onnx": tmp_path / "missing.onnx"},
+                              metadata={"stage": "model_training"})
+    second = registry.register({"model.joblib": model_file(tmp_path, "b")})
+
+    assert (first, second) == ("v0001", "v0002")
+    assert registry.versions() == ["v0001", "v0002"]
+    assert (registry.resolve(first) / "model.joblib").read_text() == "a"
+    # Missing files are skipped
+    assert registry.metadata(first)["files"] == ["model.joblib"]
+    assert registry.metadata(first)["stage"] == "model_training"
+    # Registering does not promote by default
+    assert registry.version_of(PRODUCTION_ALIAS) is None
+    assert registry.resolve(PRODUCTION_ALIAS) is None
+
+
+def test_promote_and_roll_back(registry, tmp_path):
+    first = registry.register({"model.joblib": model_file(tmp_path, "a")}, promote=True)
+    second = registry.register({"model.joblib": model_file(tmp_path, "b")}, promote=True)
+    assert registry.version_of(PRODUCTION_ALIAS) == second
+
+    # Rolling back is promoting the previous version again; both versions are kept
+    registry.promote(first)
+    assert registry.version_of(PRODUCTION_ALIAS) == first
+    assert (registry.resolve(PRODUCTION_ALIAS) / "model.joblib").read_text() == "a"
+    assert registry.versions() == [first, second]
+
+
+def test_aliases_are_independent(registry, tmp_path):
+    first = registry.register({"model.joblib": model_file(tmp_path, "a")}, promote=True)
+    second = registry.register({"model.joblib": model_file(tmp_path, "b")})
+    registry.promote(second, alias=SHADOW_ALIAS)
+
+    assert registry.version_of(PRODUCTION_ALIAS) == first
+    assert registry.version_of(SHADOW_ALIAS) == second
+
+    registry.clear(SHADOW_ALIAS)
+    registry.clear(SHADOW_ALIAS)
+    assert registry.version_of(SHADOW_ALIAS) is None
+    assert registry.version_of(PRODUCTION_ALIAS) == first
+
+
+def test_aliases_are_read_again_only_when_changed(registry, tmp_path, monkeypatch):
+    first = registry.register({"model.joblib": model_file(tmp_path, "a")}, promote=True)
+    second = registry.register({"model.joblib": model_file(tmp_path, "b")})
+    assert registry.version_of(PRODUCTION_ALIAS) == first
+
+    reads = []
+    read_text = type(tmp_path).read_text
+    monkeypatch.setattr(type(tmp_path), "read_text", lambda path: reads.append(path) or read_text(path))
+    assert registry.version_of(PRODUCTION_ALIAS) == first
+    assert reads == []
+
+    # A promotion, from this or another registry instance, replaces the alias file
+    ModelRegistry(registry.root_dir).promote(second)
+    assert registry.version_of(PRODUCTION_ALIAS) == second
+    assert len(reads) == 1
+    registry.clear(PRODUCTION_ALIAS)
+    assert registry.version_of(PRODUCTION_ALIAS) is None
+
+
+def test_promote_unknown_version(registry):
+    with pytest.raises(ValueError, match="does not exist"):
+        registry.promote("v0042")
+    assert registry.version_of(PRODUCTION_ALIAS) is None
+
+
+def write_grid(directory, model_version: str) -> tuple:
+    """
+    Write a one-cell, one-day prediction grid filled with `model_version`.
+    """
+    directory.mkdir(exist_ok=True)
+    grid_path, index_path = directory / "grid.npy", directory / "index.json"
+    np.save(grid_path, np.arange(24, dtype=np.float32).reshape(1, 1, 24))
+    index_path.write_text(json.dumps({
+        "model_version": model_version,
+        "feature_columns": [], "content_columns": ["likescount"],
+        "cells": [[30.3, 59.9]], "profiles": [[2.0]], "dates": [[3, 2, 6]],
+    }))
+    return grid_path, index_path
+
+
+def test_prediction_grid_only_answers_for_the_production_version(registry, tmp_path):
+    first = registry.register({"model.joblib": model_file(tmp_path, "a")}, promote=True)
+    second = registry.register({"model.joblib": model_file(tmp_path, "b")})
+    grid = PredictionGridLookup(*write_grid(tmp_path / "grid", first), registry=registry)
+
+    assert grid.lookup(30.3, 59.9, hour=5, day=3, dayofweek=2, month=6) == 5.0
+
+    registry.promote(second)
+    assert not grid.current
+    assert grid.lookup(30.3, 59.9, hour=5, day=3, dayofweek=2, month=6) is None
+    # Content profiles do not depend on the model
+    assert grid.profile(30.3, 59.9) == {"likescount": 2.0}
+
+    registry.promote(first)
+    assert grid.lookup(30.3, 59.9, hour=5, day=3, dayofweek=2, month=6) == 5.0
+
+
+def test_prediction_grid_notices_a_rebuild(registry, tmp_path):
+    import os
+
+    first = registry.register({"model.joblib": model_file(tmp_path, "a")}, promote=True)
+    grid_path, index_path = write_grid(tmp_path / "grid", first)
+    grid = PredictionGridLookup(grid_path, index_path, registry=registry)
+    assert not grid.rebuilt
+
+    write_grid(tmp_path / "grid", first)
+    os.utime(index_path, ns=(0, index_path.stat().st_mtime_ns + 1))
+    assert grid.rebuilt
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from predicting_publications.utils.packed_model import (PackedTreeEnsemble, pack_gradient_boosting,
+                                                        write_packed_arrays)
+
+
+def test_packed_predictions_match_sklearn(gbr_model, train_data):
+    X, _ = train_data
+    packed = PackedTreeEnsemble.from_packed(pack_gradient_boosting(gbr_model))
+
+    np.testing.assert_allclose(packed.predict(X), gbr_model.predict(X), rtol=0, atol=1e-12)
+
+
+def test_packed_model_file_round_trip(gbr_model, train_data, tmp_path):
+    X, _ = train_data
+    path = tmp_path / "model.ptree"
+    write_packed_arrays(pack_gradient_boosting(gbr_model), path)
+
+    loaded = PackedTreeEnsemble.load(path)
+
+    assert loaded.n_trees == gbr_model.n_estimators_
+    assert loaded.feature_names == list(X.columns)
+    np.testing.assert_allclose(loaded.predict(X), gbr_model.predict(X), rtol=0, atol=1e-12)
+
+
+def test_packed_model_reorders_columns(gbr_model, train_data):
+    X, _ = train_data
+    packed = PackedTreeEnsemble.from_packed(pack_gradient_boosting(gbr_model))
+
+    np.testing.assert_array_equal(packed.predict(X[X.columns[::-1]]), packed.predict(X))
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "model.ptree"
+    path.write_bytes(b"not a packed model" * 10)
+
+    with pytest.raises(ValueError, match="not a packed model"):
+        PackedTreeEnsemble.load(path)
+
+
+def test_only_gradient_boosting_can_be_packed(train_data):
+    from sklearn.linear_model import Ridge
+
+    X, y = train_data
+    with pytest.raises(TypeError):
+        pack_gradient_boosting(Ridge().fit(X, y))
+
+
+def test_pipeline_scores_batches_with_the_joblib_model(gbr_model, tmp_path, monkeypatch):
+    import joblib
+    from sklearn.ensemble import GradientBoostingRegressor
+
+    from predicting_publications.pipeline import prediction
+    from predicting_publications.entity.config_entity import ServingBackendConfig
+    from predicting_publications.utils.model_registry import ModelRegistry
+
+    joblib.dump(gbr_model, tmp_path / "model.joblib")
+    write_packed_arrays(pack_gradient_boosting(gbr_model), tmp_path / "model.ptree")
+    registry = ModelRegistry(tmp_path / "registry")
+    version = registry.register({"model.joblib": tmp_path / "model.joblib", "model.ptree": tmp_path / "model.ptree"})
+    monkeypatch.setattr(prediction, "_model_registry", registry)
+    monkeypatch.setattr(prediction, "_serving_backend", ServingBackendConfig("native", 1, packed_max_rows=16))
+
+    pipeline = prediction.PredictionPipeline(version)
+
+    assert isinstance(pipeline.model, PackedTreeEnsemble)
+    assert pipeline._model_for(16) is pipeline.model
+    assert isinstance(pipeline._model_for(17), GradientBoostingRegressor)
+    # The pickle is loaded once and shared by the pipelines of the process
+    assert prediction.PredictionPipeline(version)._model_for(168) is pipeline._model_for(168)
@@ -0,0 +1,62 @@
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from predicting_publications.config.configuration import ConfigurationManager
+from predicting_publications.pipeline.scheduler import PipelineScheduler
+from predicting_publications.utils.model_registry import ModelRegistry, PRODUCTION_ALIAS
+
+from main import PIPELINE_STAGES
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+# The stages from the trained model on; the evaluation needs an MLflow server
+MODEL_STAGES = ("model_training", "model_optimization", "prediction_grid")
+
+
+def transformed_data(n_rows: int, seed: int) -> pd.DataFrame:
+    """
+    Hourly publication counts of a few cells, in the layout of the data transformation output.
+    """
+    rng = np.random.default_rng(seed)
+    cells = rng.integers(0, 6, n_rows)
+    data = pd.DataFrame({
+        "lon": 30.2 + 0.01 * cells, "lat": 59.9 + 0.01 * cells,
+        "hour": rng.integers(0, 24, n_rows), "day": rng.integers(1, 29, n_rows),
+        "dayofweek": rng.integers(0, 7, n_rows), "month": rng.integers(1, 13, n_rows),
+    })
+    for column in ["likescount", "commentscount", "symbols_cnt", "words_cnt",
+                   "hashtags_cnt", "mentions_cnt", "links_cnt", "emoji_cnt"]:
+        data[column] = rng.poisson(3, n_rows).astype(float)
+    data["publication_count"] = rng.poisson(1 + cells + np.sin(data["hour"] / 24 * 2 * np.pi))
+    return data
+
+
+def test_prediction_grid_is_built_with_the_production_model(tmp_path, monkeypatch):
+    for name in ("config/config.yaml", "schema.yaml", "feature_engineered_schema.yaml"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        shutil.copy(REPO_DIR / name, tmp_path / name)
+    params = yaml.safe_load((REPO_DIR / "params.yaml").read_text())
+    params["GradientBoostingRegressor"].update(n_estimators=30, max_depth=3)
+    (tmp_path / "params.yaml").write_text(yaml.safe_dump(params))
+    monkeypatch.chdir(tmp_path)
+
+    data_dir = tmp_path / "artifacts" / "data_transformation"
+    data_dir.mkdir(parents=True)
+    transformed_data(600, seed=0).to_csv(data_dir / "train_data.csv", index=False)
+    transformed_data(200, seed=1).to_csv(data_dir / "test_data.csv", index=False)
+
+    names = set(MODEL_STAGES)
+    stages = [stage._replace(depends_on=tuple(name for name in stage.depends_on if name in names))
+              for stage in PIPELINE_STAGES if stage.name in names]
+    config_manager = ConfigurationManager()
+    status = PipelineScheduler(stages, config_manager, max_workers=1).run()
+
+    assert status == {name: "completed" for name in MODEL_STAGES}
+    registry = ModelRegistry(config_manager.get_model_registry_config().root_dir)
+    index = json.loads(Path(config_manager.config.prediction_grid.index_file).read_text())
+    assert index["model_version"] == registry.version_of(PRODUCTION_ALIAS)
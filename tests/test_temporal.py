@@ -0,0 +1,62 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from predicting_publications.utils.temporal import (TEMPORAL_COLUMNS, _civil_date, add_temporal_features,
+                                                    calendar_features, epoch_seconds)
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def test_civil_from_days_matches_the_gregorian_calendar():
+    # From 0001-01-01 to 9999-12-31, every 7th day plus the days around every leap day
+    first = datetime.date(1, 1, 1).toordinal() - EPOCH_ORDINAL
+    last = datetime.date(9999, 12, 31).toordinal() - EPOCH_ORDINAL
+    days = np.arange(first, last + 1, 7, dtype=np.int64)
+    leap_days = np.array([datetime.date(year, 2, 28).toordinal() - EPOCH_ORDINAL for year in range(1, 10000, 4)])
+    days = np.concatenate([days, leap_days, leap_days + 1, leap_days + 2, [0, -1, 1]])
+
+    year, month, day = _civil_date(days)
+
+    expected = [datetime.date.fromordinal(int(d) + EPOCH_ORDINAL) for d in days]
+    np.testing.assert_array_equal(year, [date.year for date in expected])
+    np.testing.assert_array_equal(month, [date.month for date in expected])
+    np.testing.assert_array_equal(day, [date.day for date in expected])
+
+
+@pytest.mark.parametrize("utc_offset_hours", [0, 3, -5.5])
+def test_calendar_features_match_pandas(utc_offset_hours):
+    seconds = np.random.default_rng(0).integers(-10 ** 9, 4 * 10 ** 9, size=20_000, dtype=np.int64)
+    local = pd.to_datetime(pd.Series(seconds), unit="s") + pd.Timedelta(hours=utc_offset_hours)
+
+    features = calendar_features(seconds, TEMPORAL_COLUMNS + ["minute", "year"], utc_offset_hours)
+
+    for column in TEMPORAL_COLUMNS + ["minute", "year"]:
+        np.testing.assert_array_equal(features[column], getattr(local.dt, column).to_numpy(), err_msg=column)
+
+
+def test_unknown_calendar_feature():
+    with pytest.raises(ValueError, match="weekofyear"):
+        calendar_features(np.array([0]), ["hour", "weekofyear"])
+
+
+def test_epoch_seconds_of_numbers_datetimes_and_strings():
+    expected = np.array([1_600_000_000, 0])
+
+    np.testing.assert_array_equal(epoch_seconds(expected), expected)
+    np.testing.assert_array_equal(epoch_seconds(pd.to_datetime(expected, unit="s")), expected)
+    # Timezone-aware timestamps are converted to UTC
+    np.testing.assert_array_equal(epoch_seconds(["2020-09-13T15:26:40+03:00", "1970-01-01T03:00:00+03:00"]),
+                                  expected)
+
+
+def test_add_temporal_features_keeps_the_frame():
+    df = pd.DataFrame({"timestamp": [1_600_000_000], "lon": [30.3]})
+
+    result = add_temporal_features(df, "timestamp", utc_offset_hours=3)
+
+    # 2020-09-13 12:26:40 UTC is 15:26 on Sunday in UTC+3
+    assert result.loc[0, ["hour", "day", "dayofweek", "month"]].tolist() == [15, 13, 6, 9]
+    assert result.loc[0, "lon"] == 30.3